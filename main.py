@@ -5,22 +5,28 @@ Congress API Data Ingestion System
 Main entry point for ingesting data from GovInfo API into PostgreSQL/SQLite database.
 """
 
-import argparse
 import json
+import os
 import sys
 import time
 from datetime import datetime
 
-# Add src to path
-sys.path.insert(0, '/root/congress_api_project/src')
+# Add src to path (next to this file, so imports work from any checkout location)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
 
-from database.db_manager import DatabaseManager
-from ingestion.api_client import GovInfoAPIClient
-from ingestion.ingestion_engine import IngestionEngine
+DEFAULT_CONFIG = '/root/congress_api_project/config/config.json'
+
+# Flags that cron-driven monitoring polls with; handled without argparse
+FAST_PATH_COMMANDS = ('--stats', '--test-api')
 
 
 def main():
     """Main entry point."""
+    if len(sys.argv) == 2 and sys.argv[1] in FAST_PATH_COMMANDS:
+        return run_fast_path(sys.argv[1])
+    
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description='Congress API Data Ingestion System',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -32,6 +38,9 @@ Examples:
   # Ingest packages from BILLS collection (first 100)
   python main.py --ingest-packages BILLS --max-packages 100
   
+  # First-time load of BILLS with package indexes rebuilt at the end
+  python main.py --ingest-packages BILLS --cold-load
+  
   # Ingest packages from CREC collection with date range
   python main.py --ingest-packages CREC --start-date 2024-01-01 --end-date 2024-12-31
   
@@ -65,8 +74,8 @@ Examples:
     parser.add_argument(
         '--batch-size',
         type=int,
-        default=100,
-        help='Number of packages per API call (default: 100, max: 1000)'
+        default=None,
+        help='Number of packages per API call (default: 100, or 1000 with --cold-load; max: 1000)'
     )
     
     parser.add_argument(
@@ -79,6 +88,22 @@ Examples:
         help='End date for package filtering (YYYY-MM-DD)'
     )
     
+    # The async path has no cold-load mode; refuse the combination outright
+    load_mode = parser.add_mutually_exclusive_group()
+    
+    load_mode.add_argument(
+        '--async',
+        dest='use_async',
+        action='store_true',
+        help='Fetch package pages concurrently (with --ingest-packages)'
+    )
+    
+    load_mode.add_argument(
+        '--cold-load',
+        action='store_true',
+        help='Initial load: drop secondary package indexes and rebuild them at the end (with --ingest-packages)'
+    )
+    
     parser.add_argument(
         '--stats',
         action='store_true',
@@ -93,7 +118,7 @@ Examples:
     
     parser.add_argument(
         '--config',
-        default='/root/congress_api_project/config/config.json',
+        default=DEFAULT_CONFIG,
         help='Path to configuration file'
     )
     
@@ -104,6 +129,13 @@ Examples:
         parser.print_help()
         return 0
     
+    if args.batch_size is None:
+        # A cold load is write-bound, so it defaults to the API's largest page
+        args.batch_size = 1000 if args.cold_load else 100
+    
+    # Imported here so --help and the fast path skip it until needed
+    from ingestion.ingestion_engine import IngestionEngine
+    
     try:
         # Initialize engine
         engine = IngestionEngine(args.config)
@@ -113,10 +145,37 @@ Examples:
         
         elif args.ingest_collections:
             result = engine.ingest_collections()
-            if result['errors']:
-                print(f"\nErrors encountered: {len(result['errors'])}")
-                for error in result['errors'][:5]:  # Show first 5 errors
-                    print(f"  - {error}")
+            print_errors(result['errors'])
+        
+        elif args.ingest_packages and args.use_async:
+            import asyncio
+            
+            async def ingest_async():
+                try:
+                    return await engine.ingest_collection_packages_async(
+                        collection_code=args.ingest_packages,
+                        batch_size=args.batch_size,
+                        max_packages=args.max_packages,
+                        start_date=args.start_date,
+                        end_date=args.end_date
+                    )
+                finally:
+                    await engine.api_client.aclose()
+            
+            result = asyncio.run(ingest_async())
+            
+            print_errors(result['errors'])
+        
+        elif args.ingest_packages and args.cold_load:
+            result = engine.bulk_cold_load(
+                collection_code=args.ingest_packages,
+                batch_size=args.batch_size,
+                max_packages=args.max_packages,
+                start_date=args.start_date,
+                end_date=args.end_date
+            )
+            
+            print_errors(result['errors'])
         
         elif args.ingest_packages:
             result = engine.ingest_collection_packages(
@@ -127,10 +186,7 @@ Examples:
                 end_date=args.end_date
             )
             
-            if result['errors']:
-                print(f"\nErrors encountered: {len(result['errors'])}")
-                for error in result['errors'][:5]:
-                    print(f"  - {error}")
+            print_errors(result['errors'])
         
         elif args.stats:
             show_statistics(engine)
@@ -145,6 +201,36 @@ Examples:
         return 1
 
 
+def run_fast_path(command):
+    """Run --stats or --test-api with the default config, skipping argparse."""
+    from ingestion.ingestion_engine import IngestionEngine
+    
+    try:
+        engine = IngestionEngine(DEFAULT_CONFIG)
+        
+        if command == '--stats':
+            show_statistics(engine)
+        else:
+            test_api_connection(engine)
+        
+        engine.close()
+        return 0
+        
+    except Exception as e:
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+def print_errors(errors):
+    """Print the error count and the first 5 errors in a single write."""
+    if errors:
+        lines = [f"\nErrors encountered: {len(errors)}"]
+        lines.extend(f"  - {error}" for error in errors[:5])
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+
 def test_api_connection(engine):
     """Test API connection and list available collections."""
     print('Testing GovInfo API Connection')
@@ -165,8 +251,12 @@ def test_api_connection(engine):
     print('-' * 60)
     
     # Show first 10 collections
-    for i, collection in enumerate(collections_list[:10], 1):
-        print(f"{i}. {collection.get('collectionCode', 'N/A')}: {collection.get('collectionName', 'N/A')}")
+    lines = [
+        f"{i}. {collection.get('collectionCode', 'N/A')}: {collection.get('collectionName', 'N/A')}"
+        for i, collection in enumerate(collections_list[:10], 1)
+    ]
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
     
     if len(collections_list) > 10:
         print(f"... and {len(collections_list) - 10} more")
@@ -185,28 +275,27 @@ def show_statistics(engine):
     print('Ingestion Statistics')
     print('=' * 60)
     
-    stats = engine.get_ingestion_stats()
+    dashboard = engine.db.get_dashboard()
     
     print(f"\nDatabase:")
-    print(f"  Type: {stats['database_type']}")
-    print(f"  Collections: {stats['total_collections']}")
-    print(f"  Packages: {stats['total_packages']}")
+    print(f"  Type: {engine.db.db_type}")
+    print(f"  Collections: {dashboard['total_collections']}")
+    print(f"  Packages: {dashboard['total_packages']}")
     
     print(f"\nAPI Usage:")
-    api_stats = stats['api_stats']
+    api_stats = engine.api_client.get_stats()
     print(f"  Requests this hour: {api_stats['request_count']}/{api_stats['max_requests_per_hour']}")
     print(f"  Elapsed time: {api_stats['elapsed_time']:.1f} seconds")
     
-    # Get recent ingestion logs
     print(f"\nRecent Ingestion Activity:")
-    logs = engine.db.execute(
-        "SELECT * FROM ingestion_log ORDER BY id DESC LIMIT 5"
-    )
+    logs = dashboard['recent_logs']
     
     if logs:
-        for log in logs:
-            print(f"  {log['collection_code']}: offset {log['offset_value']}, "
-                  f"{log['records_ingested']} records, {log['status']}")
+        sys.stdout.write('\n'.join(
+            f"  {log['collection_code']}: offset {log['offset_value']}, "
+            f"{log['records_ingested']} records, {log['status']}"
+            for log in logs
+        ) + '\n')
     else:
         print("  No recent activity")
     
@@ -0,0 +1,14 @@
+-- Congress API PostgreSQL Database Schema
+-- Version: 1.1
+-- Description: Index for the monitor's recent-errors query on ingestion_log
+--
+-- database_monitor.py selects rows WHERE status = 'error' AND started_at >= NOW() - INTERVAL '24 hours'
+-- ORDER BY started_at DESC LIMIT 10. This index serves the filter and the sort directly.
+-- error_message is deliberately not INCLUDEd: long messages would exceed the btree row size limit,
+-- and fetching at most 10 heap rows is cheap.
+--
+-- CONCURRENTLY cannot run inside a transaction block; apply with plain `psql -f` (autocommit).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ingestion_log_status_started
+    ON ingestion_log (status, started_at DESC)
+    INCLUDE (collection_code, operation_type);
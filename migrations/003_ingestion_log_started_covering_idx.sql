@@ -0,0 +1,15 @@
+-- Congress API PostgreSQL Database Schema
+-- Version: 1.2
+-- Description: Covering index for the monitor's ingestion activity summary
+--
+-- database_monitor.py aggregates ingestion_log WHERE started_at >= NOW() - INTERVAL '24 hours'
+-- GROUP BY collection_code, operation_type, status. With every referenced column in the index the
+-- window is read with an index-only scan instead of a sequential scan of the whole log.
+--
+-- The "latest rows" query (ORDER BY id DESC LIMIT 5) needs no extra index: the primary key btree
+-- is scanned backwards.
+--
+-- CONCURRENTLY cannot run inside a transaction block; apply with plain `psql -f` (autocommit).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ingestion_log_started_covering
+    ON ingestion_log (started_at DESC, collection_code, operation_type, status);
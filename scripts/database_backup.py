@@ -7,16 +7,80 @@ Creates automated backups with compression and timestamping
 import sys
 import os
 import json
+import functools
 import subprocess
 import gzip
 import shutil
+import tempfile
+import zlib
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Hardware-accelerated CRC32C when google-crc32c is installed, zlib CRC32 otherwise
+try:
+    import google_crc32c
+    CHECKSUM_FUNCTIONS = {
+        'crc32c': google_crc32c.extend,
+        'crc32': lambda crc, data: zlib.crc32(data, crc),
+    }
+    CHECKSUM_ALGORITHM = 'crc32c'
+except ImportError:
+    CHECKSUM_FUNCTIONS = {
+        'crc32': lambda crc, data: zlib.crc32(data, crc),
+    }
+    CHECKSUM_ALGORITHM = 'crc32'
+
+class ChecksumWriter:
+    """File wrapper that checksums bytes as they are written"""
+    
+    def __init__(self, f, algorithm=CHECKSUM_ALGORITHM):
+        self.f = f
+        self.algorithm = algorithm
+        self.crc = 0
+        self._update = CHECKSUM_FUNCTIONS[algorithm]
+    
+    def write(self, data):
+        self.crc = self._update(self.crc, data)
+        return self.f.write(data)
+    
+    def flush(self):
+        self.f.flush()
+
+def checksum_path(backup_file):
+    """Path of the checksum sidecar for a backup file"""
+    return backup_file.with_name(backup_file.name + '.crc')
+
+def verify_checksum(backup_file):
+    """Check a backup against its sidecar; returns (ok, message)"""
+    sidecar = checksum_path(backup_file)
+    if not sidecar.exists():
+        return True, "No checksum file, skipping verification"
+    
+    algorithm, expected = sidecar.read_text().split()
+    if algorithm not in CHECKSUM_FUNCTIONS:
+        return True, f"Cannot verify {algorithm} checksum (google-crc32c not installed)"
+    
+    update = CHECKSUM_FUNCTIONS[algorithm]
+    crc = 0
+    with open(backup_file, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            crc = update(crc, chunk)
+    
+    if f'{crc:08x}' != expected:
+        return False, f"Checksum mismatch ({algorithm} {crc:08x} != {expected})"
+    return True, f"Checksum verified ({algorithm})"
+
+@functools.lru_cache(maxsize=1)
 def load_config():
     """Load database configuration"""
-    with open('../config/config.json', 'r') as f:
-        config = json.load(f)
+    with open('../config/config.json', 'rb') as f:
+        data = f.read()
+    config = orjson.loads(data) if orjson else json.loads(data)
     return config['database']
 
 def create_backup_directory():
@@ -25,13 +89,16 @@ def create_backup_directory():
     backup_dir.mkdir(exist_ok=True)
     return backup_dir
 
-def create_backup(db_config, backup_dir):
+def create_backup(db_config, backup_dir, jobs=None):
     """Create database backup using pg_dump"""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    backup_file = backup_dir / f'congress_backup_{timestamp}.sql'
+    if jobs:
+        return create_parallel_backup(db_config, backup_dir, timestamp, jobs)
     compressed_file = backup_dir / f'congress_backup_{timestamp}.sql.gz'
+    # Written under a name list_backups and cleanup ignore, renamed once complete
+    partial_file = compressed_file.with_name(compressed_file.name + '.partial')
     
-    print(f"Creating backup: {backup_file}")
+    print(f"Creating backup: {compressed_file}")
     
     try:
         # Create pg_dump command
@@ -49,25 +116,36 @@ def create_backup(db_config, backup_dir):
             '--clean',
             '--if-exists',
             '--create',
-            '--encoding', 'utf8',
-            '--file', str(backup_file)
+            '--encoding', 'utf8'
         ]
         
-        # Execute pg_dump
-        result = subprocess.run(cmd, env=env, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            print(f"❌ Backup failed: {result.stderr}")
-            return False
-        
-        # Compress the backup
-        print(f"Compressing backup...")
-        with open(backup_file, 'rb') as f_in:
-            with gzip.open(compressed_file, 'wb') as f_out:
-                shutil.copyfileobj(f_in, f_out)
+        # Stream pg_dump output straight into the compressed file. stderr goes
+        # to a temp file so the --verbose output can never fill a pipe and stall.
+        # The compressed bytes are checksummed on their way to disk, so no
+        # second read pass is needed.
+        with tempfile.TemporaryFile() as stderr_file:
+            with open(partial_file, 'wb') as raw_out:
+                checksum = ChecksumWriter(raw_out)
+                with gzip.GzipFile(str(compressed_file), 'wb', compresslevel=6, fileobj=checksum) as f_out:
+                    proc = subprocess.Popen(cmd, env=env, stdout=subprocess.PIPE, stderr=stderr_file)
+                    try:
+                        shutil.copyfileobj(proc.stdout, f_out, length=1 << 20)
+                    except BaseException:
+                        # Don't leave pg_dump blocked on a pipe nobody reads
+                        proc.kill()
+                        proc.wait()
+                        raise
+                    proc.stdout.close()
+                    returncode = proc.wait()
+            
+            if returncode != 0:
+                stderr_file.seek(0)
+                partial_file.unlink()
+                print(f"❌ Backup failed: {stderr_file.read().decode(errors='replace')}")
+                return False
         
-        # Remove uncompressed file
-        backup_file.unlink()
+        partial_file.replace(compressed_file)
+        checksum_path(compressed_file).write_text(f"{checksum.algorithm} {checksum.crc:08x}\n")
         
         # Get file size
         file_size = compressed_file.stat().st_size
@@ -75,6 +153,54 @@ def create_backup(db_config, backup_dir):
         
         print(f"✅ Backup created successfully: {compressed_file}")
         print(f"   Size: {size_mb:.2f} MB")
+        print(f"   Checksum: {checksum.algorithm} {checksum.crc:08x}")
+        
+        # Clean up old backups (keep last 7 days)
+        cleanup_old_backups(backup_dir)
+        
+        return True
+        
+    except Exception as e:
+        partial_file.unlink(missing_ok=True)
+        print(f"❌ Backup failed: {str(e)}")
+        return False
+
+def create_parallel_backup(db_config, backup_dir, timestamp, jobs):
+    """Create a directory-format backup, dumping tables with parallel workers"""
+    backup_path = backup_dir / f'congress_backup_{timestamp}.dir'
+    
+    print(f"Creating backup: {backup_path} ({jobs} jobs)")
+    
+    try:
+        env = os.environ.copy()
+        env['PGPASSWORD'] = db_config['password']
+        
+        # Directory format compresses each table file itself, so no gzip step
+        cmd = [
+            'pg_dump',
+            '-h', db_config['host'],
+            '-p', str(db_config['port']),
+            '-U', db_config['user'],
+            '-d', db_config['database'],
+            '--no-password',
+            '-Fd',
+            '-j', str(jobs),
+            '-Z', '6',
+            '-f', str(backup_path),
+            '--encoding', 'utf8'
+        ]
+        
+        result = subprocess.run(cmd, env=env, capture_output=True, text=True)
+        
+        if result.returncode != 0:
+            shutil.rmtree(backup_path, ignore_errors=True)
+            print(f"❌ Backup failed: {result.stderr}")
+            return False
+        
+        size_mb = backup_size(backup_path) / (1024 * 1024)
+        
+        print(f"✅ Backup created successfully: {backup_path}")
+        print(f"   Size: {size_mb:.2f} MB")
         
         # Clean up old backups (keep last 7 days)
         cleanup_old_backups(backup_dir)
@@ -85,37 +211,66 @@ def create_backup(db_config, backup_dir):
         print(f"❌ Backup failed: {str(e)}")
         return False
 
+def backup_size(backup_path):
+    """Size in bytes of a backup file or directory-format backup"""
+    if backup_path.is_dir():
+        return sum(p.stat().st_size for p in backup_path.rglob('*') if p.is_file())
+    return backup_path.stat().st_size
+
+def scan_backups(backup_dir):
+    """Return DirEntry objects for all backups; their stat() results are cached"""
+    with os.scandir(backup_dir) as it:
+        return [
+            e for e in it
+            if e.name.startswith('congress_backup_')
+            and (e.name.endswith('.sql.gz') or e.name.endswith('.dir'))
+        ]
+
 def cleanup_old_backups(backup_dir, days=7):
     """Remove backups older than specified days"""
     import time
     
-    current_time = time.time()
-    cutoff_time = current_time - (days * 24 * 60 * 60)
+    cutoff_time = time.time() - days * 86400
     
     deleted_count = 0
-    for backup_file in backup_dir.glob('congress_backup_*.sql.gz'):
-        if backup_file.stat().st_mtime < cutoff_time:
-            backup_file.unlink()
-            deleted_count += 1
+    with os.scandir(backup_dir) as it:
+        for entry in it:
+            name = entry.name
+            if not name.startswith('congress_backup_'):
+                continue
+            if name.endswith('.sql.gz'):
+                if entry.stat().st_mtime < cutoff_time:
+                    os.unlink(entry.path)
+                    try:
+                        os.unlink(entry.path + '.crc')
+                    except FileNotFoundError:
+                        pass
+                    deleted_count += 1
+            elif name.endswith('.dir'):
+                if entry.stat().st_mtime < cutoff_time:
+                    shutil.rmtree(entry.path)
+                    deleted_count += 1
     
     if deleted_count > 0:
         print(f"🗑️  Cleaned up {deleted_count} old backup(s)")
 
 def list_backups(backup_dir):
     """List all available backups"""
-    backups = sorted(backup_dir.glob('congress_backup_*.sql.gz'))
+    backups = sorted(scan_backups(backup_dir), key=lambda e: e.name)
     
     if not backups:
         print("No backups found")
         return
     
     print("Available backups:")
-    for backup in backups:
-        size_mb = backup.stat().st_size / (1024 * 1024)
-        modified = datetime.fromtimestamp(backup.stat().st_mtime)
-        print(f"  {backup.name} - {size_mb:.2f} MB - {modified}")
+    for entry in backups:
+        stat = entry.stat()
+        size = backup_size(Path(entry.path)) if entry.is_dir() else stat.st_size
+        size_mb = size / (1024 * 1024)
+        modified = datetime.fromtimestamp(stat.st_mtime)
+        print(f"  {entry.name} - {size_mb:.2f} MB - {modified}")
 
-def restore_backup(db_config, backup_file):
+def restore_backup(db_config, backup_file, jobs=None):
     """Restore database from backup"""
     if not backup_file.exists():
         print(f"❌ Backup file not found: {backup_file}")
@@ -124,33 +279,82 @@ def restore_backup(db_config, backup_file):
     print(f"Restoring from backup: {backup_file}")
     print("⚠️  This will overwrite the current database!")
     
+    if backup_file.is_dir():
+        return restore_parallel_backup(db_config, backup_file, jobs or os.cpu_count())
+    
+    ok, message = verify_checksum(backup_file)
+    print(f"   {message}")
+    if not ok:
+        print("❌ Restore aborted: backup file is corrupt")
+        return False
+    
     try:
-        # Decompress backup
-        temp_file = backup_file.parent / 'temp_restore.sql'
+        env = os.environ.copy()
+        env['PGPASSWORD'] = db_config['password']
         
-        with gzip.open(backup_file, 'rb') as f_in:
-            with open(temp_file, 'wb') as f_out:
-                shutil.copyfileobj(f_in, f_out)
+        cmd = [
+            'psql',
+            '-h', db_config['host'],
+            '-p', str(db_config['port']),
+            '-U', db_config['user'],
+            '-d', db_config['database'],
+            '--no-password'
+        ]
+        
+        # Decompress straight into psql's stdin rather than through a full-size
+        # temp file; stderr goes to a temp file so it can never stall the pipe.
+        with tempfile.TemporaryFile() as stderr_file:
+            proc = subprocess.Popen(cmd, env=env, stdin=subprocess.PIPE,
+                                    stdout=subprocess.DEVNULL, stderr=stderr_file)
+            try:
+                with gzip.open(backup_file, 'rb') as f_in:
+                    shutil.copyfileobj(f_in, proc.stdin, length=1 << 20)
+            except BrokenPipeError:
+                pass  # psql exited early; its return code and stderr say why
+            except BaseException:
+                # Don't leave psql running on a half-fed input
+                proc.kill()
+                raise
+            finally:
+                try:
+                    proc.stdin.close()
+                except BrokenPipeError:
+                    pass
+                returncode = proc.wait()
+            
+            if returncode != 0:
+                stderr_file.seek(0)
+                print(f"❌ Restore failed: {stderr_file.read().decode(errors='replace')}")
+                return False
+        
+        print("✅ Restore completed successfully")
+        return True
         
-        # Restore using psql
+    except Exception as e:
+        print(f"❌ Restore failed: {str(e)}")
+        return False
+
+def restore_parallel_backup(db_config, backup_path, jobs):
+    """Restore a directory-format backup with pg_restore using parallel workers"""
+    try:
         env = os.environ.copy()
         env['PGPASSWORD'] = db_config['password']
         
         cmd = [
-            'psql',
+            'pg_restore',
             '-h', db_config['host'],
             '-p', str(db_config['port']),
             '-U', db_config['user'],
             '-d', db_config['database'],
             '--no-password',
-            '--file', str(temp_file)
+            '--clean',
+            '--if-exists',
+            '-j', str(jobs),
+            str(backup_path)
         ]
         
         result = subprocess.run(cmd, env=env, capture_output=True, text=True)
         
-        # Clean up temp file
-        temp_file.unlink()
-        
         if result.returncode != 0:
             print(f"❌ Restore failed: {result.stderr}")
             return False
@@ -170,6 +374,9 @@ def main():
     parser.add_argument('--backup', action='store_true', help='Create new backup')
     parser.add_argument('--list', action='store_true', help='List available backups')
     parser.add_argument('--restore', type=str, help='Restore from specific backup file')
+    parser.add_argument('--jobs', type=int, nargs='?', const=os.cpu_count(),
+                        help='Use directory format with N parallel pg_dump/pg_restore workers '
+                             '(default: CPU count)')
     
     args = parser.parse_args()
     
@@ -178,7 +385,7 @@ def main():
     backup_dir = create_backup_directory()
     
     if args.backup:
-        success = create_backup(db_config, backup_dir)
+        success = create_backup(db_config, backup_dir, jobs=args.jobs)
         sys.exit(0 if success else 1)
     
     elif args.list:
@@ -187,12 +394,12 @@ def main():
     
     elif args.restore:
         backup_file = backup_dir / args.restore
-        success = restore_backup(db_config, backup_file)
+        success = restore_backup(db_config, backup_file, jobs=args.jobs)
         sys.exit(0 if success else 1)
     
     else:
         # Default: create backup
-        success = create_backup(db_config, backup_dir)
+        success = create_backup(db_config, backup_dir, jobs=args.jobs)
         sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
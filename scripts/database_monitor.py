@@ -6,35 +6,31 @@ Monitors database health, performance, and ingestion status
 
 import sys
 import json
+import functools
 import psycopg2
 from datetime import datetime
 from psycopg2.extras import RealDictCursor
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+@functools.lru_cache(maxsize=1)
 def load_config():
     """Load database configuration"""
-    with open('../config/config.json', 'r') as f:
-        config = json.load(f)
+    with open('../config/config.json', 'rb') as f:
+        data = f.read()
+    config = orjson.loads(data) if orjson else json.loads(data)
     return config['database']
 
-def test_connection(db_config):
-    """Test database connection"""
-    try:
-        conn = psycopg2.connect(
-            host=db_config['host'],
-            port=db_config['port'],
-            database=db_config['database'],
-            user=db_config['user'],
-            password=db_config['password']
-        )
-        conn.close()
-        return True, "✅ Connected successfully"
-    except Exception as e:
-        return False, f"❌ Connection failed: {str(e)}"
+_conn = None
 
-def get_table_counts(db_config):
-    """Get record counts for all tables"""
-    try:
-        conn = psycopg2.connect(
+def get_conn(db_config):
+    """Return the monitor's database connection, opening it on first use"""
+    global _conn
+    if _conn is None or _conn.closed:
+        _conn = psycopg2.connect(
             host=db_config['host'],
             port=db_config['port'],
             database=db_config['database'],
@@ -42,129 +38,127 @@ def get_table_counts(db_config):
             password=db_config['password'],
             cursor_factory=RealDictCursor
         )
-        cursor = conn.cursor()
-        
-        query = """
-        SELECT 'collections' as table_name, COUNT(*) as record_count FROM collections
-        UNION ALL
-        SELECT 'packages', COUNT(*) FROM packages
-        UNION ALL
-        SELECT 'bills', COUNT(*) FROM bills
-        UNION ALL
-        SELECT 'legislators', COUNT(*) FROM legislators
-        UNION ALL
-        SELECT 'votes', COUNT(*) FROM votes
-        UNION ALL
-        SELECT 'ingestion_log', COUNT(*) FROM ingestion_log
-        ORDER BY table_name;
-        """
-        
-        cursor.execute(query)
-        results = cursor.fetchall()
-        
-        conn.close()
-        return results
-    except Exception as e:
-        return None
+        # Read-only queries: autocommit keeps the monitor from idling in a transaction
+        _conn.autocommit = True
+    return _conn
 
-def get_ingestion_status(db_config):
-    """Get recent ingestion activity"""
+def test_connection(db_config):
+    """Test database connection"""
     try:
-        conn = psycopg2.connect(
-            host=db_config['host'],
-            port=db_config['port'],
-            database=db_config['database'],
-            user=db_config['user'],
-            password=db_config['password'],
-            cursor_factory=RealDictCursor
-        )
-        cursor = conn.cursor()
-        
-        query = """
-        SELECT 
-            collection_code,
-            operation_type,
-            status,
-            COUNT(*) as operation_count,
-            MAX(started_at) as last_operation
-        FROM ingestion_log 
-        WHERE started_at >= NOW() - INTERVAL '24 hours'
-        GROUP BY collection_code, operation_type, status
-        ORDER BY last_operation DESC;
-        """
-        
-        cursor.execute(query)
-        results = cursor.fetchall()
-        
-        conn.close()
-        return results
+        get_conn(db_config)
+        return True, "✅ Connected successfully"
     except Exception as e:
-        return None
+        return False, f"❌ Connection failed: {str(e)}"
 
-def get_database_size(db_config):
-    """Get database and table sizes"""
-    try:
-        conn = psycopg2.connect(
-            host=db_config['host'],
-            port=db_config['port'],
-            database=db_config['database'],
-            user=db_config['user'],
-            password=db_config['password'],
-            cursor_factory=RealDictCursor
-        )
-        cursor = conn.cursor()
-        
-        query = f"""
-        SELECT 
-            pg_size_pretty(pg_database_size('{db_config["database"]}')) as database_size,
-            pg_size_pretty(pg_total_relation_size('packages')) as packages_size,
-            pg_size_pretty(pg_total_relation_size('bills')) as bills_size;
-        """
-        
-        cursor.execute(query)
-        results = cursor.fetchone()
-        
-        conn.close()
-        return results
-    except Exception as e:
-        return None
+# Planner estimates from pg_class are O(1) and kept fresh by autovacuum's
+# ANALYZE; use --exact when true row counts are needed.
+ESTIMATED_COUNTS = """
+    SELECT relname as table_name, GREATEST(reltuples, 0)::bigint as record_count
+    FROM pg_class
+    WHERE oid IN (
+        to_regclass('collections'), to_regclass('packages'), to_regclass('bills'),
+        to_regclass('legislators'), to_regclass('votes'), to_regclass('ingestion_log')
+    )
+"""
 
-def get_recent_errors(db_config):
-    """Get recent errors from ingestion log"""
-    try:
-        conn = psycopg2.connect(
-            host=db_config['host'],
-            port=db_config['port'],
-            database=db_config['database'],
-            user=db_config['user'],
-            password=db_config['password'],
-            cursor_factory=RealDictCursor
-        )
-        cursor = conn.cursor()
-        
-        query = """
-        SELECT 
-            collection_code,
-            operation_type,
-            error_message,
-            started_at
-        FROM ingestion_log 
-        WHERE status = 'error' 
-            AND started_at >= NOW() - INTERVAL '24 hours'
-        ORDER BY started_at DESC
-        LIMIT 10;
-        """
-        
+EXACT_COUNTS = """
+    SELECT 'collections' as table_name, COUNT(*) as record_count FROM collections
+    UNION ALL
+    SELECT 'packages', COUNT(*) FROM packages
+    UNION ALL
+    SELECT 'bills', COUNT(*) FROM bills
+    UNION ALL
+    SELECT 'legislators', COUNT(*) FROM legislators
+    UNION ALL
+    SELECT 'votes', COUNT(*) FROM votes
+    UNION ALL
+    SELECT 'ingestion_log', COUNT(*) FROM ingestion_log
+"""
+
+MONITOR_QUERY = """
+WITH counts AS ({counts}),
+ingestion AS (
+    SELECT 
+        collection_code,
+        operation_type,
+        status,
+        COUNT(*) as operation_count,
+        MAX(started_at) as last_operation
+    FROM ingestion_log 
+    WHERE started_at >= NOW() - INTERVAL '24 hours'
+    GROUP BY collection_code, operation_type, status
+),
+errors AS (
+    SELECT 
+        collection_code,
+        operation_type,
+        error_message,
+        started_at
+    FROM ingestion_log 
+    WHERE status = 'error' 
+        AND started_at >= NOW() - INTERVAL '24 hours'
+    ORDER BY started_at DESC
+    LIMIT 10
+)
+SELECT json_build_object(
+    'counts', (SELECT json_agg(c ORDER BY c.table_name) FROM counts c),
+    'ingestion', (SELECT json_agg(i ORDER BY i.last_operation DESC) FROM ingestion i),
+    'sizes', json_build_object(
+        'database_size', pg_size_pretty(pg_database_size(current_database())),
+        'packages_size', pg_size_pretty(pg_total_relation_size('packages')),
+        'bills_size', pg_size_pretty(pg_total_relation_size('bills'))
+    ),
+    'errors', (SELECT json_agg(e ORDER BY e.started_at DESC) FROM errors e)
+) AS report;
+"""
+
+def get_report(conn, exact=False):
+    """Collect counts, ingestion activity, sizes and errors in one round-trip
+    
+    The sections share one query, so any failure (a missing table, a denied
+    permission) raises rather than returning a partial, falsely clean report.
+    """
+    query = MONITOR_QUERY.format(counts=EXACT_COUNTS if exact else ESTIMATED_COUNTS)
+    with conn.cursor() as cursor:
         cursor.execute(query)
-        results = cursor.fetchall()
-        
-        conn.close()
-        return results
-    except Exception as e:
-        return None
+        return cursor.fetchone()['report']
+
+def print_json_report(db_config, exact=False):
+    """Write the report as JSON to stdout; returns the process exit code"""
+    success, message = test_connection(db_config)
+    if success:
+        conn = get_conn(db_config)
+        try:
+            report = get_report(conn, exact=exact)
+        except Exception as e:
+            success, report = False, {'error': f'Report failed: {str(e)}'}
+        finally:
+            conn.close()
+    else:
+        report = {'error': message}
+    
+    report['connected'] = success
+    if orjson:
+        sys.stdout.buffer.write(orjson.dumps(report) + b'\n')
+    else:
+        sys.stdout.write(json.dumps(report) + '\n')
+    return 0 if success else 1
 
 def main():
     """Main monitoring function"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='PostgreSQL Database Health Monitor')
+    parser.add_argument('--exact', action='store_true',
+                        help='Use COUNT(*) instead of planner row estimates for table counts')
+    parser.add_argument('--json', action='store_true',
+                        help='Print the raw report as a single JSON object (for metrics scrapers)')
+    # Older invocations pass flags such as --health; keep ignoring those
+    args, _ = parser.parse_known_args()
+    
+    if args.json:
+        sys.exit(print_json_report(load_config(), exact=args.exact))
+    
     print("=== PostgreSQL Database Health Monitor ===")
     print()
     
@@ -180,9 +174,17 @@ def main():
         print("\n❌ Cannot connect to database. Please check connection settings.")
         sys.exit(1)
     
+    conn = get_conn(db_config)
+    try:
+        report = get_report(conn, exact=args.exact)
+    except Exception as e:
+        conn.close()
+        print(f"\n❌ Report failed: {str(e)}")
+        sys.exit(1)
+    
     # Get table counts
-    print("\n2. Table Record Counts:")
-    counts = get_table_counts(db_config)
+    print("\n2. Table Record Counts:" if args.exact else "\n2. Table Record Counts (estimated):")
+    counts = report.get('counts')
     if counts:
         for row in counts:
             print(f"   {row['table_name']}: {row['record_count']} records")
@@ -191,7 +193,7 @@ def main():
     
     # Get ingestion status
     print("\n3. Recent Ingestion Activity:")
-    ingestion = get_ingestion_status(db_config)
+    ingestion = report.get('ingestion')
     if ingestion:
         for row in ingestion:
             print(f"   {row['collection_code']} - {row['operation_type']} - {row['status']}: {row['operation_count']} operations (last: {row['last_operation']})")
@@ -200,7 +202,7 @@ def main():
     
     # Get database size
     print("\n4. Database Size:")
-    sizes = get_database_size(db_config)
+    sizes = report.get('sizes')
     if sizes:
         print(f"   Database: {sizes['database_size']}")
         print(f"   Packages table: {sizes['packages_size']}")
@@ -210,13 +212,15 @@ def main():
     
     # Get recent errors
     print("\n5. Recent Errors:")
-    errors = get_recent_errors(db_config)
+    errors = report.get('errors')
     if errors and len(errors) > 0:
         for row in errors:
             print(f"   {row['started_at']} - {row['collection_code']} - {row['error_message']}")
     else:
         print("   No recent errors")
     
+    conn.close()
+    
     print("\n✅ Monitor Complete")
 
 if __name__ == "__main__":
@@ -49,18 +49,19 @@ CREATE TABLE IF NOT EXISTS congress.bills (
     official_title TEXT,
     short_title TEXT,
     summary TEXT,
-    sponsor_id VARCHAR(50),
-    sponsor_name VARCHAR(100),
-    sponsor_state VARCHAR(2),
-    sponsor_party VARCHAR(10),
     introduced_date DATE,
     last_action_date DATE,
-    last_action TEXT,
-    status VARCHAR(50),
     url VARCHAR(255),
     pdf_url VARCHAR(255),
     text_content TEXT,
     metadata JSONB,
+    -- Extracted from metadata by the server, so the ingestor sends each value once
+    sponsor_id VARCHAR(50) GENERATED ALWAYS AS (left(metadata->'sponsor'->>'bioguideId', 50)) STORED,
+    sponsor_name VARCHAR(100) GENERATED ALWAYS AS (left(metadata->'sponsor'->>'name', 100)) STORED,
+    sponsor_state VARCHAR(2) GENERATED ALWAYS AS (left(metadata->'sponsor'->>'state', 2)) STORED,
+    sponsor_party VARCHAR(10) GENERATED ALWAYS AS (left(metadata->'sponsor'->>'party', 10)) STORED,
+    last_action TEXT GENERATED ALWAYS AS (left(metadata->'lastAction'->>'text', 1000)) STORED,
+    status VARCHAR(50) GENERATED ALWAYS AS (left(metadata->'latestAction'->>'text', 50)) STORED,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
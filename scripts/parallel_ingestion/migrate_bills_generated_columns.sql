@@ -0,0 +1,33 @@
+-- Convert congress.bills sponsor/action columns to generated columns
+--
+-- parallel_ingestor.py used to extract sponsor and lastAction/latestAction fields in Python and
+-- send them alongside the full record in metadata. They are now computed by the server from
+-- metadata (PostgreSQL 12+), so each value crosses the wire once. Databases created from the
+-- current create_postgres_schema.sql already have these columns and do not need this script.
+--
+-- Adding STORED generated columns rewrites the table; run it in a maintenance window.
+-- The script fails (and rolls back) if congress.recent_bills or another view depends on the
+-- columns; drop the view first and recreate it afterwards.
+
+BEGIN;
+
+ALTER TABLE congress.bills
+    DROP COLUMN sponsor_id,
+    DROP COLUMN sponsor_name,
+    DROP COLUMN sponsor_state,
+    DROP COLUMN sponsor_party,
+    DROP COLUMN last_action,
+    DROP COLUMN status;
+
+ALTER TABLE congress.bills
+    ADD COLUMN sponsor_id VARCHAR(50) GENERATED ALWAYS AS (left(metadata->'sponsor'->>'bioguideId', 50)) STORED,
+    ADD COLUMN sponsor_name VARCHAR(100) GENERATED ALWAYS AS (left(metadata->'sponsor'->>'name', 100)) STORED,
+    ADD COLUMN sponsor_state VARCHAR(2) GENERATED ALWAYS AS (left(metadata->'sponsor'->>'state', 2)) STORED,
+    ADD COLUMN sponsor_party VARCHAR(10) GENERATED ALWAYS AS (left(metadata->'sponsor'->>'party', 10)) STORED,
+    ADD COLUMN last_action TEXT GENERATED ALWAYS AS (left(metadata->'lastAction'->>'text', 1000)) STORED,
+    ADD COLUMN status VARCHAR(50) GENERATED ALWAYS AS (left(metadata->'latestAction'->>'text', 50)) STORED;
+
+-- Dropped together with sponsor_id above
+CREATE INDEX IF NOT EXISTS idx_bills_sponsor ON congress.bills(sponsor_id);
+
+COMMIT;
@@ -1,66 +1,204 @@
 #!/usr/bin/env python3
 """
 Parallel Congress Data Ingestion System
-Uses multiprocessing and threading for high-performance data ingestion
+Uses multiprocessing and asyncio for high-performance data ingestion
 """
 
+import asyncio
+import gzip
+import hashlib
 import os
 import sys
 import json
 import time
 import requests
+from requests.adapters import HTTPAdapter
 import psycopg2
+import psycopg2.extensions
+from psycopg2.extras import Json, execute_batch, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 import multiprocessing
+import tempfile
 import threading
-import queue
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from collections import Counter, deque, namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from operator import itemgetter
 from typing import List, Dict, Any, Optional
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# orjson is a faster drop-in for API decoding and metadata encoding
+try:
+    import orjson
+    
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+    
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    json_loads = json.loads
+
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+class TokenBucket:
+    """Token-bucket rate limiter fed by the API's rate-limit headers
+    
+    Tokens refill continuously at rate_limit/period per second up to burst,
+    so a client never bursts through its hourly quota and then stalls for
+    the rest of the hour. reserve() takes a token and returns how long the
+    caller must sleep before using it; callers sleep with time.sleep or
+    asyncio.sleep as appropriate.
+    """
+    
+    # Stay slightly under the advertised quota to absorb clock skew
+    HEADROOM = 0.95
+    
+    def __init__(self, rate_limit: int, period: float = 3600, burst: int = 50):
+        self.rate = rate_limit * self.HEADROOM / period
+        self.burst = max(1, min(burst, rate_limit))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Take one token and return the delay in seconds before it may be used"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(delay, self.blocked_until - now)
+    
+    def observe(self, status: int, headers) -> None:
+        """Adjust the bucket from X-RateLimit-Remaining and Retry-After"""
+        remaining = headers.get('X-RateLimit-Remaining')
+        retry_after = headers.get('Retry-After')
+        with self.lock:
+            if remaining is not None:
+                try:
+                    # The server's count is authoritative; never hold more than it allows
+                    self.tokens = min(self.tokens, float(remaining))
+                except ValueError:
+                    pass
+            if retry_after is not None and status in (429, 503):
+                try:
+                    self.blocked_until = max(self.blocked_until, time.monotonic() + float(retry_after))
+                except ValueError:
+                    pass
+
+class ResponseCache:
+    """On-disk cache of raw API responses, gzipped and keyed by URL and params
+    
+    Lets a backfill that failed at the database, or was restarted, replay
+    from disk instead of spending the hourly API quota again. Paged listing
+    requests are not cached: a listing changes as bills are introduced, so
+    a cached page would hide new records forever.
+    """
+    
+    # Query parameters that mark a request as a paged listing
+    LISTING_PARAMS = ('offset', 'limit')
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+    
+    def path(self, url: str, params: Optional[Dict] = None) -> str:
+        """Return the cache file for a request"""
+        key = url + '?' + json.dumps(params or {}, sort_keys=True)
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + '.json.gz')
+    
+    def cacheable(self, params: Optional[Dict] = None) -> bool:
+        """Return whether a request with these params may be cached"""
+        return not any(name in (params or {}) for name in self.LISTING_PARAMS)
+    
+    def get(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """Return the cached response body, or None on a miss"""
+        try:
+            with open(self.path(url, params), 'rb') as f:
+                return json_loads(gzip.decompress(f.read()))
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+    
+    def put(self, url: str, params: Optional[Dict], content: bytes) -> None:
+        """Store a raw response body atomically
+        
+        A full or read-only cache directory only costs the cache entry; the
+        response has already been fetched and is still returned to the caller.
+        """
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress(content, compresslevel=6))
+            os.replace(tmp_path, self.path(url, params))
+        except OSError as e:
+            print(f"Failed to cache {url}: {str(e)}")
+            if tmp_path:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
 class CongressAPIClient:
     """API client for Congress.gov with rate limiting"""
     
-    def __init__(self, api_key: str, base_url: str = "https://api.congress.gov/v3", rate_limit: int = 1000):
+    def __init__(self, api_key: str, base_url: str = "https://api.congress.gov/v3", rate_limit: int = 1000,
+                 cache_dir: Optional[str] = None):
         self.api_key = api_key
         self.base_url = base_url
         self.rate_limit = rate_limit
-        self.last_request_time = 0
-        self.request_count = 0
+        self.limiter = TokenBucket(rate_limit)
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
         self.session = requests.Session()
         self.session.headers.update({
             'X-API-KEY': self.api_key,
             'Accept': 'application/json'
         })
+        
+        # One keep-alive pool per process, sized for the ingestor's workers,
+        # so each request does not pay for a fresh TCP+TLS handshake. Retries
+        # stay in get(), where every attempt takes a token from the limiter
+        adapter = HTTPAdapter(pool_connections=64, pool_maxsize=64, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
     
     def _rate_limit_wait(self):
         """Enforce rate limiting"""
-        current_time = time.time()
-        if current_time - self.last_request_time < 3600:
-            if self.request_count >= self.rate_limit:
-                wait_time = 3600 - (current_time - self.last_request_time)
-                time.sleep(wait_time)
-                self.request_count = 0
-                self.last_request_time = time.time()
-        else:
-            self.request_count = 0
-            self.last_request_time = current_time
-        
-        self.request_count += 1
+        delay = self.limiter.reserve()
+        if delay > 0:
+            time.sleep(delay)
     
     def get(self, endpoint: str, params: Optional[Dict] = None, max_retries: int = 3) -> Optional[Dict]:
         """Make API request with rate limiting and retries"""
         url = f"{self.base_url}/{endpoint}"
+        cache = self.cache if self.cache and self.cache.cacheable(params) else None
+        if cache:
+            cached = cache.get(url, params)
+            if cached is not None:
+                return cached
         
         for attempt in range(max_retries):
             try:
                 self._rate_limit_wait()
                 response = self.session.get(url, params=params, timeout=30)
+                self.limiter.observe(response.status_code, response.headers)
                 response.raise_for_status()
-                return response.json()
-            except requests.exceptions.RequestException as e:
+                # Decoded before caching: a body that fails to parse is retried, never stored
+                data = json_loads(response.content)
+                if cache:
+                    cache.put(url, params, response.content)
+                return data
+            except (requests.exceptions.RequestException, ValueError) as e:
                 if attempt == max_retries - 1:
                     print(f"Failed to fetch {url}: {str(e)}")
                     return None
@@ -68,283 +206,590 @@ class CongressAPIClient:
         
         return None
 
+class AsyncCongressAPIClient:
+    """Async API client for Congress.gov sharing one aiohttp session per process"""
+    
+    def __init__(self, api_key: str, base_url: str = "https://api.congress.gov/v3", rate_limit: int = 1000,
+                 concurrency: int = 64, cache_dir: Optional[str] = None):
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp is required for AsyncCongressAPIClient (pip install aiohttp)")
+        self.api_key = api_key
+        self.base_url = base_url
+        self.rate_limit = rate_limit
+        self.concurrency = concurrency
+        self.limiter = TokenBucket(rate_limit)
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self._session = None
+        self._semaphore = None
+    
+    async def _get_session(self):
+        """Create the shared session lazily, inside the running event loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers={
+                    'X-API-KEY': self.api_key,
+                    'Accept': 'application/json'
+                },
+                # Every request goes to one host: size the pool to the
+                # concurrency and keep idle connections (and the DNS answer)
+                # around between bursts so fan-outs reuse warm TLS sessions
+                connector=aiohttp.TCPConnector(
+                    limit=self.concurrency,
+                    limit_per_host=self.concurrency,
+                    keepalive_timeout=60,
+                    ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+    
+    async def _rate_limit_wait(self):
+        """Enforce rate limiting"""
+        delay = self.limiter.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    async def get(self, endpoint: str, params: Optional[Dict] = None, max_retries: int = 3) -> Optional[Dict]:
+        """Make API request with rate limiting and retries"""
+        url = f"{self.base_url}/{endpoint}"
+        cache = self.cache if self.cache and self.cache.cacheable(params) else None
+        if cache:
+            cached = cache.get(url, params)
+            if cached is not None:
+                return cached
+        session = await self._get_session()
+        
+        for attempt in range(max_retries):
+            try:
+                await self._rate_limit_wait()
+                async with self._semaphore:
+                    async with session.get(url, params=params) as response:
+                        self.limiter.observe(response.status, response.headers)
+                        response.raise_for_status()
+                        content = await response.read()
+                # Decoded before caching: a body that fails to parse is retried, never stored
+                data = json_loads(content)
+                if cache:
+                    await asyncio.to_thread(cache.put, url, params, content)
+                return data
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                if attempt == max_retries - 1:
+                    print(f"Failed to fetch {url}: {str(e)}")
+                    return None
+                await asyncio.sleep(2 ** attempt)
+        
+        return None
+    
+    async def close(self):
+        """Close the shared session"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+class PreparingConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers which statements it has PREPAREd"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
 class DatabaseManager:
-    """Database manager for PostgreSQL"""
+    """Database manager for PostgreSQL backed by a thread-safe connection pool"""
     
-    def __init__(self, db_config: Dict):
+    def __init__(self, db_config: Dict, pool_size: int = 8):
         self.db_config = db_config
-        self.connection = None
-        self.lock = threading.Lock()
+        self.pool_size = pool_size
+        self.pool = None
     
     def connect(self):
-        """Establish database connection"""
+        """Open the connection pool"""
         try:
-            self.connection = psycopg2.connect(**self.db_config)
+            self.pool = ThreadedConnectionPool(
+                min(4, self.pool_size), self.pool_size,
+                connection_factory=PreparingConnection, **self.db_config
+            )
             return True
         except Exception as e:
             print(f"Database connection failed: {str(e)}")
             return False
     
+    @contextmanager
+    def _connection(self):
+        """Check a connection out of the pool for the duration of one call"""
+        if self.pool is None and not self.connect():
+            yield None
+            return
+        conn = self.pool.getconn()
+        try:
+            yield conn
+        finally:
+            # Drop connections the server closed so the pool opens fresh ones
+            self.pool.putconn(conn, close=bool(conn.closed))
+    
     def execute(self, query: str, params: Optional[tuple] = None, fetch: bool = False):
-        """Execute SQL query with thread-safe connection handling"""
-        with self.lock:
-            if not self.connection or self.connection.closed:
-                if not self.connect():
-                    return None
+        """Execute SQL query on a pooled connection"""
+        with self._connection() as conn:
+            if conn is None:
+                return None
             
             try:
-                with self.connection.cursor() as cursor:
+                with conn.cursor() as cursor:
                     cursor.execute(query, params)
-                    if fetch:
-                        return cursor.fetchall()
-                    self.connection.commit()
-                    return True
+                    rows = cursor.fetchall() if fetch else True
+                conn.commit()
+                return rows
             except Exception as e:
-                self.connection.rollback()
+                conn.rollback()
                 print(f"Query failed: {str(e)}")
                 return None
     
+    def execute_values(self, query: str, rows: List[tuple], page_size: int = 500):
+        """Insert many rows with multi-row VALUES statements in one transaction"""
+        with self._connection() as conn:
+            if conn is None:
+                return None
+            
+            try:
+                with conn.cursor() as cursor:
+                    execute_values(cursor, query, rows, page_size=page_size)
+                conn.commit()
+                return True
+            except Exception as e:
+                conn.rollback()
+                print(f"Batch insert failed: {str(e)}")
+                return None
+    
+    def execute_prepared(self, name: str, prepare_sql: str, rows: List[tuple]):
+        """Run a server-side prepared statement once per row in one transaction
+        
+        The statement is PREPAREd the first time each pooled connection uses
+        it, so later rows skip parsing and planning on the server.
+        """
+        with self._connection() as conn:
+            if conn is None:
+                return None
+            
+            try:
+                with conn.cursor() as cursor:
+                    if name not in conn.prepared:
+                        # Committed on its own so a failed batch cannot roll it back
+                        cursor.execute(prepare_sql)
+                        conn.commit()
+                        conn.prepared.add(name)
+                    placeholders = ', '.join(['%s'] * len(rows[0]))
+                    execute_batch(cursor, f"EXECUTE {name} ({placeholders})", rows)
+                conn.commit()
+                return True
+            except Exception as e:
+                conn.rollback()
+                print(f"Prepared insert failed: {str(e)}")
+                return None
+    
     def close(self):
-        """Close database connection"""
-        if self.connection and not self.connection.closed:
-            self.connection.close()
+        """Close all pooled connections"""
+        if self.pool and not self.pool.closed:
+            self.pool.closeall()
+        self.pool = None
+
+# Field schemas in INSERT column order: (column, source path, default,
+# max length, value when the parent object is missing). A path of
+# 'parent.key' reads from a nested object. With no default, empty values
+# become None. compile_row_builder turns a schema into straight-line code
+# so every key is looked up once and no intermediate dict is built.
+#
+# The bills sponsor_* / last_action / status columns are generated by
+# PostgreSQL from metadata (see create_postgres_schema.sql), so they are
+# not sent.
+BILL_FIELDS = (
+    ('bill_id', 'billId', '', None, None),
+    ('congress', 'congress', 0, None, None),
+    ('bill_type', 'type', '', None, None),
+    ('bill_number', 'number', '', None, None),
+    ('title', 'title', '', 500, None),
+    ('official_title', 'officialTitle', None, 1000, None),
+    ('summary', 'summary', None, 2000, None),
+    ('introduced_date', 'introducedDate', '', None, None),
+    ('last_action_date', 'lastAction.actionDate', '', None, None),
+    ('url', 'url', None, 255, None),
+    ('pdf_url', 'pdf', None, 255, None),
+    ('text_content', 'text', None, 5000, None),
+    ('metadata', None, None, None, None),
+)
+
+LEGISLATOR_FIELDS = (
+    ('legislator_id', None, None, None, None),
+    ('bioguide_id', None, None, None, None),
+    ('name', 'name.officialFull', '', 100, ''),
+    ('first_name', 'name.first', '', 50, None),
+    ('last_name', 'name.last', '', 50, None),
+    ('middle_name', 'name.middle', '', 50, None),
+    ('suffix', 'name.suffix', '', 10, None),
+    ('gender', 'gender', None, 20, None),
+    ('birth_date', 'dateOfBirth', None, None, None),
+    ('party', 'party', None, 10, None),
+    ('state', 'state', None, 2, None),
+    ('district', 'district', None, 10, None),
+    ('chamber', 'chamber', None, 10, None),
+    ('title', 'title', None, 20, None),
+    ('phone', 'phone', None, 20, None),
+    ('office', 'office', None, 50, None),
+    ('website', 'url', None, 255, None),
+    ('twitter', 'twitter', None, 50, None),
+    ('facebook', 'facebook', None, 100, None),
+    ('youtube', 'youtube', None, 100, None),
+    ('instagram', 'instagram', None, 100, None),
+    ('term_start', 'termStart', None, None, None),
+    ('term_end', 'termEnd', None, None, None),
+    ('in_office', 'inOffice', True, None, None),
+    ('metadata', None, None, None, None),
+)
+
+BILL_COLUMNS = tuple(field[0] for field in BILL_FIELDS)
+LEGISLATOR_COLUMNS = tuple(field[0] for field in LEGISLATOR_FIELDS)
+
+def compile_row_builder(name: str, fields: tuple, computed: Dict[str, str], prologue: str = '') -> Any:
+    """Generate a function mapping an API record to a tuple in fields order
+    
+    Columns without a source path come from computed, which maps them to
+    expressions over the record and any names bound in prologue.
+    """
+    lines = [f"def {name}(record):", "    get = record.get"]
+    if prologue:
+        lines.append(f"    {prologue}")
+    parents = []
+    values = []
+    for i, (column, path, default, max_len, missing) in enumerate(fields):
+        if path is None:
+            values.append(computed[column])
+            continue
+        parent, _, key = path.rpartition('.')
+        if parent and parent not in parents:
+            parents.append(parent)
+            lines.append(f"    p_{parent} = get({parent!r})")
+        getter = f"p_{parent}.get" if parent else "get"
+        if default is None:
+            lines.append(f"    v{i} = {getter}({key!r})")
+            value = f"(v{i}[:{max_len}] if v{i} else None)" if max_len else f"(v{i} or None)"
+        else:
+            value = f"{getter}({key!r}, {default!r})" + (f"[:{max_len}]" if max_len else "")
+        if parent:
+            value = f"({value} if p_{parent} else {missing!r})"
+        values.append(value)
+    lines.append("    return (")
+    lines.extend(f"        {value}," for value in values)
+    lines.append("    )")
+    namespace = {'Json': Json, 'json_dumps': json_dumps}
+    exec('\n'.join(lines), namespace)
+    return namespace[name]
 
 class DataProcessor:
     """Data processing and transformation"""
     
+    BILL_COLUMNS = BILL_COLUMNS
+    LEGISLATOR_COLUMNS = LEGISLATOR_COLUMNS
+    
+    # Rows in BILL_INSERT_SQL / LEGISLATOR_INSERT_SQL parameter order
+    bill_row = staticmethod(compile_row_builder(
+        'bill_row', BILL_FIELDS, {'metadata': 'Json(record, dumps=json_dumps)'}
+    ))
+    legislator_row = staticmethod(compile_row_builder(
+        'legislator_row', LEGISLATOR_FIELDS,
+        {'legislator_id': 'bioguide_id', 'bioguide_id': 'bioguide_id', 'metadata': 'Json(record, dumps=json_dumps)'},
+        prologue="bioguide_id = get('id', {}).get('bioguide', '') or get('bioguideId', '')"
+    ))
+    
     @staticmethod
     def process_bill_data(bill_data: Dict) -> Dict:
         """Process bill data for database insertion"""
-        processed = {
-            'bill_id': bill_data.get('billId', ''),
-            'congress': bill_data.get('congress', 0),
-            'bill_type': bill_data.get('type', ''),
-            'bill_number': bill_data.get('number', ''),
-            'title': bill_data.get('title', '')[:500],
-            'official_title': bill_data.get('officialTitle', '')[:1000] if bill_data.get('officialTitle') else None,
-            'summary': bill_data.get('summary', '')[:2000] if bill_data.get('summary') else None,
-            'sponsor_id': bill_data.get('sponsor', {}).get('bioguideId', '') if bill_data.get('sponsor') else None,
-            'sponsor_name': bill_data.get('sponsor', {}).get('name', '') if bill_data.get('sponsor') else None,
-            'sponsor_state': bill_data.get('sponsor', {}).get('state', '') if bill_data.get('sponsor') else None,
-            'sponsor_party': bill_data.get('sponsor', {}).get('party', '') if bill_data.get('sponsor') else None,
-            'introduced_date': bill_data.get('introducedDate', ''),
-            'last_action_date': bill_data.get('lastAction', {}).get('actionDate', '') if bill_data.get('lastAction') else None,
-            'last_action': bill_data.get('lastAction', {}).get('text', '')[:1000] if bill_data.get('lastAction') else None,
-            'status': bill_data.get('latestAction', {}).get('text', '')[:100] if bill_data.get('latestAction') else None,
-            'url': bill_data.get('url', '')[:255] if bill_data.get('url') else None,
-            'pdf_url': bill_data.get('pdf', '')[:255] if bill_data.get('pdf') else None,
-            'text_content': bill_data.get('text', '')[:5000] if bill_data.get('text') else None,
-            'metadata': json.dumps(bill_data)
-        }
-        return processed
+        return dict(zip(DataProcessor.BILL_COLUMNS, DataProcessor.bill_row(bill_data)))
     
     @staticmethod
     def process_legislator_data(legislator_data: Dict) -> Dict:
         """Process legislator data for database insertion"""
-        processed = {
-            'legislator_id': legislator_data.get('id', {}).get('bioguide', '') or legislator_data.get('bioguideId', ''),
-            'bioguide_id': legislator_data.get('id', {}).get('bioguide', '') or legislator_data.get('bioguideId', ''),
-            'name': legislator_data.get('name', {}).get('officialFull', '')[:100] if legislator_data.get('name') else '',
-            'first_name': legislator_data.get('name', {}).get('first', '')[:50] if legislator_data.get('name') else None,
-            'last_name': legislator_data.get('name', {}).get('last', '')[:50] if legislator_data.get('name') else None,
-            'middle_name': legislator_data.get('name', {}).get('middle', '')[:50] if legislator_data.get('name') else None,
-            'suffix': legislator_data.get('name', {}).get('suffix', '')[:10] if legislator_data.get('name') else None,
-            'gender': legislator_data.get('gender', '')[:20] if legislator_data.get('gender') else None,
-            'birth_date': legislator_data.get('dateOfBirth', '') if legislator_data.get('dateOfBirth') else None,
-            'party': legislator_data.get('party', '')[:10] if legislator_data.get('party') else None,
-            'state': legislator_data.get('state', '')[:2] if legislator_data.get('state') else None,
-            'district': legislator_data.get('district', '')[:10] if legislator_data.get('district') else None,
-            'chamber': legislator_data.get('chamber', '')[:10] if legislator_data.get('chamber') else None,
-            'title': legislator_data.get('title', '')[:20] if legislator_data.get('title') else None,
-            'phone': legislator_data.get('phone', '')[:20] if legislator_data.get('phone') else None,
-            'office': legislator_data.get('office', '')[:50] if legislator_data.get('office') else None,
-            'website': legislator_data.get('url', '')[:255] if legislator_data.get('url') else None,
-            'twitter': legislator_data.get('twitter', '')[:50] if legislator_data.get('twitter') else None,
-            'facebook': legislator_data.get('facebook', '')[:100] if legislator_data.get('facebook') else None,
-            'youtube': legislator_data.get('youtube', '')[:100] if legislator_data.get('youtube') else None,
-            'instagram': legislator_data.get('instagram', '')[:100] if legislator_data.get('instagram') else None,
-            'term_start': legislator_data.get('termStart', '') if legislator_data.get('termStart') else None,
-            'term_end': legislator_data.get('termEnd', '') if legislator_data.get('termEnd') else None,
-            'in_office': legislator_data.get('inOffice', True),
-            'metadata': json.dumps(legislator_data)
-        }
-        return processed
+        return dict(zip(DataProcessor.LEGISLATOR_COLUMNS, DataProcessor.legislator_row(legislator_data)))
+
+def insert_sql(table: str, columns: tuple, key: str) -> str:
+    """Build an execute_values INSERT for columns, skipping rows whose key exists"""
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s ON CONFLICT ({key}) DO NOTHING"
+
+# Built once at import from the same schemas as the row builders, so the
+# column order always matches the generated tuples
+BILL_INSERT_SQL = insert_sql('congress.bills', BILL_COLUMNS, 'bill_id')
+LEGISLATOR_INSERT_SQL = insert_sql('congress.legislators', LEGISLATOR_COLUMNS, 'legislator_id')
+
+def prepare_sql(name: str, insert_sql: str, columns: int) -> str:
+    """Turn a VALUES %s insert into a PREPARE statement with $n parameters"""
+    params = ', '.join(f'${i}' for i in range(1, columns + 1))
+    return f"PREPARE {name} AS " + insert_sql.replace('VALUES %s', f'VALUES ({params})')
+
+# Single-row inserts (BatchIngestor workers) go through these prepared statements
+BILL_PREPARE_SQL = prepare_sql('ingest_bill', BILL_INSERT_SQL, len(BILL_FIELDS))
+LEGISLATOR_PREPARE_SQL = prepare_sql('ingest_legislator', LEGISLATOR_INSERT_SQL, len(LEGISLATOR_FIELDS))
+
+# Outcome of fetching and processing one id
+Result = namedtuple('Result', 'data_type data_id status row error')
 
 class ParallelIngestor:
-    """Parallel data ingestion system"""
+    """Parallel data ingestion system, driven by a single asyncio event loop"""
     
-    def __init__(self, api_client: CongressAPIClient, db_manager: DatabaseManager, workers: int = 4):
+    INSERT_SQL = {
+        'bill': BILL_INSERT_SQL,
+        'legislator': LEGISLATOR_INSERT_SQL,
+    }
+    
+    # data_type -> (endpoint template, response key, row builder)
+    HANDLERS = {
+        'bill': ('bill/{}', 'bill', DataProcessor.bill_row),
+        'legislator': ('member/{}', 'member', DataProcessor.legislator_row),
+    }
+    
+    # Ids from a batch that are already stored, checked before any API call
+    EXISTING_SQL = {
+        'bill': "SELECT bill_id FROM congress.bills WHERE bill_id = ANY(%s)",
+        'legislator': "SELECT legislator_id FROM congress.legislators WHERE legislator_id = ANY(%s)",
+    }
+    
+    # Only the most recent errors are kept in the results
+    MAX_ERRORS = 100
+    
+    def __init__(self, api_client, db_manager: DatabaseManager, workers: int = 4,
+                 batch_size: int = 500):
         self.api_client = api_client
         self.db_manager = db_manager
         self.workers = workers
-        self.task_queue = queue.Queue()
-        self.result_queue = queue.Queue()
-        self.stop_event = threading.Event()
+        self.batch_size = batch_size
+        # Ids this ingestor has stored or found stored, per data type
+        self._seen = {data_type: set() for data_type in self.HANDLERS}
+        # A blocking CongressAPIClient still works; its calls run in threads
+        self._async_api = asyncio.iscoroutinefunction(api_client.get)
     
-    def _worker_thread(self):
-        """Worker thread for processing tasks"""
-        while not self.stop_event.is_set():
-            try:
-                task = self.task_queue.get(timeout=1)
-                if task is None:
-                    break
-                
-                data_type, data_id = task
-                result = self._process_task(data_type, data_id)
-                self.result_queue.put(result)
-                
-            except queue.Empty:
-                continue
-            except Exception as e:
-                print(f"Worker error: {str(e)}")
-    
-    def _process_task(self, data_type: str, data_id: str) -> Dict:
-        """Process individual task"""
-        result = {
-            'data_type': data_type,
-            'data_id': data_id,
-            'status': 'error',
-            'records': 0,
-            'error': None
-        }
+    async def _api_get(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """Call the API client without blocking the event loop"""
+        if self._async_api:
+            return await self.api_client.get(endpoint, params)
+        return await asyncio.to_thread(self.api_client.get, endpoint, params)
+    
+    async def _process_task(self, data_type: str, data_id: str) -> Result:
+        """Fetch and process individual task; the row is inserted later in a batch"""
+        handler = self.HANDLERS.get(data_type)
+        if handler is None:
+            return Result(data_type, data_id, 'error', None, f"Unknown data type: {data_type}")
+        endpoint, key, build_row = handler
         
         try:
-            if data_type == 'bill':
-                records = self._ingest_bill(data_id)
-            elif data_type == 'legislator':
-                records = self._ingest_legislator(data_id)
-            elif data_type == 'vote':
-                records = self._ingest_vote(data_id)
-            else:
-                result['error'] = f"Unknown data type: {data_type}"
-                return result
-            
-            result['status'] = 'success'
-            result['records'] = records
-            
+            data = await self._api_get(endpoint.format(data_id))
+            if not data or key not in data:
+                return Result(data_type, data_id, 'error', None, "Not found")
+            return Result(data_type, data_id, 'success', build_row(data[key]), None)
         except Exception as e:
-            result['error'] = str(e)
-        
-        return result
+            return Result(data_type, data_id, 'error', None, str(e))
+    
+    def _build_row(self, data_type: str, data: Optional[Dict]) -> Optional[tuple]:
+        """Turn an API response into an insert row, or None if the record is missing"""
+        _, key, build_row = self.HANDLERS[data_type]
+        if not data or key not in data:
+            return None
+        return build_row(data[key])
+    
+    def _fetch_bill(self, bill_id: str) -> Optional[tuple]:
+        """Fetch a bill and return its row for BILL_INSERT_SQL"""
+        return self._build_row('bill', self.api_client.get(f"bill/{bill_id}"))
+    
+    def _fetch_legislator(self, legislator_id: str) -> Optional[tuple]:
+        """Fetch a legislator and return its row for LEGISLATOR_INSERT_SQL"""
+        return self._build_row('legislator', self.api_client.get(f"member/{legislator_id}"))
     
     def _ingest_bill(self, bill_id: str) -> int:
         """Ingest single bill"""
-        data = self.api_client.get(f"bill/{bill_id}")
-        if not data or 'bill' not in data:
-            return 0
-        
-        bill_data = data['bill']
-        processed = DataProcessor.process_bill_data(bill_data)
-        
-        # Insert into database
-        query = '''
-        INSERT INTO congress.bills 
-        (bill_id, congress, bill_type, bill_number, title, official_title, summary, 
-         sponsor_id, sponsor_name, sponsor_state, sponsor_party, introduced_date, 
-         last_action_date, last_action, status, url, pdf_url, text_content, metadata)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (bill_id) DO NOTHING
-        '''
-        
-        params = (
-            processed['bill_id'], processed['congress'], processed['bill_type'], 
-            processed['bill_number'], processed['title'], processed['official_title'], 
-            processed['summary'], processed['sponsor_id'], processed['sponsor_name'], 
-            processed['sponsor_state'], processed['sponsor_party'], processed['introduced_date'],
-            processed['last_action_date'], processed['last_action'], processed['status'],
-            processed['url'], processed['pdf_url'], processed['text_content'], 
-            processed['metadata']
-        )
-        
-        if self.db_manager.execute(query, params):
+        row = self._fetch_bill(bill_id)
+        if row and self.db_manager.execute_prepared('ingest_bill', BILL_PREPARE_SQL, [row]):
             return 1
         
         return 0
     
     def _ingest_legislator(self, legislator_id: str) -> int:
         """Ingest single legislator"""
-        data = self.api_client.get(f"member/{legislator_id}")
-        if not data or 'member' not in data:
-            return 0
+        row = self._fetch_legislator(legislator_id)
+        if row and self.db_manager.execute_prepared('ingest_legislator', LEGISLATOR_PREPARE_SQL, [row]):
+            return 1
+        
+        return 0
+    
+    async def _worker(self, id_queue: asyncio.Queue, row_queue: asyncio.Queue, counts: Counter, errors: deque):
+        """Fetch ids until cancelled, passing rows on to the flusher"""
+        while True:
+            data_type, data_id = await id_queue.get()
+            try:
+                result = await self._process_task(data_type, data_id)
+                if result.status == 'success':
+                    await row_queue.put(result.row)
+                else:
+                    counts['failed'] += 1
+                    errors.append(f"{data_type} {data_id}: {result.error}")
+            finally:
+                id_queue.task_done()
+    
+    async def _flusher(self, query: str, data_type: str, row_queue: asyncio.Queue, counts: Counter,
+                       errors: deque):
+        """Write queued rows with execute_values in batches until a None sentinel"""
+        pending = []
+        done = False
+        while not done:
+            row = await row_queue.get()
+            if row is None:
+                done = True
+            else:
+                pending.append(row)
+            if pending and (done or len(pending) >= self.batch_size):
+                ok = await asyncio.to_thread(
+                    self.db_manager.execute_values, query, pending, self.batch_size
+                )
+                if ok:
+                    counts['success'] += len(pending)
+                    # The first column of every row is the record's id
+                    self._seen[data_type].update(row[0] for row in pending)
+                else:
+                    counts['failed'] += len(pending)
+                    errors.append(f"{data_type}: batch of {len(pending)} rows failed to insert")
+                pending = []
+    
+    async def ingest_data_parallel(self, data_type: str, data_ids: List[str]) -> Dict:
+        """Ingest data in parallel
         
-        legislator_data = data['member']
-        processed = DataProcessor.process_legislator_data(legislator_data)
+        self.workers tasks pull ids from an asyncio.Queue and hand rows to a
+        single flusher task, which writes them in batches of batch_size.
+        Each task keeps its own Counter; they are summed once at the end.
+        """
+        errors = deque(maxlen=self.MAX_ERRORS)
+        counters = [Counter() for _ in range(self.workers + 1)]
         
-        # Insert into database
-        query = '''
-        INSERT INTO congress.legislators 
-        (legislator_id, bioguide_id, name, first_name, last_name, middle_name, suffix, 
-         gender, birth_date, party, state, district, chamber, title, phone, office, 
-         website, twitter, facebook, youtube, instagram, term_start, term_end, 
-         in_office, metadata)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (legislator_id) DO NOTHING
-        '''
+        id_queue = asyncio.Queue()
+        row_queue = asyncio.Queue(maxsize=self.batch_size * 2)
         
-        params = (
-            processed['legislator_id'], processed['bioguide_id'], processed['name'], 
-            processed['first_name'], processed['last_name'], processed['middle_name'], 
-            processed['suffix'], processed['gender'], processed['birth_date'], 
-            processed['party'], processed['state'], processed['district'], 
-            processed['chamber'], processed['title'], processed['phone'], 
-            processed['office'], processed['website'], processed['twitter'], 
-            processed['facebook'], processed['youtube'], processed['instagram'], 
-            processed['term_start'], processed['term_end'], processed['in_office'], 
-            processed['metadata']
+        pending_ids = await self._unseen_ids(data_type, data_ids)
+        for data_id in pending_ids:
+            id_queue.put_nowait((data_type, data_id))
+        
+        flusher = asyncio.create_task(
+            self._flusher(self.INSERT_SQL.get(data_type), data_type, row_queue, counters[0], errors)
         )
+        workers = [
+            asyncio.create_task(self._worker(id_queue, row_queue, counts, errors))
+            for counts in counters[1:]
+        ]
         
-        if self.db_manager.execute(query, params):
-            return 1
+        await id_queue.join()
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
         
-        return 0
-    
-    def start_workers(self):
-        """Start worker threads"""
-        self.workers = []
-        for i in range(self.workers):
-            worker = threading.Thread(target=self._worker_thread, daemon=True)
-            worker.start()
-            self.workers.append(worker)
-    
-    def stop_workers(self):
-        """Stop worker threads"""
-        self.stop_event.set()
-        for _ in range(len(self.workers)):
-            self.task_queue.put(None)
+        await row_queue.put(None)
+        await flusher
         
-        for worker in self.workers:
-            worker.join()
-    
-    def ingest_data_parallel(self, data_type: str, data_ids: List[str]) -> Dict:
-        """Ingest data in parallel"""
-        results = {
+        totals = sum(counters, Counter())
+        return {
             'total': len(data_ids),
-            'success': 0,
-            'failed': 0,
-            'errors': []
+            'success': totals['success'],
+            'failed': totals['failed'],
+            'skipped': len(data_ids) - len(pending_ids),
+            'errors': list(errors)
         }
+    
+    async def _unseen_ids(self, data_type: str, data_ids: List[str]) -> List[str]:
+        """Drop duplicate ids and ids already stored, so they cost neither an API call nor a write
         
-        # Add tasks to queue
-        for data_id in data_ids:
-            self.task_queue.put((data_type, data_id))
+        Ids this ingestor has stored are filtered in memory; the rest are
+        checked against the table with one ANY() query per batch_size ids.
+        """
+        seen = self._seen.get(data_type)
+        if seen is None:
+            return list(data_ids)
         
-        # Process results
-        processed = 0
-        while processed < len(data_ids):
-            try:
-                result = self.result_queue.get(timeout=5)
-                if result['status'] == 'success':
-                    results['success'] += 1
+        candidates = [data_id for data_id in dict.fromkeys(data_ids) if data_id not in seen]
+        for start in range(0, len(candidates), self.batch_size):
+            chunk = candidates[start:start + self.batch_size]
+            existing = await asyncio.to_thread(
+                self.db_manager.execute, self.EXISTING_SQL[data_type], (chunk,), True
+            )
+            seen.update(row[0] for row in existing or ())
+        return [data_id for data_id in candidates if data_id not in seen]
+    
+    async def ingest_bills_listing(self, congress: int, bill_type: str, limit: Optional[int] = None,
+                                   page_size: int = 250) -> Dict:
+        """Ingest bills from the paged listing endpoint
+        
+        All listing pages are requested concurrently and their records are
+        inserted directly, so most bills cost a fraction of an API call.
+        Only records the listing returns without a summary are fetched
+        one by one through ingest_data_parallel.
+        """
+        endpoint = f"bill/{congress}/{bill_type}"
+        first = await self._api_get(endpoint, {'offset': 0, 'limit': page_size})
+        if not first or 'bills' not in first:
+            return {'total': 0, 'success': 0, 'failed': 0, 'errors': ['No bills found']}
+        
+        total = first.get('pagination', {}).get('count', len(first['bills']))
+        if limit is not None:
+            total = min(total, limit)
+        
+        rows = []
+        detail_ids = []
+        errors = deque(maxlen=self.MAX_ERRORS)
+        
+        def take_page(offset, page):
+            if not page or 'bills' not in page:
+                errors.append(f"{endpoint}: page at offset {offset} failed")
+                return
+            for record in page['bills'][:total - offset]:
+                if 'summary' in record:
+                    rows.append(DataProcessor.bill_row(record))
                 else:
-                    results['failed'] += 1
-                    if result['error']:
-                        results['errors'].append(f"{result['data_type']} {result['data_id']}: {result['error']}")
-                processed += 1
-            except queue.Empty:
-                continue
+                    detail_ids.append(record['billId'])
+        
+        async def fetch_page(offset):
+            return offset, await self._api_get(endpoint, {'offset': offset, 'limit': page_size})
         
+        take_page(0, first)
+        # Handle each page as soon as it arrives rather than after the slowest one
+        for next_page in asyncio.as_completed([
+            fetch_page(offset) for offset in range(page_size, total, page_size)
+        ]):
+            take_page(*await next_page)
+        
+        results = await self.ingest_data_parallel('bill', detail_ids)
+        results['total'] = total
+        results['failed'] += total - len(rows) - len(detail_ids)
+        if rows:
+            ok = await asyncio.to_thread(
+                self.db_manager.execute_values, BILL_INSERT_SQL, rows, self.batch_size
+            )
+            if ok:
+                results['success'] += len(rows)
+            else:
+                results['failed'] += len(rows)
+                errors.append(f"bill: {len(rows)} listing rows failed to insert")
+        
+        errors.extend(results['errors'])
+        results['errors'] = list(errors)
         return results
 
+# Per-process state for BatchIngestor workers, set up once by _worker_init
+_worker_ingestor = None
+
+def _worker_init(api_key: str, base_url: str, rate_limit: int, cache_dir: Optional[str], db_config: Dict):
+    """ProcessPoolExecutor initializer: build this process's API client and DB connection"""
+    global _worker_ingestor
+    db_manager = DatabaseManager(db_config, pool_size=1)
+    db_manager.connect()
+    _worker_ingestor = ParallelIngestor(CongressAPIClient(api_key, base_url, rate_limit, cache_dir), db_manager, 1)
+
+def _ingest_one(bill_id: str) -> Dict:
+    """Ingest a single bill in a worker process"""
+    try:
+        return {'bill_id': bill_id, 'success': _worker_ingestor._ingest_bill(bill_id) > 0}
+    except Exception as e:
+        return {'bill_id': bill_id, 'success': False, 'error': str(e)}
+
 class BatchIngestor:
     """Batch ingestion using multiprocessing"""
     
@@ -360,20 +805,21 @@ class BatchIngestor:
         if not bills_data or 'bills' not in bills_data:
             return {'total': 0, 'success': 0, 'failed': 0, 'errors': ['No bills found']}
         
-        bill_ids = [bill['billId'] for bill in bills_data['bills']]
+        # The listing is already decoded by orjson; pull the ids out in C
+        bill_ids = list(map(itemgetter('billId'), bills_data['bills']))
         
-        # Use multiprocessing for parallel ingestion
-        with ProcessPoolExecutor(max_workers=self.workers) as executor:
-            # Create a partial function with fixed parameters
-            def ingest_single(bill_id):
-                try:
-                    ingestor = ParallelIngestor(self.api_client, self.db_manager, 1)
-                    result = ingestor._ingest_bill(bill_id)
-                    return {'bill_id': bill_id, 'success': result > 0}
-                except Exception as e:
-                    return {'bill_id': bill_id, 'success': False, 'error': str(e)}
-            
-            results = list(executor.map(ingest_single, bill_ids))
+        # Sessions and connections cannot be pickled, so each worker process
+        # builds its own from plain config; the hourly quota is split between them
+        initargs = (
+            self.api_client.api_key,
+            self.api_client.base_url,
+            max(1, self.api_client.rate_limit // self.workers),
+            self.api_client.cache.directory if self.api_client.cache else None,
+            self.db_manager.db_config
+        )
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_worker_init,
+                                 initargs=initargs) as executor:
+            results = list(executor.map(_ingest_one, bill_ids, chunksize=32))
         
         # Process results
         final_results = {'total': len(bill_ids), 'success': 0, 'failed': 0, 'errors': []}
@@ -405,23 +851,24 @@ def main():
     }
     
     # Initialize components
+    workers = 4
     api_client = CongressAPIClient(config['congress_api']['api_key'])
-    db_manager = DatabaseManager(db_config)
+    db_manager = DatabaseManager(db_config, pool_size=workers * 2)
     
     if not db_manager.connect():
         print("Failed to connect to database")
         return
     
     # Create parallel ingestor
-    ingestor = ParallelIngestor(api_client, db_manager, workers=4)
-    batch_ingestor = BatchIngestor(api_client, db_manager, workers=4)
+    ingestor = ParallelIngestor(api_client, db_manager, workers=workers)
+    batch_ingestor = BatchIngestor(api_client, db_manager, workers=workers)
     
     print("🚀 Congress Data Parallel Ingestion System")
     print("=" * 50)
     
     # Example: Ingest recent bills
     print("Ingesting recent bills...")
-    result = batch_ingestor.ingest_bills_batch(118, 'hr', limit=50)
+    result = asyncio.run(ingestor.ingest_bills_listing(118, 'hr', limit=50))
     print(f"Bills: {result['success']}/{result['total']} ingested")
     
     # Example: Ingest current legislators
@@ -4,112 +4,170 @@ Advanced Congress Data Ingestion System
 Uses optimized PostgreSQL with connection pooling and parallel processing
 """
 
+import csv
+import functools
+import io
 import os
 import sys
 import json
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import psycopg2
 import psycopg2.pool
 import psycopg2.extras
-import multiprocessing
 import threading
 import queue
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import repeat
+from operator import itemgetter
 from typing import Dict, Any, Optional, List, Tuple
 
+# orjson serialises and parses in C (several times faster than json); fall back to json
+try:
+    import orjson
+    
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+    
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    json_loads = json.loads
+
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+class SlidingWindowLimiter:
+    """Allows at most rate calls in any period-second window (monotonic clock)
+    
+    acquire() reserves the next free slot under the lock and sleeps after
+    releasing it, so waiting threads never block each other's bookkeeping.
+    """
+    
+    def __init__(self, rate: int, period: float = 3600):
+        self.rate = rate
+        self.period = period
+        # Start times of the last `rate` calls, oldest first
+        self.slots = deque()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = now
+            if len(self.slots) >= self.rate:
+                slot = max(now, self.slots.popleft() + self.period)
+            self.slots.append(slot)
+        if slot > now:
+            time.sleep(slot - now)
+
 class AdvancedAPIClient:
     """Advanced API client with connection pooling and rate limiting"""
     
-    def __init__(self, api_key: str, base_url: str = "https://api.congress.gov/v3", rate_limit: int = 1000):
+    def __init__(self, api_key: str, base_url: str = "https://api.congress.gov/v3", rate_limit: int = 1000,
+                 pool_size: int = 64):
         self.api_key = api_key
         self.base_url = base_url
         self.rate_limit = rate_limit
-        self.last_request_time = 0
-        self.request_count = 0
-        self.session_pool = []
-        self.lock = threading.Lock()
+        self.limiter = SlidingWindowLimiter(rate_limit)
         
-        # Create session pool
-        self._initialize_session_pool()
-    
-    def _initialize_session_pool(self, pool_size: int = 10):
-        """Initialize session pool"""
-        for _ in range(pool_size):
-            session = requests.Session()
-            session.headers.update({
-                'X-API-KEY': self.api_key,
-                'Accept': 'application/json',
-                'User-Agent': 'CongressDataAdvancedIngestor/1.0'
-            })
-            self.session_pool.append(session)
-    
-    def _get_session(self) -> requests.Session:
-        """Get session from pool"""
-        with self.lock:
-            if self.session_pool:
-                return self.session_pool.pop()
-            # Create new session if pool is empty
-            session = requests.Session()
-            session.headers.update({
-                'X-API-KEY': self.api_key,
-                'Accept': 'application/json'
-            })
-            return session
-    
-    def _return_session(self, session: requests.Session):
-        """Return session to pool"""
-        with self.lock:
-            self.session_pool.append(session)
+        # One Session shared by every worker thread: its urllib3 pool keeps up
+        # to pool_size keep-alive connections and retries transient failures.
+        # Every request goes to the same host, so one host pool is enough.
+        self.session = requests.Session()
+        self.session.headers.update({
+            'X-API-KEY': self.api_key,
+            'Accept': 'application/json',
+            'User-Agent': 'CongressDataAdvancedIngestor/1.0'
+        })
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=('GET',),
+                raise_on_status=False
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
     
     def _rate_limit_wait(self):
         """Enforce rate limiting"""
-        current_time = time.time()
-        if current_time - self.last_request_time < 3600:
-            if self.request_count >= self.rate_limit:
-                wait_time = 3600 - (current_time - self.last_request_time)
-                time.sleep(wait_time)
-                self.request_count = 0
-                self.last_request_time = time.time()
-        else:
-            self.request_count = 0
-            self.last_request_time = current_time
-        
-        self.request_count += 1
+        self.limiter.acquire()
     
-    def get(self, endpoint: str, params: Optional[Dict] = None, max_retries: int = 3) -> Optional[Dict]:
-        """Make API request with rate limiting and retries"""
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """Make API request with rate limiting; retries are handled by the adapter"""
         url = f"{self.base_url}/{endpoint}"
-        session = self._get_session()
         
         try:
-            for attempt in range(max_retries):
-                try:
-                    self._rate_limit_wait()
-                    response = session.get(url, params=params, timeout=30)
-                    response.raise_for_status()
-                    return response.json()
-                except requests.exceptions.RequestException as e:
-                    if attempt == max_retries - 1:
-                        print(f"Failed to fetch {url}: {str(e)}")
-                        return None
-                    time.sleep(2 ** attempt)
-        finally:
-            self._return_session(session)
+            self._rate_limit_wait()
+            response = self.session.get(url, params=params, timeout=30)
+            response.raise_for_status()
+            # Parse the raw bytes; response.json() decodes to str first
+            return json_loads(response.content)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Failed to fetch {url}: {str(e)}")
+            return None
+
+def _copy_value(value):
+    """Render a parameter for COPY CSV: \\N for NULL, Json adapters as their JSON text"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, psycopg2.extras.Json):
+        return value.dumps(value.adapted)
+    return value
+
+@functools.lru_cache(maxsize=None)
+def copy_upsert_sql(table: str, columns: Tuple[str, ...], key: str,
+                    truncate: Tuple[Tuple[str, int], ...]) -> Tuple[str, str, Optional[str], str, str, str]:
+    """Build the key lookup, staging, COPY, INSERT ... SELECT and single-row statements for copy_upsert
+    
+    Cached, so each table/column combination is only formatted once.
+    """
+    truncate = dict(truncate)
+    column_list = ', '.join(columns)
+    select_list = ', '.join(
+        f"left({column}, {truncate[column]})" if column in truncate else column
+        for column in columns
+    )
+    existing_sql = f"SELECT {key} FROM {table} WHERE {key} = ANY(%s)"
+    create_sql = f"CREATE TEMP TABLE copy_staging (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+    alter_sql = "ALTER TABLE copy_staging " + ', '.join(
+        f"ALTER COLUMN {column} TYPE text" for column in truncate
+    ) if truncate else None
+    copy_sql = f"COPY copy_staging ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    insert_sql = (
+        f"INSERT INTO {table} ({column_list}) SELECT {select_list} FROM copy_staging "
+        f"ON CONFLICT ({key}) DO NOTHING"
+    )
+    row_sql = (
+        f"INSERT INTO {table} ({column_list}) VALUES (" + ', '.join(
+            f"left(%s, {truncate[column]})" if column in truncate else '%s'
+            for column in columns
+        ) + f") ON CONFLICT ({key}) DO NOTHING"
+    )
+    return existing_sql, create_sql, alter_sql, copy_sql, insert_sql, row_sql
 
 class AdvancedDatabaseManager:
     """Advanced database manager with connection pooling"""
     
+    POOL_STATS_TTL = 1.0
+    
     def __init__(self, db_config: Dict, min_connections: int = 5, max_connections: int = 20):
         self.db_config = db_config
         self.connection_pool = None
         self.lock = threading.Lock()
         self.min_connections = min_connections
         self.max_connections = max_connections
+        self._pool_stats = None
+        self._pool_stats_at = 0.0
         
         # Initialize connection pool
         self._initialize_pool()
@@ -167,15 +225,19 @@ class AdvancedDatabaseManager:
         finally:
             self.release_connection(conn)
     
-    def execute_batch(self, query: str, params_list: List[tuple]) -> bool:
-        """Execute batch insert with connection pooling"""
+    def execute_values_batch(self, query: str, params_list: List[tuple], page_size: int = 100) -> bool:
+        """Insert rows as multi-row VALUES statements with connection pooling
+        
+        query must contain a single ``VALUES %s``; page_size rows are sent
+        per statement and the whole batch is committed once.
+        """
         conn = self.get_connection()
         if not conn:
             return False
         
         try:
             with conn.cursor() as cursor:
-                psycopg2.extras.execute_batch(cursor, query, params_list)
+                psycopg2.extras.execute_values(cursor, query, params_list, page_size=page_size)
                 conn.commit()
                 return True
         except Exception as e:
@@ -185,62 +247,257 @@ class AdvancedDatabaseManager:
         finally:
             self.release_connection(conn)
     
+    def copy_upsert(self, table: str, columns: Tuple[str, ...], key: str, rows: List[tuple],
+                    truncate: Optional[Dict[str, int]] = None) -> Optional[List]:
+        """Bulk load rows with COPY, skipping rows whose key already exists
+        
+        COPY cannot do ON CONFLICT, so the rows are copied into a temporary
+        staging table and moved over with INSERT ... SELECT in the same
+        transaction. Columns in truncate are staged as text and cut to
+        their maximum length by the server on the way over.
+        
+        Keys already in the table are looked up first and dropped from the
+        batch, so reruns over existing data skip the COPY and write no WAL.
+        ON CONFLICT still covers rows inserted concurrently.
+        
+        COPY loads the batch all or nothing, so if a value is rejected (say a
+        malformed date) the batch is retried row by row and
+        only the offending rows are dropped.
+        
+        Returns:
+            Keys of the rows that could not be written, or None if the batch
+            failed as a whole
+        """
+        conn = self.get_connection()
+        if not conn:
+            return None
+        
+        existing_sql, create_sql, alter_sql, copy_sql, insert_sql, row_sql = copy_upsert_sql(
+            table, tuple(columns), key, tuple(truncate.items()) if truncate else ()
+        )
+        key_index = columns.index(key)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(existing_sql, ([row[key_index] for row in rows],))
+                existing = {found for found, in cursor.fetchall()}
+                if existing:
+                    rows = [row for row in rows if row[key_index] not in existing]
+                if not rows:
+                    conn.commit()
+                    return []
+                
+                buf = io.StringIO()
+                writer = csv.writer(buf, lineterminator='\n')
+                for row in rows:
+                    writer.writerow([_copy_value(value) for value in row])
+                buf.seek(0)
+                
+                cursor.execute(create_sql)
+                if alter_sql:
+                    cursor.execute(alter_sql)
+                cursor.copy_expert(copy_sql, buf)
+                cursor.execute(insert_sql)
+                conn.commit()
+                return []
+        except (psycopg2.DataError, psycopg2.IntegrityError) as e:
+            conn.rollback()
+            print(f"⚠️  COPY rejected the batch, retrying row by row: {str(e)}")
+            return self._insert_rows(conn, row_sql, rows, key_index)
+        except Exception as e:
+            conn.rollback()
+            print(f"❌ COPY failed: {str(e)}")
+            return None
+        finally:
+            self.release_connection(conn)
+    
+    def _insert_rows(self, conn, row_sql: str, rows: List[tuple], key_index: int) -> Optional[List]:
+        """Insert rows one at a time, each under a savepoint; returns the keys of rows that failed"""
+        dropped = []
+        try:
+            with conn.cursor() as cursor:
+                for row in rows:
+                    cursor.execute("SAVEPOINT copy_row")
+                    try:
+                        cursor.execute(row_sql, row)
+                    except psycopg2.Error as e:
+                        cursor.execute("ROLLBACK TO SAVEPOINT copy_row")
+                        dropped.append(row[key_index])
+                        print(f"❌ Dropped row {row[key_index]}: {str(e).strip()}")
+                    cursor.execute("RELEASE SAVEPOINT copy_row")
+            conn.commit()
+            return dropped
+        except Exception as e:
+            conn.rollback()
+            print(f"❌ Row-by-row insert failed: {str(e)}")
+            return None
+    
     def get_pool_stats(self) -> Dict[str, Any]:
-        """Get connection pool statistics"""
+        """Get connection pool statistics, cached for POOL_STATS_TTL seconds"""
         if not self.connection_pool:
             return {'error': 'Pool not initialized'}
         
-        return {
-            'connections_in_use': self.connection_pool._used.getvalue(),
-            'connections_available': self.max_connections - self.connection_pool._used.getvalue(),
+        now = time.monotonic()
+        if self._pool_stats and now - self._pool_stats_at < self.POOL_STATS_TTL:
+            return self._pool_stats
+        
+        try:
+            # ThreadedConnectionPool keeps checked-out connections in the
+            # private _used dict; there is no public counter
+            in_use = len(self.connection_pool._used)
+        except (AttributeError, TypeError):
+            return {'error': 'Pool usage not available'}
+        
+        self._pool_stats = {
+            'connections_in_use': in_use,
+            'connections_available': self.max_connections - in_use,
             'total_connections': self.max_connections,
             'min_connections': self.min_connections
         }
+        self._pool_stats_at = now
+        return self._pool_stats
 
 class AdvancedDataProcessor:
     """Advanced data processing with batch operations"""
     
     @staticmethod
     def process_bill_batch(bill_data_list: List[Dict]) -> List[Dict]:
-        """Process batch of bill data"""
+        """Process batch of bill data
+        
+        Values are not truncated here; the COPY load cuts them to
+        BILL_MAX_LENGTHS in SQL.
+        """
         processed = []
+        append = processed.append
         for bill_data in bill_data_list:
-            processed_bill = {
-                'bill_id': bill_data.get('billId', ''),
-                'congress': bill_data.get('congress', 0),
-                'bill_type': bill_data.get('type', ''),
-                'bill_number': bill_data.get('number', ''),
-                'title': bill_data.get('title', '')[:500],
-                'official_title': bill_data.get('officialTitle', '')[:1000] if bill_data.get('officialTitle') else None,
-                'summary': bill_data.get('summary', '')[:2000] if bill_data.get('summary') else None,
-                'sponsor_id': bill_data.get('sponsor', {}).get('bioguideId', '') if bill_data.get('sponsor') else None,
-                'sponsor_name': bill_data.get('sponsor', {}).get('name', '') if bill_data.get('sponsor') else None,
-                'sponsor_state': bill_data.get('sponsor', {}).get('state', '') if bill_data.get('sponsor') else None,
-                'sponsor_party': bill_data.get('sponsor', {}).get('party', '') if bill_data.get('sponsor') else None,
-                'introduced_date': bill_data.get('introducedDate', ''),
-                'last_action_date': bill_data.get('lastAction', {}).get('actionDate', '') if bill_data.get('lastAction') else None,
-                'last_action': bill_data.get('lastAction', {}).get('text', '')[:1000] if bill_data.get('lastAction') else None,
-                'status': bill_data.get('latestAction', {}).get('text', '')[:100] if bill_data.get('latestAction') else None,
-                'url': bill_data.get('url', '')[:255] if bill_data.get('url') else None,
-                'pdf_url': bill_data.get('pdf', '')[:255] if bill_data.get('pdf') else None,
-                'text_content': bill_data.get('text', '')[:5000] if bill_data.get('text') else None,
-                'metadata': json.dumps(bill_data)
-            }
-            processed.append(processed_bill)
+            get = bill_data.get
+            last_action = get('lastAction')
+            
+            append({
+                'bill_id': get('billId', ''),
+                'congress': get('congress', 0),
+                'bill_type': get('type', ''),
+                'bill_number': get('number', ''),
+                'title': get('title', ''),
+                'official_title': get('officialTitle') or None,
+                'summary': get('summary') or None,
+                # DATE columns reject '', so a missing date is NULL
+                'introduced_date': get('introducedDate') or None,
+                'last_action_date': last_action.get('actionDate') or None if last_action else None,
+                'url': get('url') or None,
+                'pdf_url': get('pdf') or None,
+                'text_content': get('text') or None,
+                'metadata': psycopg2.extras.Json(bill_data, dumps=json_dumps)
+            })
         
         return processed
 
+# congress.bills columns the ingestor writes; sponsor_* / last_action / status
+# are generated by PostgreSQL from metadata (see create_postgres_schema.sql)
+BILL_COLUMNS = (
+    'bill_id', 'congress', 'bill_type', 'bill_number', 'title', 'official_title',
+    'summary', 'introduced_date', 'last_action_date', 'url', 'pdf_url',
+    'text_content', 'metadata'
+)
+bill_params = itemgetter(*BILL_COLUMNS)
+
+# Length limits applied by the server with left() while loading
+BILL_MAX_LENGTHS = {
+    'title': 500,
+    'official_title': 1000,
+    'summary': 2000,
+    'url': 255,
+    'pdf_url': 255,
+    'text_content': 5000,
+}
+
+class BatchFlusher:
+    """Single inserter thread fed by the fetch workers through a queue
+    
+    Fetch workers only put processed rows on the queue; the inserter drains
+    it and writes up to batch_size rows per COPY transaction, so the database
+    sees one commit per batch instead of one per bill.
+    """
+    
+    _FLUSH = object()
+    _STOP = object()
+    
+    def __init__(self, db_manager: AdvancedDatabaseManager, table: str, columns: Tuple[str, ...], key: str,
+                 batch_size: int = 500, interval: float = 1.0, truncate: Optional[Dict[str, int]] = None):
+        self.db_manager = db_manager
+        self.table = table
+        self.columns = columns
+        self.key = key
+        self.truncate = truncate
+        self.batch_size = batch_size
+        self.interval = interval
+        self.insert_q = queue.Queue()
+        self.rows_written = 0
+        self.rows_failed = 0
+        # Keys of individual rows the database rejected
+        self.dropped_keys = []
+        self.thread = threading.Thread(target=self._run, daemon=True, name="inserter")
+        self.thread.start()
+    
+    def add(self, row: tuple):
+        """Queue a row for the inserter"""
+        self.insert_q.put(row)
+    
+    def flush(self):
+        """Block until every row queued so far has been written"""
+        self.insert_q.put(self._FLUSH)
+        self.insert_q.join()
+    
+    def close(self):
+        """Write the remaining rows and stop the inserter thread"""
+        self.insert_q.put(self._STOP)
+        self.thread.join()
+    
+    def _write(self, batch: List[tuple]):
+        dropped = self.db_manager.copy_upsert(self.table, self.columns, self.key, batch, self.truncate)
+        if dropped is None:
+            self.rows_failed += len(batch)
+        else:
+            self.rows_written += len(batch) - len(dropped)
+            self.rows_failed += len(dropped)
+            self.dropped_keys.extend(dropped)
+        for _ in batch:
+            self.insert_q.task_done()
+        batch.clear()
+    
+    def _run(self):
+        """Write a batch when it fills up, when asked to, or after interval seconds idle"""
+        batch = []
+        while True:
+            try:
+                item = self.insert_q.get(timeout=self.interval if batch else None)
+            except queue.Empty:
+                self._write(batch)
+                continue
+            
+            if item is self._FLUSH or item is self._STOP:
+                if batch:
+                    self._write(batch)
+                self.insert_q.task_done()
+                if item is self._STOP:
+                    return
+                continue
+            
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+
 class AdvancedParallelIngestor:
     """Advanced parallel ingestion with connection pooling"""
     
+    PROGRESS_EVERY = 1000
+    
     def __init__(self, api_client: AdvancedAPIClient, db_manager: AdvancedDatabaseManager, workers: int = 8):
         self.api_client = api_client
         self.db_manager = db_manager
         self.workers = workers
-        self.task_queue = queue.Queue()
-        self.result_queue = queue.Queue()
-        self.stop_event = threading.Event()
-        self.worker_threads = []
+        self.bill_flusher = BatchFlusher(
+            db_manager, 'congress.bills', BILL_COLUMNS, 'bill_id', truncate=BILL_MAX_LENGTHS
+        )
         self.stats = {
             'total_tasks': 0,
             'completed_tasks': 0,
@@ -250,23 +507,6 @@ class AdvancedParallelIngestor:
             'end_time': None
         }
     
-    def _worker_thread(self):
-        """Advanced worker thread with connection pooling"""
-        while not self.stop_event.is_set():
-            try:
-                task = self.task_queue.get(timeout=1)
-                if task is None:
-                    break
-                
-                data_type, data_id = task
-                result = self._process_task(data_type, data_id)
-                self.result_queue.put(result)
-                
-            except queue.Empty:
-                continue
-            except Exception as e:
-                print(f"⚠️  Worker error: {str(e)}")
-    
     def _process_task(self, data_type: str, data_id: str) -> Dict:
         """Process individual task with connection pooling"""
         result = {
@@ -274,9 +514,7 @@ class AdvancedParallelIngestor:
             'data_id': data_id,
             'status': 'error',
             'records': 0,
-            'error': None,
-            'start_time': datetime.now().isoformat(),
-            'end_time': None
+            'error': None
         }
         
         try:
@@ -292,16 +530,14 @@ class AdvancedParallelIngestor:
             
             result['status'] = 'success'
             result['records'] = records
-            result['end_time'] = datetime.now().isoformat()
             
         except Exception as e:
             result['error'] = str(e)
-            result['end_time'] = datetime.now().isoformat()
         
         return result
     
     def _ingest_bill(self, bill_id: str) -> int:
-        """Ingest single bill with connection pooling"""
+        """Fetch a single bill and queue it for the batch flusher"""
         data = self.api_client.get(f"bill/{bill_id}")
         if not data or 'bill' not in data:
             return 0
@@ -309,98 +545,49 @@ class AdvancedParallelIngestor:
         bill_data = data['bill']
         processed = AdvancedDataProcessor.process_bill_batch([bill_data])[0]
         
-        # Insert into database
-        query = '''
-        INSERT INTO congress.bills 
-        (bill_id, congress, bill_type, bill_number, title, official_title, summary, 
-         sponsor_id, sponsor_name, sponsor_state, sponsor_party, introduced_date, 
-         last_action_date, last_action, status, url, pdf_url, text_content, metadata)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (bill_id) DO NOTHING
-        '''
-        
-        params = (
-            processed['bill_id'], processed['congress'], processed['bill_type'], 
-            processed['bill_number'], processed['title'], processed['official_title'], 
-            processed['summary'], processed['sponsor_id'], processed['sponsor_name'], 
-            processed['sponsor_state'], processed['sponsor_party'], processed['introduced_date'],
-            processed['last_action_date'], processed['last_action'], processed['status'],
-            processed['url'], processed['pdf_url'], processed['text_content'], 
-            processed['metadata']
-        )
-        
-        if self.db_manager.execute(query, params):
-            return 1
-        
-        return 0
-    
-    def start_workers(self):
-        """Start worker threads"""
-        self.stats['start_time'] = datetime.now().isoformat()
-        self.worker_threads = []
-        
-        for i in range(self.workers):
-            worker = threading.Thread(target=self._worker_thread, daemon=True, name=f"worker-{i}")
-            worker.start()
-            self.worker_threads.append(worker)
-        
-        print(f"✅ Started {self.workers} worker threads")
+        # Written by the flusher in COPY batches, not one INSERT per bill
+        self.bill_flusher.add(bill_params(processed))
+        return 1
     
-    def stop_workers(self):
-        """Stop worker threads"""
-        self.stop_event.set()
-        
-        # Send stop signal to all workers
-        for _ in range(len(self.worker_threads)):
-            self.task_queue.put(None)
-        
-        # Wait for workers to finish
-        for worker in self.worker_threads:
-            worker.join()
-        
+    def close(self):
+        """Write any rows still buffered in the batch flusher and stop it"""
+        self.bill_flusher.close()
         self.stats['end_time'] = datetime.now().isoformat()
-        print(f"✅ Stopped {len(self.worker_threads)} worker threads")
     
     def ingest_data_parallel(self, data_type: str, data_ids: List[str]) -> Dict:
         """Ingest data in parallel with statistics"""
-        self.stats['total_tasks'] = len(data_ids)
-        self.stats['completed_tasks'] = 0
-        self.stats['success_count'] = 0
-        self.stats['failure_count'] = 0
-        
-        # Add tasks to queue
-        for data_id in data_ids:
-            self.task_queue.put((data_type, data_id))
+        total = len(data_ids)
+        self.stats['total_tasks'] = total
+        self.stats['start_time'] = datetime.now().isoformat()
+        start = time.monotonic()
         
-        # Process results
-        processed = 0
-        while processed < len(data_ids):
-            try:
-                result = self.result_queue.get(timeout=5)
-                self.stats['completed_tasks'] += 1
-                
+        # Counted in plain locals and copied into stats once at the end
+        success = failure = 0
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="worker") as executor:
+            results = executor.map(self._process_task, repeat(data_type), data_ids)
+            for processed, result in enumerate(results, 1):
                 if result['status'] == 'success':
-                    self.stats['success_count'] += 1
+                    success += 1
                 else:
-                    self.stats['failure_count'] += 1
+                    failure += 1
                     if result['error']:
                         print(f"⚠️  {result['data_type']} {result['data_id']}: {result['error']}")
                 
-                processed += 1
-                
-                # Print progress every 10 tasks
-                if processed % 10 == 0:
-                    progress = (processed / len(data_ids)) * 100
-                    print(f"📊 Progress: {processed}/{len(data_ids)} ({progress:.1f}%)")
-                    
-            except queue.Empty:
-                continue
+                # Print progress every PROGRESS_EVERY tasks
+                if processed % self.PROGRESS_EVERY == 0:
+                    print(f"📊 Progress: {processed}/{total} ({processed / total * 100:.1f}%)")
         
-        # Calculate duration
-        if self.stats['start_time'] and self.stats['end_time']:
-            start = datetime.fromisoformat(self.stats['start_time'])
-            end = datetime.fromisoformat(self.stats['end_time'])
-            self.stats['duration_seconds'] = (end - start).total_seconds()
+        self.stats['completed_tasks'] = success + failure
+        self.stats['success_count'] = success
+        self.stats['failure_count'] = failure
+        
+        # Make sure every queued row is in the database before reporting
+        self.bill_flusher.flush()
+        self.stats['rows_written'] = self.bill_flusher.rows_written
+        self.stats['rows_failed'] = self.bill_flusher.rows_failed
+        self.stats['dropped_keys'] = list(self.bill_flusher.dropped_keys)
+        
+        self.stats['duration_seconds'] = time.monotonic() - start
         
         return self.stats
     
@@ -412,7 +599,7 @@ class AdvancedParallelIngestor:
         """Get performance metrics"""
         metrics = self.get_stats()
         
-        if metrics['duration_seconds'] and metrics['completed_tasks'] > 0:
+        if metrics.get('duration_seconds') and metrics['completed_tasks'] > 0:
             metrics['tasks_per_second'] = metrics['completed_tasks'] / metrics['duration_seconds']
             metrics['success_rate'] = (metrics['success_count'] / metrics['completed_tasks']) * 100
         
@@ -463,9 +650,6 @@ def main():
     ingestor = AdvancedParallelIngestor(api_client, db_manager, workers=8)
     print("✅ Advanced parallel ingestor initialized")
     
-    # Start workers
-    ingestor.start_workers()
-    
     # Example: Ingest recent bills
     print("\n📊 Ingesting recent bills...")
     
@@ -478,8 +662,8 @@ def main():
     # Ingest bills
     results = ingestor.ingest_data_parallel('bill', sample_bill_ids)
     
-    # Stop workers
-    ingestor.stop_workers()
+    # Flush and stop the batch inserter
+    ingestor.close()
     
     # Print results
     print(f"\n🎯 Ingestion Results:")
@@ -487,6 +671,7 @@ def main():
     print(f"   Completed: {results['completed_tasks']}")
     print(f"   Success: {results['success_count']}")
     print(f"   Failed: {results['failure_count']}")
+    print(f"   Rows Written: {results.get('rows_written', 0)}")
     print(f"   Duration: {results.get('duration_seconds', 0):.2f} seconds")
     
     # Print performance metrics
@@ -4,43 +4,164 @@ Comprehensive PostgreSQL Optimization System
 Calculates optimal workers, implements connection pooling, and enhances database features
 """
 
+import functools
 import os
 import sys
 import json
-import multiprocessing
 import psycopg2
 import psycopg2.pool
 import psycopg2.extras
-import subprocess
+from psycopg2 import sql
 import platform
+import re
 import socket
 import time
-from typing import Dict, Any, Optional, Tuple
+from collections import ChainMap, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Host facts that cannot change while the process runs
+_IS_LINUX = platform.system() == 'Linux'
+_N_LOGICAL = os.cpu_count() or 1
+_CPU_MODEL = platform.processor()
+_LOADAVG_PATH = '/proc/loadavg'
+_MEMINFO_PATH = '/proc/meminfo'
+_NET_DEV_PATH = '/proc/net/dev'
+_MOUNTS_PATH = '/proc/mounts'
+_DISK_FS_TYPES = frozenset({'ext2', 'ext3', 'ext4', 'xfs', 'btrfs', 'zfs', 'tmpfs', 'overlay'})
+
+# The three /proc/meminfo fields used, in kB; the file lists them in the
+# order MemTotal, MemFree, MemAvailable
+_MEMINFO_RE = re.compile(rb'^(MemTotal|MemFree|MemAvailable):\s+(\d+)', re.M)
+_MEMINFO_KEYS = {b'MemTotal': 'total', b'MemFree': 'free', b'MemAvailable': 'available'}
+
+def _read_proc(path: str) -> bytes:
+    """Read a small /proc file with a single read() call"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, 65536)
+    finally:
+        os.close(fd)
+
+# SQL extensions worth installing. Client programs such as pg_dump, pg_ctl or
+# createdb are not extensions and cannot be installed with CREATE EXTENSION.
+EXTENSIONS = (
+    'pg_stat_statements',  # Query performance monitoring
+    'pg_repack',           # Online table reorganization
+    'pg_partman',          # Partition management
+    'pg_cron',             # Job scheduling
+    'pgaudit',             # Audit logging
+    'pg_prewarm',          # Preload data into cache
+    'pg_buffercache',      # Buffer cache inspection
+    'pg_qualstats',        # Query qualification statistics
+    'pg_stat_kcache',      # Kernel cache statistics
+    'pg_wait_sampling',    # Wait event sampling
+    'pg_visibility',       # Visibility map inspection
+    'pg_freespacemap',     # Free space map inspection
+    'pgrowlocks',          # Row locking information
+    'amcheck',             # Data corruption detection
+    'pg_walinspect',       # WAL inspection
+    'pg_squeeze',          # Table bloat reduction
+    'pg_ivm',              # Incremental view maintenance
+)
+
+# Extensions whose shared library must be in shared_preload_libraries, mapped
+# to that library's name. PostgreSQL refuses to start if a listed library is
+# missing, so only the ones available on the server are written.
+PRELOAD_LIBS = {
+    'pg_stat_statements': 'pg_stat_statements',
+    'pg_cron': 'pg_cron',
+    'pg_partman': 'pg_partman_bgw',
+    'pgaudit': 'pgaudit',
+    'pg_prewarm': 'pg_prewarm',
+    'pg_qualstats': 'pg_qualstats',
+    'pg_stat_kcache': 'pg_stat_kcache',
+    'pg_wait_sampling': 'pg_wait_sampling',
+    'pg_squeeze': 'pg_squeeze',
+    'pg_ivm': 'pg_ivm',
+}
+
+# data_type names stored with settings; other types fall back to
+# type(value).__name__. get_optimal_settings converts these back.
+_TYPE_NAME = {int: 'int', float: 'float', bool: 'bool', str: 'str'}
+
+@functools.lru_cache(maxsize=1)
+def _local_ip() -> str:
+    """Address of the interface that routes off-host, without a DNS lookup
+    
+    connect() on a UDP socket only picks a route; no packet is sent.
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.connect(('10.255.255.255', 1))
+            return sock.getsockname()[0]
+    except OSError:
+        return '127.0.0.1'
+
+def _flatten(value: Any, prefix: str = ''):
+    """Yield (dotted.name, scalar) pairs for a nested dict/list of metrics
+    
+    List items are keyed by their 'name' or 'mounted_on' field when they
+    have one (network interfaces, partitions), otherwise by position.
+    """
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, (list, tuple)):
+        items = (
+            (item.get('name') or item.get('mounted_on') or index if isinstance(item, dict) else index, item)
+            for index, item in enumerate(value)
+        )
+    else:
+        yield prefix, value
+        return
+    
+    for key, item in items:
+        yield from _flatten(item, f"{prefix}.{key}" if prefix else str(key))
+
+# One read of every host resource, shared by the analysis, the worker
+# calculation and the summary printed by main()
+SystemSnapshot = namedtuple('SystemSnapshot', 'cpu memory network disk')
+
 class SystemAnalyzer:
     """Analyze system resources to determine optimal configuration"""
     
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def snapshot() -> SystemSnapshot:
+        """Read CPU, memory, network and disk info once per process
+        
+        The four probes are independent, so they run side by side; a slow
+        statvfs on one mount no longer holds up the /proc reads.
+        """
+        probes = (
+            SystemAnalyzer.get_cpu_info,
+            SystemAnalyzer.get_memory_info,
+            SystemAnalyzer.get_network_info,
+            SystemAnalyzer.get_disk_info
+        )
+        with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+            return SystemSnapshot(*executor.map(lambda probe: probe(), probes))
+    
     @staticmethod
     def get_cpu_info() -> Dict[str, Any]:
         """Get CPU information"""
         cpu_info = {
-            'physical_cores': multiprocessing.cpu_count(),
-            'logical_cores': multiprocessing.cpu_count(),
-            'cpu_model': platform.processor(),
+            'physical_cores': _N_LOGICAL,
+            'logical_cores': _N_LOGICAL,
+            'cpu_model': _CPU_MODEL,
             'cpu_usage': 0.0
         }
         
         try:
             # Get CPU usage
-            if platform.system() == 'Linux':
-                with open('/proc/loadavg', 'r') as f:
-                    load_avg = f.read().split()
-                    cpu_info['load_avg_1min'] = float(load_avg[0])
-                    cpu_info['load_avg_5min'] = float(load_avg[1])
-                    cpu_info['load_avg_15min'] = float(load_avg[2])
+            if _IS_LINUX:
+                load_avg = _read_proc(_LOADAVG_PATH).split()
+                cpu_info['load_avg_1min'] = float(load_avg[0])
+                cpu_info['load_avg_5min'] = float(load_avg[1])
+                cpu_info['load_avg_15min'] = float(load_avg[2])
         except Exception as e:
             print(f"CPU info error: {str(e)}")
         
@@ -52,15 +173,9 @@ class SystemAnalyzer:
         mem_info = {'total': 0, 'available': 0, 'used': 0, 'free': 0}
         
         try:
-            if platform.system() == 'Linux':
-                with open('/proc/meminfo', 'r') as f:
-                    for line in f:
-                        if line.startswith('MemTotal:'):
-                            mem_info['total'] = int(line.split()[1]) // 1024  # Convert to MB
-                        elif line.startswith('MemAvailable:'):
-                            mem_info['available'] = int(line.split()[1]) // 1024
-                        elif line.startswith('MemFree:'):
-                            mem_info['free'] = int(line.split()[1]) // 1024
+            if _IS_LINUX:
+                for name, kb in _MEMINFO_RE.findall(_read_proc(_MEMINFO_PATH)):
+                    mem_info[_MEMINFO_KEYS[name]] = int(kb) >> 10  # Convert to MB
         except Exception as e:
             print(f"Memory info error: {str(e)}")
         
@@ -72,14 +187,14 @@ class SystemAnalyzer:
         """Get network information"""
         net_info = {
             'hostname': socket.gethostname(),
-            'ip_address': socket.gethostbyname(socket.gethostname()),
+            'ip_address': _local_ip(),
             'interfaces': []
         }
         
         try:
-            if platform.system() == 'Linux':
+            if _IS_LINUX:
                 # Get network interfaces
-                with open('/proc/net/dev', 'r') as f:
+                with open(_NET_DEV_PATH, 'r') as f:
                     lines = f.readlines()
                     for line in lines[2:]:  # Skip header lines
                         parts = line.split()
@@ -101,33 +216,44 @@ class SystemAnalyzer:
         disk_info = {'total': 0, 'used': 0, 'free': 0, 'partitions': []}
         
         try:
-            if platform.system() == 'Linux':
-                # Get disk usage
-                result = subprocess.run(['df', '-h'], capture_output=True, text=True)
-                lines = result.stdout.split('\n')
-                for line in lines[1:]:  # Skip header
-                    if line.strip():
-                        parts = line.split()
-                        if len(parts) >= 6:
-                            partition = {
-                                'filesystem': parts[0],
-                                'size': parts[1],
-                                'used': parts[2],
-                                'available': parts[3],
-                                'use_percent': parts[4],
-                                'mounted_on': parts[5]
-                            }
-                            disk_info['partitions'].append(partition)
+            if _IS_LINUX:
+                # Get disk usage (bytes) straight from statvfs for each local mount
+                for line in _read_proc(_MOUNTS_PATH).decode().splitlines():
+                    parts = line.split()
+                    if len(parts) < 3 or parts[2] not in _DISK_FS_TYPES:
+                        continue
+                    # Spaces in mount points are escaped as \040
+                    mount_point = parts[1].replace('\\040', ' ')
+                    try:
+                        st = os.statvfs(mount_point)
+                    except OSError:
+                        continue
+                    size = st.f_blocks * st.f_frsize
+                    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+                    available = st.f_bavail * st.f_frsize
+                    disk_info['partitions'].append({
+                        'filesystem': parts[0],
+                        'fs_type': parts[2],
+                        'size': size,
+                        'used': used,
+                        'available': available,
+                        'use_percent': round(used * 100 / (used + available), 1) if used + available else 0.0,
+                        'mounted_on': mount_point
+                    })
+                    disk_info['total'] += size
+                    disk_info['used'] += used
+                    disk_info['free'] += available
         except Exception as e:
             print(f"Disk info error: {str(e)}")
         
         return disk_info
     
     @staticmethod
-    def calculate_optimal_workers() -> int:
+    def calculate_optimal_workers(snapshot: Optional[SystemSnapshot] = None) -> int:
         """Calculate optimal number of workers based on system resources"""
-        cpu_info = SystemAnalyzer.get_cpu_info()
-        mem_info = SystemAnalyzer.get_memory_info()
+        snapshot = snapshot or SystemAnalyzer.snapshot()
+        cpu_info = snapshot.cpu
+        mem_info = snapshot.memory
         
         # Base calculation: CPU cores
         optimal_workers = cpu_info['logical_cores']
@@ -168,109 +294,87 @@ class PostgreSQLOptimizer:
             print(f"Database connection failed: {str(e)}")
             return False
     
-    def create_connection_pool(self, min_connections: int = 5, max_connections: int = 20) -> bool:
-        """Create connection pool"""
+    def create_connection_pool(self, min_connections: int = 5, max_connections: int = 20,
+                               port: Optional[int] = None) -> bool:
+        """Create connection pool, optionally on another port (e.g. pgbouncer's)"""
+        config = dict(self.db_config, port=port) if port else self.db_config
         try:
             self.pool = psycopg2.pool.ThreadedConnectionPool(
                 min_connections,
                 max_connections,
-                **self.db_config
+                **config
             )
             return True
         except Exception as e:
             print(f"Connection pool creation failed: {str(e)}")
             return False
     
+    def available_extensions(self, names) -> List[str]:
+        """Return the given extensions that the server can install, sorted"""
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM pg_available_extensions WHERE name = ANY(%s)", (list(names),))
+            return sorted(name for name, in cursor.fetchall())
+    
+    def preload_libraries(self) -> List[str]:
+        """Build shared_preload_libraries from the preload extensions available on the server"""
+        try:
+            available = set(self.available_extensions(PRELOAD_LIBS))
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            print(f"⚠️  Could not check available extensions: {str(e)}")
+            available = set()
+        return [library for extension, library in PRELOAD_LIBS.items() if extension in available]
+    
     def install_extensions(self) -> Dict[str, bool]:
-        """Install useful PostgreSQL extensions"""
-        extensions = [
-            'pg_stat_statements',  # Query performance monitoring
-            'pg_repack',           # Online table reorganization
-            'pg_partman',          # Partition management
-            'pg_cron',             # Job scheduling
-            'pg_audit',            # Audit logging
-            'pg_prewarm',          # Preload data into cache
-            'pg_buffercache',      # Buffer cache inspection
-            'pg_qualstats',        # Query qualification statistics
-            'pg_stat_kcache',      # Kernel cache statistics
-            'pg_wait_sampling',    # Wait event sampling
-            'pg_visibility',       # Visibility map inspection
-            'pg_freespacemap',     # Free space map inspection
-            'pgrowlocks',          # Row locking information
-            'pg_trigger',          # Trigger information
-            'pg_amcheck',          # Data corruption detection
-            'pg_walinspect',       # WAL inspection
-            'pg_squeeze',          # Table bloat reduction
-            'pg_ivm',              # Incremental view maintenance
-            'pg_logical',          # Logical decoding
-            'pg_output',           # Logical decoding output plugin
-            'pg_rewind',           # Database cluster rewinding
-            'pg_standby',          # Warm standby tools
-            'pg_upgrade',          # Database upgrade tools
-            'pg_verifybackup',     # Backup verification
-            'pg_wal',              # WAL utilities
-            'pg_waldump',          # WAL dump utility
-            'pg_xlogdump',         # Transaction log dump utility
-            'pg_archivecleanup',   # WAL archive cleanup
-            'pg_basebackup',       # Base backup utility
-            'pg_receivewal',       # WAL receiver
-            'pg_recvlogical',      # Logical decoding receiver
-            'pg_test_fsync',       # File sync performance test
-            'pg_test_timing',      # Timing performance test
-            'pg_bench',            # Benchmarking tool
-            'pg_config',           # Configuration utility
-            'pg_controldata',      # Control file inspection
-            'pg_ctl',              # Database control utility
-            'pg_dump',             # Database backup
-            'pg_dumpall',          # All databases backup
-            'pg_isready',          # Connection status check
-            'pg_resetwal',         # WAL reset utility
-            'pg_restore',          # Database restore
-            'pg_verifybackup',     # Backup verification
-            'vacuumlo',            # Large object cleanup
-            'cluster_db',          # Database clustering
-            'createdb',            # Database creation
-            'createuser',          # User creation
-            'dropdb',              # Database removal
-            'dropuser',            # User removal
-            'ecpg',                # Embedded SQL preprocessor
-            'pg_amcheck',          # Data corruption detection
-            'pg_archivecleanup',   # WAL archive cleanup
-            'pg_basebackup',       # Base backup utility
-            'pg_bench',            # Benchmarking tool
-            'pg_checksums',        # Data checksum verification
-            'pg_config',           # Configuration utility
-            'pg_controldata',      # Control file inspection
-            'pg_ctl',              # Database control utility
-            'pg_dump',             # Database backup
-            'pg_dumpall',          # All databases backup
-            'pg_isready',          # Connection status check
-            'pg_receivewal',       # WAL receiver
-            'pg_recvlogical',      # Logical decoding receiver
-            'pg_resetwal',         # WAL reset utility
-            'pg_restore',          # Database restore
-            'pg_rewind',           # Database cluster rewinding
-            'pg_test_fsync',       # File sync performance test
-            'pg_test_timing',      # Timing performance test
-            'pg_upgrade',          # Database upgrade tools
-            'pg_verifybackup',     # Backup verification
-            'pg_wal',              # WAL utilities
-            'pg_waldump',          # WAL dump utility
-            'pg_xlogdump',         # Transaction log dump utility
-        ]
+        """Install useful PostgreSQL extensions
         
-        results = {}
+        Only extensions the server has available are attempted, all in one
+        round-trip and one transaction. If that batch fails, they are retried
+        one at a time behind a savepoint each. What ended up installed is read
+        back from pg_extension.
+        """
+        results = dict.fromkeys(EXTENSIONS, False)
+        available = []
+        
+        try:
+            available = self.available_extensions(EXTENSIONS)
+            with self.connection.cursor() as cursor:
+                statements = [
+                    sql.SQL("CREATE EXTENSION IF NOT EXISTS {}").format(sql.Identifier(name))
+                    for name in available
+                ]
+                
+                if statements:
+                    try:
+                        cursor.execute(sql.SQL('; ').join(statements))
+                        self.connection.commit()
+                    except psycopg2.Error:
+                        self.connection.rollback()
+                        for name, statement in zip(available, statements):
+                            cursor.execute("SAVEPOINT install_extension")
+                            try:
+                                cursor.execute(statement)
+                                cursor.execute("RELEASE SAVEPOINT install_extension")
+                            except psycopg2.Error as e:
+                                cursor.execute("ROLLBACK TO SAVEPOINT install_extension")
+                                print(f"⚠️  Extension {name} failed: {str(e).strip()}")
+                        self.connection.commit()
+                
+                cursor.execute("SELECT extname FROM pg_extension WHERE extname = ANY(%s)", (list(EXTENSIONS),))
+                for name, in cursor.fetchall():
+                    results[name] = True
+                self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            print(f"⚠️  Extension installation failed: {str(e)}")
         
-        for extension in extensions:
-            try:
-                with self.connection.cursor() as cursor:
-                    cursor.execute(f"CREATE EXTENSION IF NOT EXISTS {extension}")
-                    self.connection.commit()
-                    results[extension] = True
-                    print(f"✅ Installed extension: {extension}")
-            except Exception as e:
-                print(f"⚠️  Extension {extension} failed: {str(e)}")
-                results[extension] = False
+        for name, installed in results.items():
+            if installed:
+                print(f"✅ Installed extension: {name}")
+        unavailable = [name for name in EXTENSIONS if name not in available]
+        if unavailable:
+            print(f"⚠️  Not available on this server, skipped: {', '.join(unavailable)}")
         
         return results
     
@@ -345,30 +449,44 @@ class PostgreSQLOptimizer:
             'deadlock_timeout': '1s',
             'tcp_keepalives_idle': '60',
             'tcp_keepalives_interval': '10',
-            'tcp_keepalives_count': '10',
-            'shared_preload_libraries': 'pg_stat_statements,pg_cron,pg_repack,pg_partman,pg_audit,pg_prewarm,pg_buffercache,pg_qualstats,pg_stat_kcache,pg_wait_sampling,pg_visibility,pg_freespacemap,pgrowlocks,pg_trigger,pg_amcheck,pg_walinspect,pg_squeeze,pg_ivm,pg_logical,pg_output,pg_rewind,pg_standby,pg_upgrade,pg_verifybackup,pg_wal,pg_waldump,pg_xlogdump,pg_archivecleanup,pg_basebackup,pg_receivewal,pg_recvlogical,pg_test_fsync,pg_test_timing,pg_bench,pg_config,pg_controldata,pg_ctl,pg_dump,pg_dumpall,pg_isready,pg_resetwal,pg_restore,pg_verifybackup,vacuumlo,cluster_db,createdb,createuser,dropdb,dropuser,ecpg,pg_amcheck,pg_archivecleanup,pg_basebackup,pg_bench,pg_checksums,pg_config,pg_controldata,pg_ctl,pg_dump,pg_dumpall,pg_isready,pg_receivewal,pg_recvlogical,pg_resetwal,pg_restore,pg_rewind,pg_test_fsync,pg_test_timing,pg_upgrade,pg_verifybackup,pg_wal,pg_waldump,pg_xlogdump'
+            'tcp_keepalives_count': '10'
         }
+        preload = self.preload_libraries()
+        if preload:
+            optimizations['shared_preload_libraries'] = preload
         
-        results = {}
+        results = dict.fromkeys(optimizations, False)
         
-        # Write to postgresql.conf
+        # ALTER SYSTEM rewrites postgresql.auto.conf (one line per parameter, so
+        # reruns do not grow it) but cannot run inside a transaction block
+        autocommit = self.connection.autocommit
         try:
-            conf_path = '/etc/postgresql/18/main/postgresql.conf'
-            with open(conf_path, 'a') as f:
+            self.connection.autocommit = True
+            with self.connection.cursor() as cursor:
                 for param, value in optimizations.items():
-                    f.write(f"\n{param} = {value}")
-                    results[param] = True
+                    # List parameters take one literal per element
+                    if isinstance(value, (list, tuple)):
+                        literal = sql.SQL(', ').join(map(sql.Literal, value))
+                    else:
+                        literal = sql.Literal(value)
+                    try:
+                        cursor.execute(
+                            sql.SQL("ALTER SYSTEM SET {} = {}").format(sql.Identifier(param), literal)
+                        )
+                        results[param] = True
+                    except psycopg2.Error as e:
+                        print(f"⚠️  {param}: {str(e).strip()}")
+                
+                # Settings that need a restart (shared_buffers, wal_level, ...)
+                # are reported as pending by pg_settings until then
+                cursor.execute("SELECT pg_reload_conf()")
             
             print("✅ PostgreSQL configuration optimized")
             
-            # Reload configuration
-            subprocess.run(['sudo', '-u', 'postgres', '/usr/lib/postgresql/18/bin/pg_ctl', 
-                          'reload', '-D', '/var/lib/postgresql/18/main'])
-            
         except Exception as e:
             print(f"⚠️  Configuration optimization failed: {str(e)}")
-            for param in optimizations:
-                results[param] = False
+        finally:
+            self.connection.autocommit = autocommit
         
         return results
     
@@ -388,17 +506,39 @@ class PostgreSQLOptimizer:
                 )
                 ''')
                 
+                # One row per analysis run; payload holds the flattened
+                # metrics keyed by dotted name (e.g. memory_info.available)
                 cursor.execute('''
                 CREATE TABLE IF NOT EXISTS congress.system_metrics (
                     id SERIAL PRIMARY KEY,
-                    metric_name VARCHAR(100) NOT NULL,
-                    metric_value TEXT,
-                    data_type VARCHAR(20),
-                    collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    collected_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+                    payload JSONB,
                     notes TEXT
                 )
                 ''')
                 
+                # Tables from before snapshots were stored as one JSONB row
+                cursor.execute('''
+                ALTER TABLE congress.system_metrics ADD COLUMN IF NOT EXISTS payload JSONB
+                ''')
+                cursor.execute('''
+                DO $$
+                BEGIN
+                    IF EXISTS (
+                        SELECT 1 FROM information_schema.columns
+                        WHERE table_schema = 'congress' AND table_name = 'system_metrics'
+                          AND column_name = 'metric_name'
+                    ) THEN
+                        ALTER TABLE congress.system_metrics ALTER COLUMN metric_name DROP NOT NULL;
+                    END IF;
+                END $$
+                ''')
+                # One row per run needs no index; drop the GIN index earlier
+                # versions created (jsonb_path_ops only served @> lookups)
+                cursor.execute('''
+                DROP INDEX IF EXISTS congress.idx_system_metrics_payload
+                ''')
+                
                 cursor.execute('''
                 CREATE TABLE IF NOT EXISTS congress.ingestion_performance (
                     id SERIAL PRIMARY KEY,
@@ -421,47 +561,49 @@ class PostgreSQLOptimizer:
             return False
     
     def store_optimization_settings(self, settings: Dict[str, Any]) -> bool:
-        """Store optimization settings in database"""
+        """Store optimization settings in database (one upsert for all of them)"""
+        type_name = _TYPE_NAME.get
+        rows = [
+            (name, str(value), type_name(type(value)) or type(value).__name__, f"Auto-calculated {name}")
+            for name, value in settings.items()
+        ]
         try:
             with self.connection.cursor() as cursor:
-                for name, value in settings.items():
-                    # Check if setting exists
-                    cursor.execute("SELECT 1 FROM congress.optimization_settings WHERE setting_name = %s", (name,))
-                    exists = cursor.fetchone()
-                    
-                    if exists:
-                        cursor.execute('''
-                        UPDATE congress.optimization_settings
-                        SET setting_value = %s, data_type = %s, description = %s, last_updated = CURRENT_TIMESTAMP
-                        WHERE setting_name = %s
-                        ''', (str(value), type(value).__name__, f"Auto-calculated {name}", name))
-                    else:
-                        cursor.execute('''
-                        INSERT INTO congress.optimization_settings 
-                        (setting_name, setting_value, data_type, description)
-                        VALUES (%s, %s, %s, %s)
-                        ''', (name, str(value), type(value).__name__, f"Auto-calculated {name}"))
+                psycopg2.extras.execute_values(cursor, '''
+                INSERT INTO congress.optimization_settings
+                (setting_name, setting_value, data_type, description)
+                VALUES %s
+                ON CONFLICT (setting_name) DO UPDATE SET
+                    setting_value = EXCLUDED.setting_value,
+                    data_type = EXCLUDED.data_type,
+                    description = EXCLUDED.description,
+                    last_updated = CURRENT_TIMESTAMP
+                ''', rows)
             
             self.connection.commit()
             return True
         except Exception as e:
+            self.connection.rollback()
             print(f"Settings storage failed: {str(e)}")
             return False
     
     def store_system_metrics(self, metrics: Dict[str, Any]) -> bool:
-        """Store system metrics in database"""
+        """Store system metrics in database as a single JSONB row
+        
+        Nested metrics are flattened to dotted names first, so a value is
+        read back with payload->>'memory_info.available'.
+        """
         try:
             with self.connection.cursor() as cursor:
-                for name, value in metrics.items():
-                    cursor.execute('''
-                    INSERT INTO congress.system_metrics 
-                    (metric_name, metric_value, data_type, notes)
-                    VALUES (%s, %s, %s, %s)
-                    ''', (name, str(value), type(value).__name__, "System analysis"))
+                cursor.execute(
+                    "INSERT INTO congress.system_metrics (payload, notes) VALUES (%s, %s)",
+                    (psycopg2.extras.Json(dict(_flatten(metrics))), "System analysis")
+                )
             
             self.connection.commit()
             return True
         except Exception as e:
+            self.connection.rollback()
             print(f"Metrics storage failed: {str(e)}")
             return False
     
@@ -492,8 +634,24 @@ class PostgreSQLOptimizer:
 class AdvancedIngestionSystem:
     """Advanced ingestion system with connection pooling and optimization"""
     
-    def __init__(self, db_config: Dict[str, Any]):
+    DEFAULT_SETTINGS = {
+        'workers': 4,
+        'batch_size': 50,
+        'max_connections': 20,
+        'connection_pool_size': 10,
+        'rate_limit': 1000,
+        'timeout': 30,
+        'max_retries': 3
+    }
+    
+    def __init__(self, db_config: Dict[str, Any], pgbouncer_port: Optional[int] = None):
+        """pgbouncer_port routes the worker pool through a pgbouncer running in
+        transaction mode on the database host, so several ingestion processes
+        share its server connections. The optimizer's own connection stays
+        direct because ALTER SYSTEM and session settings need a real backend.
+        """
         self.db_config = db_config
+        self.pgbouncer_port = pgbouncer_port
         self.optimizer = PostgreSQLOptimizer(db_config)
         self.connection_pool = None
         self.worker_count = 4
@@ -515,7 +673,7 @@ class AdvancedIngestionSystem:
         self.optimizer.store_system_metrics(system_analysis)
         
         # Calculate optimal workers
-        optimal_workers = SystemAnalyzer.calculate_optimal_workers()
+        optimal_workers = SystemAnalyzer.calculate_optimal_workers(SystemAnalyzer.snapshot())
         self.worker_count = optimal_workers
         
         # Store optimization settings
@@ -531,9 +689,13 @@ class AdvancedIngestionSystem:
         
         self.optimizer.store_optimization_settings(settings)
         
-        # Create connection pool
+        # Create connection pool; behind pgbouncer client connections are cheap,
+        # so only open them on demand
         pool_size = settings['connection_pool_size']
-        if not self.optimizer.create_connection_pool(min_connections=5, max_connections=pool_size):
+        min_connections = 1 if self.pgbouncer_port else 5
+        if not self.optimizer.create_connection_pool(
+            min_connections=min_connections, max_connections=pool_size, port=self.pgbouncer_port
+        ):
             return False
         
         self.connection_pool = self.optimizer.pool
@@ -542,6 +704,7 @@ class AdvancedIngestionSystem:
     
     def _analyze_system(self) -> Dict[str, Any]:
         """Perform comprehensive system analysis"""
+        snapshot = SystemAnalyzer.snapshot()
         analysis = {
             'system_info': {
                 'os': platform.system(),
@@ -549,10 +712,10 @@ class AdvancedIngestionSystem:
                 'architecture': platform.architecture(),
                 'hostname': socket.gethostname()
             },
-            'cpu_info': SystemAnalyzer.get_cpu_info(),
-            'memory_info': SystemAnalyzer.get_memory_info(),
-            'network_info': SystemAnalyzer.get_network_info(),
-            'disk_info': SystemAnalyzer.get_disk_info(),
+            'cpu_info': snapshot.cpu,
+            'memory_info': snapshot.memory,
+            'network_info': snapshot.network,
+            'disk_info': snapshot.disk,
             'postgresql_version': self._get_postgresql_version()
         }
         
@@ -578,26 +741,14 @@ class AdvancedIngestionSystem:
         if self.connection_pool and conn:
             self.connection_pool.putconn(conn)
     
-    def get_optimized_settings(self) -> Dict[str, Any]:
-        """Get optimized settings for ingestion"""
-        # Get from database first
-        db_settings = self.optimizer.get_optimal_settings()
-        
-        # Default settings
-        default_settings = {
-            'workers': 4,
-            'batch_size': 50,
-            'max_connections': 20,
-            'connection_pool_size': 10,
-            'rate_limit': 1000,
-            'timeout': 30,
-            'max_retries': 3
-        }
-        
-        # Merge settings (database settings take precedence)
-        settings = {**default_settings, **db_settings}
+    def get_optimized_settings(self) -> ChainMap:
+        """Get optimized settings for ingestion
         
-        return settings
+        Database settings take precedence over DEFAULT_SETTINGS; the two are
+        chained rather than copied into a new dict. Writes go to the
+        per-call database mapping, never to the defaults.
+        """
+        return ChainMap(self.optimizer.get_optimal_settings(), self.DEFAULT_SETTINGS)
 
 def main():
     """Main optimization function"""
@@ -635,18 +786,19 @@ def main():
     
     # System analysis
     print(f"\n💻 System Analysis:")
-    cpu_info = SystemAnalyzer.get_cpu_info()
-    mem_info = SystemAnalyzer.get_memory_info()
+    snapshot = SystemAnalyzer.snapshot()
+    cpu_info = snapshot.cpu
+    mem_info = snapshot.memory
     
     print(f"   CPU Cores: {cpu_info.get('logical_cores', 'N/A')}")
     print(f"   Memory Available: {mem_info.get('available', 'N/A')} MB")
     print(f"   Load Average: {cpu_info.get('load_avg_1min', 'N/A')}")
     
-    # Optimize PostgreSQL
+    # Optimize PostgreSQL over the connection initialize() already opened
     print("\n🔧 Optimizing PostgreSQL...")
-    optimizer = PostgreSQLOptimizer(db_config)
+    optimizer = advanced_system.optimizer
     
-    if optimizer.connect():
+    if optimizer.connection and not optimizer.connection.closed:
         # Install extensions
         print("Installing PostgreSQL extensions...")
         extension_results = optimizer.install_extensions()
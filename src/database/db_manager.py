@@ -1,22 +1,183 @@
 """Database manager with support for PostgreSQL and SQLite fallback."""
 
+import functools
+import io
+import itertools
 import json
 import os
 import sqlite3
-from typing import Any, Dict, List, Optional
-from datetime import datetime
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from operator import itemgetter
 
 try:
     import psycopg2
-    from psycopg2.extras import RealDictCursor
+    import psycopg2.extensions
+    from psycopg2.extras import execute_values
+    from psycopg2.pool import ThreadedConnectionPool
     POSTGRES_AVAILABLE = True
 except ImportError:
     POSTGRES_AVAILABLE = False
 
+# Statements worth a server-side PREPARE; DDL instead drops the cache, since a
+# schema change can invalidate the result type of a prepared SELECT
+_PREPARABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')
+_DDL = ('CREATE', 'ALTER', 'DROP', 'TRUNCATE')
+
+
+@functools.lru_cache(maxsize=256)
+def _qmark(query: str) -> str:
+    """Rewrite %s placeholders as SQLite's ?; cached, so each query is scanned once."""
+    return query.replace('%s', '?')
+
+
+@functools.lru_cache(maxsize=256)
+def _execute_sql(name: str, n_params: int) -> str:
+    """Build the EXECUTE statement for a prepared statement taking n_params."""
+    if not n_params:
+        return f'EXECUTE {name}'
+    return f"EXECUTE {name} ({', '.join('%s' for _ in range(n_params))})"
+
+
+_PACKAGE_COLUMNS = (
+    'package_id', 'collection_code', 'title', 'summary',
+    'download_url', 'details_url', 'publish_date', 'last_modified'
+)
+
+_COLLECTION_COLUMNS = ('collection_code', 'collection_name', 'description', 'last_modified')
+
+_LOG_COLUMNS = (
+    'collection_code', 'offset_value', 'limit_value',
+    'records_ingested', 'status', 'error_message', 'completed_at'
+)
+
+# Built once: itemgetter pulls a whole row in one C call
+_package_row = itemgetter(*_PACKAGE_COLUMNS)
+_collection_row = itemgetter(*_COLLECTION_COLUMNS)
+_log_row = itemgetter(*_LOG_COLUMNS)
+
+
+def _rows(getter: itemgetter, columns: tuple, records: List[Dict[str, Any]]) -> List[tuple]:
+    """Turn records into parameter tuples; missing keys become None, as with dict.get."""
+    rows = []
+    for record in records:
+        try:
+            rows.append(getter(record))
+        except KeyError:
+            rows.append(tuple(record.get(column) for column in columns))
+    return rows
+
+
+# Existing packages are only rewritten when the API reports a newer version
+_PACKAGE_UPSERT = """
+    ON CONFLICT (package_id)
+    DO UPDATE SET
+        collection_code = EXCLUDED.collection_code,
+        title = EXCLUDED.title,
+        summary = EXCLUDED.summary,
+        download_url = EXCLUDED.download_url,
+        details_url = EXCLUDED.details_url,
+        publish_date = EXCLUDED.publish_date,
+        last_modified = EXCLUDED.last_modified,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE packages.last_modified IS DISTINCT FROM EXCLUDED.last_modified
+"""
+
+
+@functools.lru_cache(maxsize=4)
+def load_config(config_path: str) -> Dict[str, Any]:
+    """Parse a JSON config file once per process.
+    
+    The returned dictionary is shared between callers; treat it as read-only.
+    """
+    with open(config_path, 'r') as f:
+        return json.load(f)
+
+
+# Process-wide pools keyed by their settings, so every DatabaseManager (and
+# IngestionEngine) pointed at the same database borrows from one pool
+_pool_lock = threading.Lock()
+_shared_pools: Dict[tuple, list] = {}
+
+
+def _acquire_pool(minconn: int, maxconn: int, **params):
+    """Return the shared ThreadedConnectionPool for these settings, creating it on first use."""
+    key = (minconn, maxconn, tuple(sorted(params.items())))
+    with _pool_lock:
+        entry = _shared_pools.get(key)
+        if entry is None:
+            entry = _shared_pools[key] = [ThreadedConnectionPool(minconn, maxconn, **params), 0]
+        entry[1] += 1
+        return entry[0]
+
+
+def _release_pool(pool):
+    """Drop one reference to a shared pool, closing it when the last user lets go."""
+    with _pool_lock:
+        for key, entry in _shared_pools.items():
+            if entry[0] is pool:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del _shared_pools[key]
+                    pool.closeall()
+                return
+
+
+def _fetch_dicts(cur) -> List[Dict[str, Any]]:
+    """Read all result rows as dictionaries keyed by column name."""
+    if not cur.description:
+        return []
+    columns = [desc[0] for desc in cur.description]
+    return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+
+def _fetch_exists(cur) -> bool:
+    """Report whether the query returned any row."""
+    return cur.fetchone() is not None
+
+
+def _fetch_first_value(cur) -> Any:
+    """Return the first column of the first row, or None."""
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def _copy_text(value: Any) -> str:
+    """Encode one value for COPY ... FROM STDIN in text format."""
+    if value is None:
+        return '\\N'
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+if POSTGRES_AVAILABLE:
+    class PreparingConnection(psycopg2.extensions.connection):
+        """psycopg2 connection that remembers which statements it has PREPAREd."""
+        
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.prepared = OrderedDict()
+            # Queries the server refused to PREPARE; they run as plain SQL
+            self.unpreparable = set()
+            self.statement_ids = itertools.count()
+
 
 class DatabaseManager:
     """Manages database connections and operations."""
     
+    STATEMENT_CACHE_SIZE = 100
+    # Package batches at least this large are loaded with COPY on PostgreSQL
+    COPY_MIN_ROWS = 1000
+    # Stay under SQLITE_MAX_VARIABLE_NUMBER (999 before SQLite 3.32)
+    SQLITE_MAX_VARIABLES = 900
+    
     def __init__(self, config_path: str = '/root/congress_api_project/config/config.json'):
         """Initialize database manager with config.
         
@@ -26,12 +187,17 @@ class DatabaseManager:
         self.config_path = config_path
         self.db_type = None
         self.conn = None
+        self._write_pool = None
+        self._read_pool = None
+        self._local = threading.local()
         self._load_config()
+        # Rows per multi-VALUES INSERT; the best value depends on row width,
+        # so it is a config knob rather than a constant
+        self.insert_page_size = self.db_config.get('insert_page_size', 500)
     
     def _load_config(self):
         """Load database configuration."""
-        with open(self.config_path, 'r') as f:
-            config = json.load(f)
+        config = load_config(self.config_path)
         self.db_config = config.get('database', {})
     
     def connect(self) -> bool:
@@ -43,24 +209,53 @@ class DatabaseManager:
         # Try PostgreSQL first
         if POSTGRES_AVAILABLE:
             try:
-                self.conn = psycopg2.connect(
-                    host=self.db_config.get('host', 'localhost'),
-                    port=self.db_config.get('port', 5432),
-                    database=self.db_config.get('database', 'opendiscourse'),
-                    user=self.db_config.get('user', 'opendiscourse'),
-                    password=self.db_config.get('password', '')
+                params = {
+                    'host': self.db_config.get('host', 'localhost'),
+                    'port': self.db_config.get('port', 5432),
+                    'database': self.db_config.get('database', 'opendiscourse'),
+                    'user': self.db_config.get('user', 'opendiscourse'),
+                    'password': self.db_config.get('password', ''),
+                    # Server-side PREPARE does not survive PgBouncer's
+                    # transaction pooling; set prepare_statements false there
+                    'connection_factory': (
+                        PreparingConnection if self.db_config.get('prepare_statements', True) else None
+                    )
+                }
+                self._write_pool = _acquire_pool(
+                    self.db_config.get('pool_min_size', 2),
+                    self.db_config.get(
+                        'write_pool_size',
+                        self.db_config.get('pool_size', min(16, (os.cpu_count() or 1) * 2))
+                    ),
+                    **params
+                )
+                # Stats/monitor reads get their own small pool (optionally on a
+                # replica) so they never wait behind ingest writers
+                read_params = dict(params, options='-c default_transaction_read_only=on')
+                if self.db_config.get('read_host'):
+                    read_params['host'] = self.db_config['read_host']
+                self._read_pool = _acquire_pool(
+                    1,
+                    self.db_config.get('read_pool_size', 2),
+                    **read_params
                 )
                 self.db_type = 'postgresql'
                 print(f"✓ Connected to PostgreSQL: {self.db_config['database']}")
                 return True
             except Exception as e:
                 print(f"PostgreSQL connection failed: {e}")
+                if self._write_pool:
+                    _release_pool(self._write_pool)
+                    self._write_pool = None
         
         # Fallback to SQLite
         try:
             db_path = '/root/congress_api_project/data/congress_data.db'
             os.makedirs(os.path.dirname(db_path), exist_ok=True)
             self.conn = sqlite3.connect(db_path)
+            # WAL + NORMAL: commits no longer fsync the main database file
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
             self.db_type = 'sqlite'
             print(f"✓ Connected to SQLite: {db_path}")
             return True
@@ -70,12 +265,75 @@ class DatabaseManager:
     
     def disconnect(self):
         """Close database connection."""
+        for pool in (self._write_pool, self._read_pool):
+            if pool:
+                _release_pool(pool)
+        self._write_pool = None
+        self._read_pool = None
         if self.conn:
             self.conn.close()
             self.conn = None
     
+    @contextmanager
+    def _connection(self, read: bool = False):
+        """Borrow a pooled PostgreSQL connection, or the SQLite connection.
+        
+        Args:
+            read: Use the read-only pool instead of the write pool
+        """
+        pinned = getattr(self._local, 'conn', None)
+        if pinned is not None and not read:
+            yield pinned
+            return
+        
+        pool = self._read_pool if read else self._write_pool
+        if pool:
+            conn = pool.getconn()
+            try:
+                yield conn
+            finally:
+                pool.putconn(conn)
+        elif self.conn:
+            yield self.conn
+        else:
+            raise ConnectionError("Not connected to database")
+    
+    @contextmanager
+    def transaction(self, rollback: bool = False):
+        """Run every write in the block on one connection and commit once.
+        
+        execute(), insert_packages() etc. called inside the block skip their
+        own commit; the block commits on exit and rolls back if it raises.
+        Nested blocks join the outer transaction.
+        
+        Args:
+            rollback: Discard the block's writes on exit instead of committing
+        """
+        if getattr(self._local, 'conn', None) is not None:
+            yield self._local.conn
+            return
+        
+        with self._connection() as conn:
+            self._local.conn = conn
+            try:
+                yield conn
+                if rollback:
+                    conn.rollback()
+                else:
+                    conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                self._local.conn = None
+    
+    def _commit(self, conn):
+        """Commit unless conn belongs to an open transaction() block."""
+        if conn is not getattr(self._local, 'conn', None):
+            conn.commit()
+    
     def execute(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
-        """Execute a query and return results.
+        """Execute a query on the write pool and return results.
         
         Args:
             query: SQL query string
@@ -84,32 +342,111 @@ class DatabaseManager:
         Returns:
             List of dictionaries representing rows
         """
-        if not self.conn:
-            raise ConnectionError("Not connected to database")
+        return self._execute(query, params)
+    
+    def execute_read(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        """Execute a read-only query on the read pool and return results."""
+        return self._execute(query, params, read=True)
+    
+    def exists(self, query: str, params: tuple = (), read: bool = False) -> bool:
+        """Return True if the query yields at least one row (no row dicts are built)."""
+        return self._execute(query, params, read, fetch=_fetch_exists)
+    
+    def fetch_value(self, query: str, params: tuple = (), default: Any = None, read: bool = False) -> Any:
+        """Return the first column of the first row, or default if there is none."""
+        value = self._execute(query, params, read, fetch=_fetch_first_value)
+        return default if value is None else value
+    
+    def _execute(
+        self,
+        query: str,
+        params: tuple = (),
+        read: bool = False,
+        fetch: Optional[Callable] = None
+    ) -> Any:
+        """Run a query on a borrowed connection and return rows as dictionaries.
         
+        fetch, if given, reads the result from the cursor instead.
+        """
+        with self._connection(read) as conn:
+            try:
+                cur = conn.cursor()
+                
+                # Handle parameter style differences
+                if self.db_type == 'sqlite':
+                    # SQLite uses ? placeholders (and caches compiled statements itself)
+                    query = _qmark(query)
+                elif isinstance(conn, PreparingConnection):
+                    query = self._prepared(conn, cur, query, params)
+                
+                cur.execute(query, params)
+                
+                rows = (fetch or _fetch_dicts)(cur)
+                
+                self._commit(conn)
+                cur.close()
+                return rows
+                
+            except Exception as e:
+                conn.rollback()
+                raise e
+    
+    def _prepared(self, conn, cur, query: str, params: tuple) -> str:
+        """Return an EXECUTE of the connection's prepared copy of query.
+        
+        The first use of a query on a connection PREPAREs it; later uses skip
+        the server's parse/plan step. The least recently used statement is
+        DEALLOCATEd once STATEMENT_CACHE_SIZE is reached.
+        
+        Queries that cannot be prepared are returned unchanged: DDL, named
+        parameters, %s inside a string literal, and anything the server
+        rejects at PREPARE time (e.g. untyped parameters such as SELECT %s).
+        A rejected PREPARE is undone with a savepoint, so the caller's
+        transaction is unaffected, and the query is not tried again.
+        """
+        # Hot path: the statement is already prepared on this connection
+        name = conn.prepared.get(query)
+        if name is not None:
+            conn.prepared.move_to_end(query)
+            return _execute_sql(name, len(params))
+        
+        words = query.split(None, 1)
+        verb = words[0].upper() if words else ''
+        
+        if verb in _DDL:
+            if conn.prepared:
+                cur.execute('DEALLOCATE ALL')
+                conn.prepared.clear()
+            # A schema change may make a rejected query preparable
+            conn.unpreparable.clear()
+            return query
+        
+        if verb not in _PREPARABLE or '%(' in query or query in conn.unpreparable:
+            return query
+        # Odd segments between quotes are string literals, e.g. LIKE '%s%'
+        if any('%s' in literal for literal in query.split("'")[1::2]):
+            return query
+        parts = query.replace('%%', '%').split('%s')
+        if len(parts) - 1 != len(params):
+            return query
+        
+        if len(conn.prepared) >= self.STATEMENT_CACHE_SIZE:
+            _, stale = conn.prepared.popitem(last=False)
+            cur.execute(f'DEALLOCATE {stale}')
+        
+        body = parts[0] + ''.join(f'${i}{part}' for i, part in enumerate(parts[1:], 1))
+        name = f'stmt_{next(conn.statement_ids)}'
+        cur.execute('SAVEPOINT prepare_statement')
         try:
-            cur = self.conn.cursor()
-            
-            # Handle parameter style differences
-            if self.db_type == 'sqlite':
-                # SQLite uses ? placeholders
-                query = query.replace('%s', '?')
-            
-            cur.execute(query, params)
-            
-            if cur.description:
-                columns = [desc[0] for desc in cur.description]
-                rows = [dict(zip(columns, row)) for row in cur.fetchall()]
-            else:
-                rows = []
-            
-            self.conn.commit()
-            cur.close()
-            return rows
-            
-        except Exception as e:
-            self.conn.rollback()
-            raise e
+            cur.execute(f'PREPARE {name} AS {body}')
+        except psycopg2.Error:
+            cur.execute('ROLLBACK TO SAVEPOINT prepare_statement')
+            conn.unpreparable.add(query)
+            return query
+        finally:
+            cur.execute('RELEASE SAVEPOINT prepare_statement')
+        conn.prepared[query] = name
+        return _execute_sql(name, len(params))
     
     def insert_collection(self, collection_data: Dict[str, Any]) -> bool:
         """Insert or update a collection.
@@ -141,6 +478,59 @@ class DatabaseManager:
         self.execute(query, params)
         return True
     
+    def insert_collections(self, collections: List[Dict[str, Any]], page_size: Optional[int] = None) -> List[str]:
+        """Insert or update a batch of collections in one transaction.
+        
+        Args:
+            collections: List of dictionaries with collection_code, collection_name, etc.
+            page_size: Rows per INSERT statement on PostgreSQL (default: insert_page_size)
+        
+        Returns:
+            collection_codes of the rows that were newly inserted (the rest were updated)
+        """
+        if not collections:
+            return []
+        
+        columns = _COLLECTION_COLUMNS
+        # One row per collection_code (last wins): an upsert may not touch the same row twice
+        rows = list({row[0]: row for row in _rows(_collection_row, columns, collections)}.values())
+        upsert = """
+            ON CONFLICT (collection_code)
+            DO UPDATE SET
+                collection_name = EXCLUDED.collection_name,
+                description = EXCLUDED.description,
+                last_modified = EXCLUDED.last_modified,
+                updated_at = CURRENT_TIMESTAMP
+        """
+        
+        with self._connection() as conn:
+            try:
+                cur = conn.cursor()
+                
+                if self.db_type == 'postgresql':
+                    # xmax is 0 only on rows this statement created
+                    query = f"""
+                        INSERT INTO collections ({', '.join(columns)})
+                        VALUES %s
+                        {upsert}
+                        RETURNING collection_code, xmax = 0
+                    """
+                    returned = execute_values(cur, query, rows, page_size=page_size or self.insert_page_size, fetch=True)
+                    inserted = [code for code, is_new in returned if is_new]
+                else:
+                    codes = [row[0] for row in rows]
+                    existing = self._existing_keys_sqlite(cur, 'collections', 'collection_code', codes)
+                    self._bulk_insert_sqlite(cur, 'collections', columns, rows, upsert)
+                    inserted = [code for code in codes if code not in existing]
+                
+                self._commit(conn)
+                cur.close()
+                return inserted
+            
+            except Exception as e:
+                conn.rollback()
+                raise e
+    
     def insert_package(self, package_data: Dict[str, Any]) -> bool:
         """Insert or update a package.
         
@@ -182,6 +572,149 @@ class DatabaseManager:
         self.execute(query, params)
         return True
     
+    def insert_packages(
+        self,
+        packages: List[Dict[str, Any]],
+        page_size: Optional[int] = None
+    ) -> Tuple[List[str], List[str]]:
+        """Upsert a batch of packages and report which rows were new or changed.
+        
+        Existing packages are only rewritten when their last_modified differs,
+        so re-ingesting an unchanged page writes nothing. On PostgreSQL the
+        rows go out as multi-row INSERTs (page_size rows per statement) instead
+        of one round-trip per package; batches of COPY_MIN_ROWS or more are
+        COPYed into a temporary staging table and moved over with one
+        INSERT ... SELECT. The whole batch is committed once.
+        
+        Args:
+            packages: List of dictionaries with package_id, collection_code, etc.
+            page_size: Rows per INSERT statement (default: insert_page_size)
+            
+        Returns:
+            Tuple of (inserted, updated) package_id lists; unchanged packages
+            are in neither
+        """
+        if not packages:
+            return [], []
+        
+        columns = _PACKAGE_COLUMNS
+        # One row per package_id: an upsert may not touch the same row twice
+        rows = list({row[0]: row for row in _rows(_package_row, columns, packages)}.values())
+        
+        with self._connection() as conn:
+            try:
+                cur = conn.cursor()
+                
+                if self.db_type == 'postgresql':
+                    if len(rows) >= self.COPY_MIN_ROWS:
+                        returned = self._copy_packages(cur, columns, rows)
+                    else:
+                        query = f"""
+                            INSERT INTO packages ({', '.join(columns)})
+                            VALUES %s
+                            {_PACKAGE_UPSERT}
+                            RETURNING package_id, xmax = 0
+                        """
+                        returned = execute_values(
+                            cur, query, rows, page_size=page_size or self.insert_page_size, fetch=True
+                        )
+                    # xmax is 0 only on rows this statement created
+                    inserted = [package_id for package_id, is_new in returned if is_new]
+                    updated = [package_id for package_id, is_new in returned if not is_new]
+                else:
+                    existing = self._existing_keys_sqlite(
+                        cur, 'packages', 'package_id', [row[0] for row in rows], 'last_modified'
+                    )
+                    self._bulk_insert_sqlite(cur, 'packages', columns, rows, _PACKAGE_UPSERT.replace('IS DISTINCT FROM', 'IS NOT'))
+                    inserted = [row[0] for row in rows if row[0] not in existing]
+                    updated = [row[0] for row in rows if row[0] in existing and existing[row[0]] != row[-1]]
+                
+                self._commit(conn)
+                cur.close()
+                return inserted, updated
+                
+            except Exception as e:
+                conn.rollback()
+                raise e
+    
+    def _existing_keys_sqlite(
+        self,
+        cur,
+        table: str,
+        key: str,
+        keys: List[Any],
+        column: Optional[str] = None
+    ) -> Dict[Any, Any]:
+        """Look up which keys already exist in table, in IN (...) chunks.
+        
+        Returns:
+            Dictionary mapping each existing key to its value in column (or to
+            itself when no column is given)
+        """
+        existing = {}
+        for start in range(0, len(keys), self.SQLITE_MAX_VARIABLES):
+            chunk = keys[start:start + self.SQLITE_MAX_VARIABLES]
+            cur.execute(
+                f"SELECT {key}, {column or key} FROM {table} WHERE {key} IN ({', '.join('?' for _ in chunk)})",
+                chunk
+            )
+            existing.update(cur.fetchall())
+        return existing
+    
+    def _bulk_insert_sqlite(self, cur, table: str, columns: tuple, rows: List[tuple], conflict: str = '') -> List[tuple]:
+        """Insert rows into a SQLite table with one multi-row VALUES statement per chunk.
+        
+        Chunks stay under SQLite's bound-parameter limit (SQLITE_MAX_VARIABLES).
+        
+        Returns:
+            Rows produced by a RETURNING clause in conflict, if any
+        """
+        per_chunk = max(1, self.SQLITE_MAX_VARIABLES // len(columns))
+        placeholders = f"({', '.join('?' for _ in columns)})"
+        returned = []
+        
+        for start in range(0, len(rows), per_chunk):
+            chunk = rows[start:start + per_chunk]
+            cur.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES {', '.join(placeholders for _ in chunk)} {conflict}",
+                [value for row in chunk for value in row]
+            )
+            returned.extend(cur.fetchall())
+        return returned
+    
+    def _copy_packages(self, cur, columns: tuple, rows: List[tuple]) -> List[tuple]:
+        """COPY rows into a staging table and upsert them into packages.
+        
+        COPY cannot do ON CONFLICT, so the rows land in a temporary table first.
+        The staging table is dropped at commit and emptied after each use, so
+        several batches can share one transaction() block.
+        
+        Returns:
+            (package_id, inserted) pairs for the rows that were written
+        """
+        column_list = ', '.join(columns)
+        buf = io.StringIO()
+        for row in rows:
+            buf.write('\t'.join(_copy_text(value) for value in row))
+            buf.write('\n')
+        buf.seek(0)
+        
+        cur.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS package_staging "
+            "(LIKE packages INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        cur.copy_expert(f"COPY package_staging ({column_list}) FROM STDIN WITH (FORMAT text)", buf)
+        cur.execute(f"""
+            INSERT INTO packages ({column_list})
+            SELECT {column_list} FROM package_staging
+            {_PACKAGE_UPSERT}
+            RETURNING package_id, xmax = 0
+        """)
+        returned = cur.fetchall()
+        cur.execute("TRUNCATE package_staging")
+        return returned
+    
     def log_ingestion(self, log_data: Dict[str, Any]) -> int:
         """Log an ingestion attempt.
         
@@ -213,6 +746,44 @@ class DatabaseManager:
         result = self.execute(query, params)
         return result[0]['id'] if result else None
     
+    def log_ingestions(self, logs: List[Dict[str, Any]], page_size: Optional[int] = None) -> List[int]:
+        """Log a batch of ingestion attempts with multi-row INSERTs.
+        
+        Args:
+            logs: List of dictionaries shaped like log_ingestion's log_data
+            page_size: Rows per INSERT statement on PostgreSQL (default: insert_page_size)
+        
+        Returns:
+            Log IDs of the inserted rows
+        """
+        if not logs:
+            return []
+        
+        columns = _LOG_COLUMNS
+        rows = _rows(_log_row, columns, logs)
+        
+        with self._connection() as conn:
+            try:
+                cur = conn.cursor()
+                
+                if self.db_type == 'postgresql':
+                    query = f"""
+                        INSERT INTO ingestion_log ({', '.join(columns)})
+                        VALUES %s
+                        RETURNING id
+                    """
+                    returned = execute_values(cur, query, rows, page_size=page_size or self.insert_page_size, fetch=True)
+                else:
+                    returned = self._bulk_insert_sqlite(cur, 'ingestion_log', columns, rows, 'RETURNING id')
+                
+                self._commit(conn)
+                cur.close()
+                return [row[0] for row in returned]
+            
+            except Exception as e:
+                conn.rollback()
+                raise e
+    
     def get_last_offset(self, collection_code: str) -> int:
         """Get the last successful offset for a collection.
         
@@ -230,8 +801,83 @@ class DatabaseManager:
             LIMIT 1
         """
         
-        result = self.execute(query, (collection_code,))
-        return result[0]['last_offset'] if result else 0
+        return self.fetch_value(query, (collection_code,), default=0)
+    
+    def drop_secondary_indexes(self, table: str) -> List[str]:
+        """Drop a table's indexes that no constraint depends on.
+        
+        Primary key and unique-constraint indexes stay, since ON CONFLICT
+        needs them. Used around cold bulk loads, where building each index once
+        at the end is far cheaper than updating it row by row.
+        
+        Args:
+            table: Table name
+            
+        Returns:
+            CREATE INDEX statements that recreate what was dropped
+        """
+        if self.db_type == 'postgresql':
+            query = """
+                SELECT i.indexrelid::regclass::text AS name, pg_get_indexdef(i.indexrelid) AS definition
+                FROM pg_index i
+                WHERE i.indrelid = %s::regclass
+                  AND NOT i.indisprimary
+                  AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+            """
+        else:
+            # Constraint indexes are sqlite_autoindex_* rows with no SQL
+            query = """
+                SELECT name, sql AS definition FROM sqlite_master
+                WHERE type = 'index' AND tbl_name = %s AND sql IS NOT NULL
+            """
+        
+        indexes = self.execute(query, (table,))
+        with self.transaction():
+            for index in indexes:
+                self.execute(f"DROP INDEX IF EXISTS {index['name']}")
+        return [index['definition'] for index in indexes]
+    
+    def create_indexes(self, definitions: List[str]):
+        """Run CREATE INDEX statements, e.g. those returned by drop_secondary_indexes."""
+        with self.transaction():
+            for definition in definitions:
+                self.execute(definition)
+    
+    def get_dashboard(self) -> Dict[str, Any]:
+        """Get table counts and the latest ingestion log rows in one query.
+        
+        Returns:
+            Dictionary with total_collections, total_packages and recent_logs
+        """
+        # Portable across PostgreSQL and SQLite: the counts ride along on each
+        # of the (up to 5) log rows, and the LEFT JOIN keeps one row when the
+        # log is empty.
+        query = """
+            SELECT
+                (SELECT COUNT(*) FROM collections) AS total_collections,
+                (SELECT COUNT(*) FROM packages) AS total_packages,
+                l.*
+            FROM (SELECT 1 AS one) AS d
+            LEFT JOIN (
+                SELECT id, collection_code, offset_value, records_ingested, status
+                FROM ingestion_log ORDER BY id DESC LIMIT 5
+            ) AS l ON 1 = 1
+            ORDER BY l.id DESC
+        """
+        
+        rows = self.execute_read(query)
+        dashboard = {
+            'total_collections': rows[0]['total_collections'] if rows else 0,
+            'total_packages': rows[0]['total_packages'] if rows else 0,
+            'recent_logs': []
+        }
+        for row in rows:
+            if row.get('id') is None:
+                continue
+            row.pop('total_collections')
+            row.pop('total_packages')
+            dashboard['recent_logs'].append(row)
+        return dashboard
     
     def package_exists(self, package_id: str) -> bool:
         """Check if a package already exists.
@@ -243,8 +889,7 @@ class DatabaseManager:
             True if package exists
         """
         query = "SELECT 1 FROM packages WHERE package_id = %s LIMIT 1"
-        result = self.execute(query, (package_id,))
-        return len(result) > 0
+        return self.exists(query, (package_id,))
 
 
 if __name__ == '__main__':
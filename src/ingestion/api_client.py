@@ -1,61 +1,130 @@
 """GovInfo API client with rate limiting and pagination support."""
 
+import asyncio
+import threading
 import time
 import requests
 import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
 
 class GovInfoAPIClient:
     """Client for interacting with the GovInfo API."""
     
-    def __init__(self, api_key: str, base_url: str = 'https://api.govinfo.gov'):
+    def __init__(self, api_key: str, base_url: str = 'https://api.govinfo.gov', concurrency: int = 10):
         """Initialize API client.
         
         Args:
             api_key: GovInfo API key
             base_url: Base URL for API
+            concurrency: Maximum async requests in flight at once
         """
         self.api_key = api_key
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             'X-Api-Key': api_key,
             'User-Agent': 'CongressAPI-Project/1.0'
-        })
+        }
+        
+        # aiohttp session for the *_async methods, created inside the running loop
+        self.concurrency = concurrency
+        self._async_session = None
+        self._async_loop = None
+        self._semaphore = None
+        
+        # Keep enough pooled keep-alive connections for concurrent fetches
+        # (async ingestion) and retry transient failures at the transport level;
+        # 429/503 retries wait out the server's Retry-After
+        self._adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=('GET',),
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        )
+        # requests.Session is not safe to share across threads (cookies, mount
+        # table), so each thread gets its own Session over the shared adapter
+        # and therefore the same keep-alive connection pool
+        self._thread_sessions = threading.local()
+        self.session = self.session_for_thread()
         
         # Rate limiting
-        self.last_request_time = 0
-        self.min_interval = 0.1  # 100ms between requests (10 req/sec)
+        # Token bucket: 10 req/sec long-run, bursts of up to 10 when idle
+        self.requests_per_second = 10.0
+        self.burst = 10
+        self.tokens = float(self.burst)
+        self.last_refill = time.time()
         self.max_requests_per_hour = 1000
         self.request_count = 0
         self.hour_start = time.time()
+        # Requests may be issued from worker threads (async ingestion)
+        self._rate_lock = threading.Lock()
+    
+    def session_for_thread(self) -> requests.Session:
+        """Return the calling thread's Session, creating it on first use."""
+        session = getattr(self._thread_sessions, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            session.mount('https://', self._adapter)
+            session.mount('http://', self._adapter)
+            self._thread_sessions.session = session
+        return session
     
     def _check_rate_limit(self):
         """Check and enforce rate limits."""
-        now = time.time()
-        
-        # Check hourly limit
-        if now - self.hour_start > 3600:
-            self.request_count = 0
-            self.hour_start = now
-        
-        if self.request_count >= self.max_requests_per_hour:
-            sleep_time = 3600 - (now - self.hour_start)
-            if sleep_time > 0:
-                print(f"Rate limit reached, sleeping for {sleep_time:.1f} seconds...")
-                time.sleep(sleep_time)
-                self.request_count = 0
-                self.hour_start = time.time()
-        
-        # Check minimum interval
-        elapsed = now - self.last_request_time
-        if elapsed < self.min_interval:
-            time.sleep(self.min_interval - elapsed)
-        
-        self.last_request_time = time.time()
-        self.request_count += 1
+        delay = self._reserve_slot()
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def _check_rate_limit_async(self):
+        """Check and enforce rate limits without blocking the event loop."""
+        delay = self._reserve_slot()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    def _reserve_slot(self) -> float:
+        """Record the next allowed request and return how long to wait for it."""
+        with self._rate_lock:
+            now = time.time()
+            
+            # Roll the hourly window forward, keeping slots already reserved
+            # in later windows by callers that are still waiting
+            if now - self.hour_start > 3600:
+                windows = int((now - self.hour_start) // 3600)
+                self.hour_start += 3600 * windows
+                self.request_count = max(0, self.request_count - windows * self.max_requests_per_hour)
+            
+            # Refill, then take a token; a negative balance is the wait owed
+            self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.requests_per_second)
+            self.last_refill = now
+            self.tokens -= 1
+            delay = -self.tokens / self.requests_per_second if self.tokens < 0 else 0.0
+            
+            # Past the hourly cap, the slot falls in a later window
+            window = self.request_count // self.max_requests_per_hour
+            if window:
+                window_start = self.hour_start + 3600 * window
+                if self.request_count % self.max_requests_per_hour == 0:
+                    print(f"Rate limit reached, sleeping for {window_start - now:.1f} seconds...")
+                delay = max(delay, window_start - now)
+            
+            self.request_count += 1
+            return delay
     
     def get_collections(self) -> Dict[str, Any]:
         """Get all available collections.
@@ -66,7 +135,7 @@ class GovInfoAPIClient:
         self._check_rate_limit()
         
         try:
-            response = self.session.get(
+            response = self.session_for_thread().get(
                 f'{self.base_url}/collections',
                 timeout=30
             )
@@ -107,20 +176,10 @@ class GovInfoAPIClient:
         """
         self._check_rate_limit()
         
-        # Build URL with parameters
-        url = f'{self.base_url}/collections/{collection_code}'
-        params = {
-            'offset': offset,
-            'pageSize': min(limit, 1000)  # API max is 1000
-        }
-        
-        if start_date:
-            params['startDate'] = start_date
-        if end_date:
-            params['endDate'] = end_date
+        url, params = self._packages_request(collection_code, offset, limit, start_date, end_date)
         
         try:
-            response = self.session.get(url, params=params, timeout=30)
+            response = self.session_for_thread().get(url, params=params, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -149,6 +208,108 @@ class GovInfoAPIClient:
                 'limit': limit
             }
     
+    async def get_collection_packages_async(
+        self,
+        collection_code: str,
+        offset: int = 0,
+        limit: int = 100,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Async version of get_collection_packages.
+        
+        Requests share the client's rate limit and at most `concurrency` are in
+        flight at once. Without aiohttp installed the blocking request runs in
+        a worker thread instead.
+        
+        Returns:
+            Dictionary with packages data
+        """
+        if not AIOHTTP_AVAILABLE:
+            return await asyncio.to_thread(
+                self.get_collection_packages, collection_code, offset, limit, start_date, end_date
+            )
+        
+        session = self._get_async_session()
+        url, params = self._packages_request(collection_code, offset, limit, start_date, end_date)
+        
+        try:
+            async with self._semaphore:
+                await self._check_rate_limit_async()
+                async with session.get(url, params=params) as response:
+                    if response.status == 200:
+                        data = await response.json(content_type=None)
+                        
+                        if 'offset' not in data:
+                            data['offset'] = offset
+                        if 'limit' not in data:
+                            data['limit'] = limit
+                        
+                        return data
+                    
+                    return {
+                        'error': f'HTTP {response.status}',
+                        'message': (await response.text())[:500],
+                        'offset': offset,
+                        'limit': limit
+                    }
+                    
+        except Exception as e:
+            return {
+                'error': str(e),
+                'message': 'Exception occurred',
+                'offset': offset,
+                'limit': limit
+            }
+    
+    def _packages_request(
+        self,
+        collection_code: str,
+        offset: int,
+        limit: int,
+        start_date: Optional[str],
+        end_date: Optional[str]
+    ) -> tuple:
+        """Build the URL and query parameters for a collection page."""
+        url = f'{self.base_url}/collections/{collection_code}'
+        params = {
+            'offset': offset,
+            'pageSize': min(limit, 1000)  # API max is 1000
+        }
+        
+        if start_date:
+            params['startDate'] = start_date
+        if end_date:
+            params['endDate'] = end_date
+        
+        return url, params
+    
+    def _get_async_session(self):
+        """Return the aiohttp session for the running event loop, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        if self._async_session is None or self._async_session.closed or self._async_loop is not loop:
+            old = self._async_session
+            if old is not None and not old.closed:
+                # Bound to another event loop: close it on that loop if it still
+                # runs; if it has stopped, its sockets went with it, so just drop it
+                if self._async_loop.is_running():
+                    asyncio.run_coroutine_threadsafe(old.close(), self._async_loop)
+                else:
+                    old.detach()
+            self._async_session = aiohttp.ClientSession(
+                headers=self.headers,
+                # One host: keep warm keep-alive connections for the whole fan-out
+                connector=aiohttp.TCPConnector(
+                    limit=self.concurrency,
+                    keepalive_timeout=60,
+                    ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+            self._async_loop = loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._async_session
+    
     def get_package_details(self, package_id: str) -> Dict[str, Any]:
         """Get detailed information about a specific package.
         
@@ -161,7 +322,7 @@ class GovInfoAPIClient:
         self._check_rate_limit()
         
         try:
-            response = self.session.get(
+            response = self.session_for_thread().get(
                 f'{self.base_url}/packages/{package_id}',
                 timeout=30
             )
@@ -180,6 +341,17 @@ class GovInfoAPIClient:
                 'message': 'Exception occurred'
             }
     
+    def close(self):
+        """Close pooled HTTP connections."""
+        # Closing the shared adapter drops the pool every thread's Session uses
+        self._adapter.close()
+    
+    async def aclose(self):
+        """Close the aiohttp session used by the *_async methods."""
+        if self._async_session and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get API usage statistics.
         
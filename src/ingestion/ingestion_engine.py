@@ -1,13 +1,25 @@
 """Main ingestion engine for GovInfo API data."""
 
+import asyncio
 import json
-import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
-from database.db_manager import DatabaseManager
+from database.db_manager import DatabaseManager, load_config
 from ingestion.api_client import GovInfoAPIClient
 
+# packages column -> GovInfo field copied as-is by _transform_package
+# (package_id and collection_code are filled in separately)
+PACKAGE_FIELD_MAP = (
+    ('title', 'title'),
+    ('summary', 'summary'),
+    ('download_url', 'downloadUrl'),
+    ('details_url', 'detailsUrl'),
+    ('publish_date', 'publishDate'),
+    ('last_modified', 'lastModified')
+)
+
 
 class IngestionEngine:
     """Orchestrates data ingestion from GovInfo API to database."""
@@ -19,8 +31,7 @@ class IngestionEngine:
             config_path: Path to configuration file
         """
         self.config_path = config_path
-        with open(config_path, 'r') as f:
-            self.config = json.load(f)
+        self.config = load_config(config_path)
         
         # Initialize components
         self.db = DatabaseManager(config_path)
@@ -57,39 +68,31 @@ class IngestionEngine:
         collections = api_result.get('collections', [])
         result['total_collections'] = len(collections)
         
-        for collection in collections:
-            try:
-                collection_data = {
-                    'collection_code': collection.get('collectionCode'),
-                    'collection_name': collection.get('collectionName'),
-                    'description': collection.get('description'),
-                    'last_modified': collection.get('lastModified')
-                }
-                
-                # Check if collection exists
-                exists = self._collection_exists(collection_data['collection_code'])
-                
-                self.db.insert_collection(collection_data)
-                
-                if exists:
-                    result['updated'] += 1
-                else:
-                    result['inserted'] += 1
-                
-                print(f"  ✓ {collection_data['collection_code']}: {collection_data['collection_name']}")
-                
-            except Exception as e:
-                result['errors'].append(f"Collection {collection.get('collectionCode', 'UNKNOWN')}: {str(e)}")
+        rows = [
+            {
+                'collection_code': collection.get('collectionCode'),
+                'collection_name': collection.get('collectionName'),
+                'description': collection.get('description'),
+                'last_modified': collection.get('lastModified')
+            }
+            for collection in collections
+        ]
+        
+        try:
+            new_codes = set(self.db.insert_collections(rows))
+        except Exception as e:
+            result['errors'].append(f"Batch of {len(rows)} collections: {str(e)}")
+            return result
+        
+        for collection_data in rows:
+            print(f"  ✓ {collection_data['collection_code']}: {collection_data['collection_name']}")
+        
+        result['inserted'] = len(new_codes)
+        result['updated'] = len(rows) - len(new_codes)
         
         print(f"\nCollections ingested: {result['inserted']} inserted, {result['updated']} updated")
         return result
     
-    def _collection_exists(self, collection_code: str) -> bool:
-        """Check if collection exists in database."""
-        query = "SELECT 1 FROM collections WHERE collection_code = %s LIMIT 1"
-        result = self.db.execute(query, (collection_code,))
-        return len(result) > 0
-    
     def ingest_collection_packages(
         self,
         collection_code: str,
@@ -132,96 +135,243 @@ class IngestionEngine:
         
         batch_size = min(batch_size, 1000)  # API max
         
-        while True:
-            # Check max packages limit
-            if max_packages and result['total_ingested'] >= max_packages:
-                print(f"\nReached maximum packages limit: {max_packages}")
-                break
-            
-            print(f"\nFetching batch at offset {current_offset}, limit {batch_size}...")
-            
-            # Log ingestion start
-            log_id = self._log_ingestion_start(collection_code, current_offset, batch_size)
-            
-            # Get packages from API
-            api_result = self.api_client.get_collection_packages(
+        def fetch_page(offset):
+            return self.api_client.get_collection_packages(
                 collection_code,
-                offset=current_offset,
+                offset=offset,
                 limit=batch_size,
                 start_date=start_date,
                 end_date=end_date
             )
+        
+        # One background slot: page N+1 is fetched while page N is written
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = None
             
-            if 'error' in api_result:
-                error_msg = f"Offset {current_offset}: {api_result['error']} - {api_result.get('message', '')}"
-                result['errors'].append(error_msg)
-                print(f"  ✗ {error_msg}")
+            while True:
+                # Check max packages limit
+                if max_packages and result['total_ingested'] >= max_packages:
+                    print(f"\nReached maximum packages limit: {max_packages}")
+                    break
                 
-                # Log error
-                self._log_ingestion_complete(log_id, 'error', 0, error_msg)
-                break
-            
-            packages = api_result.get('packages', [])
-            
-            if not packages:
-                print(f"  No more packages found at offset {current_offset}")
-                self._log_ingestion_complete(log_id, 'success', 0)
-                break
-            
-            # Process packages
-            batch_inserted = 0
-            batch_updated = 0
-            batch_duplicates = 0
-            
-            for package in packages:
-                try:
-                    package_data = self._transform_package(package, collection_code)
-                    
-                    # Check for duplicates
-                    if self.db.package_exists(package_data['package_id']):
-                        batch_duplicates += 1
-                        result['duplicates_skipped'] += 1
-                        continue
-                    
-                    # Insert package
-                    self.db.insert_package(package_data)
+                print(f"\nFetching batch at offset {current_offset}, limit {batch_size}...")
+                
+                # Get packages from API (already in flight if prefetched)
+                if pending is None:
+                    pending = executor.submit(fetch_page, current_offset)
+                api_result = pending.result()
+                pending = None
+                
+                packages = api_result.get('packages', [])
+                
+                # Prefetch the next page unless this one is the last we need
+                more_needed = not max_packages or result['total_ingested'] + len(packages) < max_packages
+                if 'error' not in api_result and len(packages) == batch_size and more_needed:
+                    pending = executor.submit(fetch_page, current_offset + len(packages))
+                
+                if 'error' in api_result:
+                    error_msg = f"Offset {current_offset}: {api_result['error']} - {api_result.get('message', '')}"
+                    result['errors'].append(error_msg)
+                    print(f"  ✗ {error_msg}")
                     
-                    if package.get('lastModified'):
-                        batch_updated += 1
-                        result['updated'] += 1
+                    # Log error
+                    self._log_batch(collection_code, current_offset, batch_size, 'error', 0, error_msg)
+                    break
+                
+                if not packages:
+                    print(f"  No more packages found at offset {current_offset}")
+                    break
+                
+                # The packages and their log row commit together
+                with self.db.transaction():
+                    counts = self._write_packages(packages, collection_code, result)
+                    if counts:
+                        self._log_batch(collection_code, current_offset, batch_size, 'success', len(packages))
                     else:
-                        batch_inserted += 1
-                        result['inserted'] += 1
-                    
-                    result['total_ingested'] += 1
-                    
-                except Exception as e:
-                    error_msg = f"Package {package.get('packageId', 'UNKNOWN')}: {str(e)}"
-                    result['errors'].append(error_msg)
-                    print(f"    ✗ {error_msg}")
-            
-            print(f"  ✓ Batch processed: {len(packages)} packages ({batch_inserted} new, {batch_updated} updated, {batch_duplicates} duplicates)")
+                        self._log_batch(collection_code, current_offset, batch_size, 'error', 0, result['errors'][-1])
+                
+                # Stop at a failed page: a later success row would move the
+                # resume offset past it
+                if not counts:
+                    break
+                
+                batch_inserted, batch_updated, batch_duplicates = counts
+                print(f"  ✓ Batch processed: {len(packages)} packages ({batch_inserted} new, {batch_updated} updated, {batch_duplicates} duplicates)")
+                
+                result['batches_completed'] += 1
+                result['last_offset'] = current_offset
+                
+                # Move to next batch
+                current_offset += len(packages)
+                
+                # Check if we've reached the end
+                if len(packages) < batch_size:
+                    print(f"\nReached end of collection at offset {current_offset}")
+                    break
+        
+        print(f"\nIngestion complete for {collection_code}")
+        print(f"  Total packages: {result['total_ingested']}")
+        print(f"  Inserted: {result['inserted']}")
+        print(f"  Updated: {result['updated']}")
+        print(f"  Duplicates skipped: {result['duplicates_skipped']}")
+        print(f"  Errors: {len(result['errors'])}")
+        print(f"  Batches: {result['batches_completed']}")
+        
+        return result
+    
+    def bulk_cold_load(
+        self,
+        collection_code: str,
+        batch_size: int = 1000,
+        max_packages: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Ingest a collection into an empty or near-empty packages table.
+        
+        Secondary package indexes are dropped for the duration of the load and
+        rebuilt once at the end (even if the load fails). Full 1000-row pages
+        take the COPY path. Not meant for incremental runs against a populated
+        table, where rebuilding the indexes costs more than it saves.
+        
+        Args:
+            collection_code: Collection code to ingest
+            batch_size: Number of packages per API call (max 1000)
+            max_packages: Maximum packages to ingest (None for all)
+            start_date: Start date filter (YYYY-MM-DD)
+            end_date: End date filter (YYYY-MM-DD)
             
-            # Log success
-            self._log_ingestion_complete(
-                log_id,
-                'success',
-                len(packages)
+        Returns:
+            Dictionary with ingestion results
+        """
+        index_definitions = self.db.drop_secondary_indexes('packages')
+        print(f"Dropped {len(index_definitions)} secondary package indexes for the cold load")
+        
+        try:
+            return self.ingest_collection_packages(
+                collection_code,
+                batch_size=batch_size,
+                max_packages=max_packages,
+                start_date=start_date,
+                end_date=end_date
             )
+        finally:
+            print(f"Rebuilding {len(index_definitions)} package indexes...")
+            self.db.create_indexes(index_definitions)
+    
+    async def ingest_collection_packages_async(
+        self,
+        collection_code: str,
+        batch_size: int = 100,
+        max_packages: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        concurrency: int = 20
+    ) -> Dict[str, Any]:
+        """Ingest packages with several page requests in flight at once.
+        
+        The first page gives the collection's total count; the remaining pages
+        are fetched concurrently (still spaced by the client's rate limiter)
+        and handed through a bounded queue to a single database writer. The
+        writer stores pages in offset order and stops at the first page that
+        fails, so a restart resumes from that page.
+        
+        Args:
+            collection_code: Collection code to ingest
+            batch_size: Number of packages per API call (max 1000)
+            max_packages: Maximum packages to ingest (None for all)
+            start_date: Start date filter (YYYY-MM-DD)
+            end_date: End date filter (YYYY-MM-DD)
+            concurrency: Maximum number of API requests in flight
             
-            result['batches_completed'] += 1
-            result['last_offset'] = current_offset
-            
-            # Move to next batch
-            current_offset += len(packages)
-            
-            # Check if we've reached the end
-            if len(packages) < batch_size:
-                print(f"\nReached end of collection at offset {current_offset}")
-                break
-            
-            # Small delay between batches
-            time.sleep(0.5)
+        Returns:
+            Dictionary with ingestion results
+        """
+        print(f'\nIngesting packages for collection: {collection_code} (async, {concurrency} in flight)')
+        print('=' * 60)
+        
+        result = {
+            'collection_code': collection_code,
+            'total_ingested': 0,
+            'inserted': 0,
+            'updated': 0,
+            'duplicates_skipped': 0,
+            'errors': [],
+            'batches_completed': 0,
+            'last_offset': 0
+        }
+        
+        start_offset = self.db.get_last_offset(collection_code)
+        batch_size = min(batch_size, 1000)  # API max
+        
+        print(f"Starting from offset: {start_offset}")
+        
+        def fetch_page(offset):
+            return self.api_client.get_collection_packages_async(
+                collection_code,
+                offset=offset,
+                limit=batch_size,
+                start_date=start_date,
+                end_date=end_date
+            )
+        
+        first_page = await fetch_page(start_offset)
+        
+        end_offset = first_page.get('count')
+        if end_offset is None:
+            end_offset = start_offset + len(first_page.get('packages', []))
+        if max_packages:
+            end_offset = min(end_offset, start_offset + max_packages)
+        
+        queue = asyncio.Queue(maxsize=concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+        stopped = False
+        
+        async def fetch(offset):
+            async with semaphore:
+                if stopped:
+                    return
+                page = await fetch_page(offset)
+            await queue.put((offset, page))
+        
+        async def produce():
+            await asyncio.gather(*[
+                fetch(offset)
+                for offset in range(start_offset + batch_size, end_offset, batch_size)
+            ])
+            await queue.put(None)
+        
+        async def write():
+            nonlocal stopped
+            # Pages arrive in completion order; store them in offset order so
+            # the newest success row in ingestion_log is always a safe resume point
+            pending = {}
+            next_offset = start_offset
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                offset, page = item
+                pending[offset] = page
+                while next_offset in pending:
+                    page = pending.pop(next_offset)
+                    # Runs on the loop thread: the DB connection (notably SQLite)
+                    # must stay on the thread that opened it
+                    if not stopped and not self._store_page(collection_code, next_offset, batch_size, page, result):
+                        # Later pages are left for the next run to fetch again
+                        stopped = True
+                        print(f"  Stopping after failed page at offset {next_offset}")
+                    next_offset += batch_size
+        
+        writer = asyncio.create_task(write())
+        await queue.put((start_offset, first_page))
+        producer = asyncio.create_task(produce())
+        try:
+            await writer
+        finally:
+            # If the writer died, fetchers blocked on the full queue would wait forever
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
         
         print(f"\nIngestion complete for {collection_code}")
         print(f"  Total packages: {result['total_ingested']}")
@@ -233,38 +383,147 @@ class IngestionEngine:
         
         return result
     
+    async def ingest_collections_parallel(
+        self,
+        collection_codes: List[str],
+        batch_size: int = 100,
+        max_packages: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        concurrency: int = 10
+    ) -> Dict[str, Dict[str, Any]]:
+        """Ingest several collections at once over the shared async client.
+        
+        All collections draw on the same rate limit and the client's cap on
+        requests in flight, so this only overlaps waiting, never exceeds the quota.
+        
+        Args:
+            collection_codes: Collection codes to ingest
+            batch_size: Number of packages per API call (max 1000)
+            max_packages: Maximum packages to ingest per collection (None for all)
+            start_date: Start date filter (YYYY-MM-DD)
+            end_date: End date filter (YYYY-MM-DD)
+            concurrency: Maximum page requests in flight per collection
+            
+        Returns:
+            Dictionary mapping collection code to its ingestion results
+        """
+        try:
+            results = await asyncio.gather(*[
+                self.ingest_collection_packages_async(
+                    code, batch_size, max_packages, start_date, end_date, concurrency
+                )
+                for code in collection_codes
+            ])
+        finally:
+            await self.api_client.aclose()
+        
+        return dict(zip(collection_codes, results))
+    
+    def _store_page(
+        self,
+        collection_code: str,
+        offset: int,
+        limit: int,
+        api_result: Dict[str, Any],
+        result: Dict[str, Any]
+    ):
+        """Write one fetched page of packages and update the running result.
+        
+        Returns:
+            False if the page failed to fetch or write (the caller must stop
+            there), True otherwise
+        """
+        if 'error' in api_result:
+            error_msg = f"Offset {offset}: {api_result['error']} - {api_result.get('message', '')}"
+            result['errors'].append(error_msg)
+            print(f"  ✗ {error_msg}")
+            self._log_batch(collection_code, offset, limit, 'error', 0, error_msg)
+            return False
+        
+        packages = api_result.get('packages', [])
+        if not packages:
+            # Past the end of the collection: nothing to store, and logging it
+            # would move the resume offset beyond the real end
+            return True
+        
+        with self.db.transaction():
+            counts = self._write_packages(packages, collection_code, result)
+            if counts:
+                self._log_batch(collection_code, offset, limit, 'success', len(packages))
+            else:
+                self._log_batch(collection_code, offset, limit, 'error', 0, result['errors'][-1])
+        
+        if counts:
+            print(f"  ✓ Offset {offset}: {len(packages)} packages")
+        
+        result['batches_completed'] += 1
+        result['last_offset'] = max(result['last_offset'], offset)
+        return bool(counts)
+    
+    def _write_packages(
+        self,
+        packages: List[Dict[str, Any]],
+        collection_code: str,
+        result: Dict[str, Any]
+    ) -> Optional[tuple]:
+        """Bulk insert one page of packages and update the running result.
+        
+        A None return means "stop the run": every caller logs the page as an
+        error and stores nothing further, so the newest 'success' row in
+        ingestion_log stays below the failed page and the next run retries it.
+        
+        Returns:
+            Tuple of (inserted, updated, duplicates) counts for the page, or
+            None if the write failed (the error is added to result['errors'])
+        """
+        try:
+            rows = [self._transform_package(package, collection_code) for package in packages]
+            inserted_ids, updated_ids = self.db.insert_packages(rows)
+        except Exception as e:
+            error_msg = f"Batch of {len(packages)} packages: {str(e)}"
+            result['errors'].append(error_msg)
+            print(f"    ✗ {error_msg}")
+            return None
+        
+        inserted = len(inserted_ids)
+        updated = len(updated_ids)
+        duplicates = len(packages) - inserted - updated
+        result['inserted'] += inserted
+        result['updated'] += updated
+        result['duplicates_skipped'] += duplicates
+        result['total_ingested'] += inserted + updated
+        
+        return inserted, updated, duplicates
+    
     def _transform_package(self, package: Dict[str, Any], collection_code: str) -> Dict[str, Any]:
         """Transform API package data to database format."""
-        return {
-            'package_id': package.get('packageId', ''),
-            'collection_code': collection_code,
-            'title': package.get('title'),
-            'summary': package.get('summary'),
-            'download_url': package.get('downloadUrl'),
-            'details_url': package.get('detailsUrl'),
-            'publish_date': package.get('publishDate'),
-            'last_modified': package.get('lastModified')
-        }
+        row = {db_field: package.get(api_field) for db_field, api_field in PACKAGE_FIELD_MAP}
+        row['package_id'] = package.get('packageId', '')
+        row['collection_code'] = collection_code
+        return row
     
-    def _log_ingestion_start(self, collection_code: str, offset: int, limit: int) -> int:
-        """Log the start of an ingestion batch."""
+    def _log_batch(
+        self,
+        collection_code: str,
+        offset: int,
+        limit: int,
+        status: str,
+        records: int = 0,
+        error_msg: Optional[str] = None
+    ) -> int:
+        """Write the single ingestion_log row for a finished batch."""
         log_data = {
             'collection_code': collection_code,
             'offset_value': offset,
             'limit_value': limit,
-            'records_ingested': 0,
-            'status': 'started',
-            'error_message': None,
-            'completed_at': None
+            'records_ingested': records,
+            'status': status,
+            'error_message': error_msg,
+            'completed_at': datetime.now()
         }
         return self.db.log_ingestion(log_data)
     
-    def _log_ingestion_complete(self, log_id: int, status: str, records: int = 0, error_msg: str = None):
-        """Update ingestion log with completion status."""
-        # Note: Since we can't easily update by ID in this simple implementation,
-        # we'll just log new entries. In production, implement update functionality.
-        pass
-    
     def get_ingestion_stats(self) -> Dict[str, Any]:
         """Get overall ingestion statistics."""
         stats = {
@@ -275,21 +534,23 @@ class IngestionEngine:
         }
         
         # Get collection count
-        result = self.db.execute('SELECT COUNT(*) as count FROM collections')
-        if result:
-            stats['total_collections'] = result[0]['count']
+        stats['total_collections'] = self.db.fetch_value(
+            'SELECT COUNT(*) FROM collections', default=0, read=True
+        )
         
         # Get package count
-        result = self.db.execute('SELECT COUNT(*) as count FROM packages')
-        if result:
-            stats['total_packages'] = result[0]['count']
+        stats['total_packages'] = self.db.fetch_value(
+            'SELECT COUNT(*) FROM packages', default=0, read=True
+        )
         
         return stats
     
     def close(self):
-        """Close database connection."""
+        """Close database connection and HTTP session."""
         if self.db:
             self.db.disconnect()
+        if self.api_client:
+            self.api_client.close()
 
 
 if __name__ == '__main__':
@@ -1,36 +1,87 @@
 """Unit tests for DatabaseManager."""
 
 import unittest
+import json
 import os
+import sqlite3
 import tempfile
 from datetime import datetime
 
-import sys
-sys.path.insert(0, '/root/congress_api_project/src')
-
 from database.db_manager import DatabaseManager
 
+SQLITE_SCHEMA = """
+    CREATE TABLE collections (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        collection_code TEXT UNIQUE NOT NULL,
+        collection_name TEXT,
+        description TEXT,
+        last_modified TEXT,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE packages (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        package_id TEXT UNIQUE NOT NULL,
+        collection_code TEXT,
+        title TEXT,
+        summary TEXT,
+        download_url TEXT,
+        details_url TEXT,
+        publish_date TEXT,
+        last_modified TEXT,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE ingestion_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        collection_code TEXT,
+        offset_value INTEGER,
+        limit_value INTEGER,
+        records_ingested INTEGER,
+        status TEXT,
+        error_message TEXT,
+        completed_at TIMESTAMP
+    );
+"""
+
+
+def _package(package_id, last_modified='2024-01-01T00:00:00Z', title='Test Package'):
+    """Build a packages row for insert_packages."""
+    return {
+        'package_id': package_id,
+        'collection_code': 'TEST',
+        'title': title,
+        'last_modified': last_modified
+    }
+
 
 class TestDatabaseManager(unittest.TestCase):
     """Test cases for DatabaseManager class."""
     
+    config_path = '/root/congress_api_project/config/config.json'
+    
+    @classmethod
+    def setUpClass(cls):
+        """Connect once for the whole class."""
+        cls.db = DatabaseManager(cls.config_path)
+        cls.connected = cls.db.connect()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Close the shared connection."""
+        cls.db.disconnect()
+    
     def setUp(self):
-        """Set up test fixtures."""
-        # Use a temporary config for testing
-        self.config_path = '/root/congress_api_project/config/config.json'
-        self.db = DatabaseManager(self.config_path)
+        """Run each test inside a transaction that is rolled back at cleanup."""
+        if not self.connected:
+            self.skipTest("Database connection not available")
+        self.enterContext(self.db.transaction(rollback=True))
         
     def test_connection(self):
         """Test database connection."""
-        result = self.db.connect()
-        self.assertTrue(result, "Database connection should succeed")
+        self.assertTrue(self.connected, "Database connection should succeed")
         self.assertIsNotNone(self.db.db_type, "Database type should be set")
-        self.db.disconnect()
     
     def test_collection_operations(self):
         """Test collection insert and retrieval."""
-        self.db.connect()
-        
         # Test collection insertion
         test_collection = {
             'collection_code': 'TEST_COLLECTION',
@@ -46,13 +97,9 @@ class TestDatabaseManager(unittest.TestCase):
         query = "SELECT 1 FROM collections WHERE collection_code = %s LIMIT 1"
         result = self.db.execute(query, ('TEST_COLLECTION',))
         self.assertTrue(len(result) > 0, "Collection should exist after insertion")
-        
-        self.db.disconnect()
     
     def test_package_operations(self):
         """Test package insert and retrieval."""
-        self.db.connect()
-        
         # First insert a collection
         collection_data = {
             'collection_code': 'TEST_PKG_COLLECTION',
@@ -84,13 +131,9 @@ class TestDatabaseManager(unittest.TestCase):
         # Test duplicate prevention
         result = self.db.insert_package(test_package)
         self.assertTrue(result, "Duplicate insertion should succeed (upsert)")
-        
-        self.db.disconnect()
     
     def test_ingestion_log(self):
         """Test ingestion logging."""
-        self.db.connect()
-        
         log_data = {
             'collection_code': 'TEST_LOG_COLLECTION',
             'offset_value': 0,
@@ -103,13 +146,9 @@ class TestDatabaseManager(unittest.TestCase):
         
         log_id = self.db.log_ingestion(log_data)
         self.assertIsNotNone(log_id, "Log ID should be returned")
-        
-        self.db.disconnect()
     
     def test_offset_tracking(self):
         """Test offset tracking functionality."""
-        self.db.connect()
-        
         # Insert test log entries
         log_data1 = {
             'collection_code': 'TEST_OFFSET',
@@ -131,8 +170,8 @@ class TestDatabaseManager(unittest.TestCase):
             'completed_at': '2024-01-01T00:00:00Z'
         }
         
-        self.db.log_ingestion(log_data1)
-        self.db.log_ingestion(log_data2)
+        log_ids = self.db.log_ingestions([log_data1, log_data2])
+        self.assertEqual(len(log_ids), 2, "Both log rows should be inserted")
         
         # Test last offset retrieval
         last_offset = self.db.get_last_offset('TEST_OFFSET')
@@ -141,13 +180,89 @@ class TestDatabaseManager(unittest.TestCase):
         # Test non-existent collection
         last_offset = self.db.get_last_offset('NON_EXISTENT')
         self.assertEqual(last_offset, 0, "Non-existent collection should return 0")
+
+
+
+class TestDatabaseManagerSQLite(unittest.TestCase):
+    """Batch write behaviour against an in-memory SQLite database."""
+    
+    def setUp(self):
+        """Point a manager at a throwaway config and an in-memory database."""
+        config_dir = self.enterContext(tempfile.TemporaryDirectory())
+        config_path = os.path.join(config_dir, 'config.json')
+        with open(config_path, 'w') as f:
+            json.dump({'database': {}}, f)
+        
+        self.db = DatabaseManager(config_path)
+        self.db.conn = sqlite3.connect(':memory:')
+        self.db.db_type = 'sqlite'
+        self.db.conn.executescript(SQLITE_SCHEMA)
+        self.addCleanup(self.db.disconnect)
+    
+    def test_insert_packages_upsert(self):
+        """Re-inserts update only packages whose last_modified changed."""
+        inserted, updated = self.db.insert_packages([_package('P1'), _package('P2')])
+        self.assertEqual((inserted, updated), (['P1', 'P2'], []))
+        
+        inserted, updated = self.db.insert_packages([
+            _package('P1', '2024-02-01T00:00:00Z', 'Changed'),
+            _package('P2'),
+            _package('P3')
+        ])
+        self.assertEqual((inserted, updated), (['P3'], ['P1']))
+        
+        inserted, updated = self.db.insert_packages([_package('P1', '2024-02-01T00:00:00Z', 'Changed'), _package('P2')])
+        self.assertEqual((inserted, updated), ([], []))
         
-        self.db.disconnect()
+        title = self.db.fetch_value("SELECT title FROM packages WHERE package_id = %s", ('P1',))
+        self.assertEqual(title, 'Changed')
     
-    def tearDown(self):
-        """Clean up after tests."""
-        if hasattr(self, 'db') and self.db.conn:
-            self.db.disconnect()
+    def test_insert_packages_duplicate_keys(self):
+        """A package_id repeated within one batch is written once, last wins."""
+        inserted, updated = self.db.insert_packages([
+            _package('P1', title='First'),
+            _package('P2'),
+            _package('P1', '2024-02-01T00:00:00Z', 'Last')
+        ])
+        self.assertEqual((inserted, updated), (['P1', 'P2'], []))
+        
+        rows = self.db.execute("SELECT package_id, title FROM packages ORDER BY package_id")
+        self.assertEqual([(row['package_id'], row['title']) for row in rows], [('P1', 'Last'), ('P2', 'Test Package')])
+    
+    def test_insert_collections_duplicate_keys(self):
+        """A collection_code repeated within one batch is written once, last wins."""
+        collections = [
+            {'collection_code': 'A', 'collection_name': 'First'},
+            {'collection_code': 'B', 'collection_name': 'B'},
+            {'collection_code': 'A', 'collection_name': 'Last'}
+        ]
+        self.assertEqual(self.db.insert_collections(collections), ['A', 'B'])
+        self.assertEqual(self.db.insert_collections(collections), [])
+        
+        rows = self.db.execute("SELECT collection_code, collection_name FROM collections ORDER BY collection_code")
+        self.assertEqual([(row['collection_code'], row['collection_name']) for row in rows], [('A', 'Last'), ('B', 'B')])
+    
+    def test_batches_larger_than_one_chunk(self):
+        """Batches past the bound-parameter limit are split into several statements."""
+        per_chunk = self.db.SQLITE_MAX_VARIABLES // 8  # rows per INSERT for the 8 package columns
+        package_ids = [f'P{i:05d}' for i in range(2 * self.db.SQLITE_MAX_VARIABLES + 1)]
+        self.assertGreater(len(package_ids), per_chunk)
+        
+        inserted, updated = self.db.insert_packages([_package(package_id) for package_id in package_ids])
+        self.assertEqual((inserted, updated), (package_ids, []))
+        self.assertEqual(self.db.fetch_value("SELECT COUNT(*) FROM packages"), len(package_ids))
+        
+        # The existence lookup is chunked too
+        inserted, updated = self.db.insert_packages([_package(package_id) for package_id in package_ids])
+        self.assertEqual((inserted, updated), ([], []))
+        
+        logs = [
+            {'collection_code': 'TEST', 'offset_value': offset, 'limit_value': 1, 'status': 'success'}
+            for offset in range(per_chunk * 3)
+        ]
+        log_ids = self.db.log_ingestions(logs)
+        self.assertEqual(len(set(log_ids)), len(logs))
+        self.assertEqual(self.db.get_last_offset('TEST'), len(logs))
 
 
 if __name__ == '__main__':
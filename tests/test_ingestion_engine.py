@@ -0,0 +1,115 @@
+"""Unit tests for IngestionEngine."""
+
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from database.db_manager import DatabaseManager
+from ingestion.ingestion_engine import IngestionEngine
+
+SQLITE_SCHEMA = """
+    CREATE TABLE packages (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        package_id TEXT UNIQUE NOT NULL,
+        collection_code TEXT,
+        title TEXT,
+        summary TEXT,
+        download_url TEXT,
+        details_url TEXT,
+        publish_date TEXT,
+        last_modified TEXT,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE ingestion_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        collection_code TEXT,
+        offset_value INTEGER,
+        limit_value INTEGER,
+        records_ingested INTEGER,
+        status TEXT,
+        error_message TEXT,
+        completed_at TIMESTAMP
+    );
+"""
+
+
+class TestIngestionEngineSQLite(unittest.TestCase):
+    """Test package ingestion against an in-memory SQLite database."""
+    
+    def setUp(self):
+        """Build an engine on a throwaway config and an in-memory database."""
+        config_dir = self.enterContext(tempfile.TemporaryDirectory())
+        config_path = os.path.join(config_dir, 'config.json')
+        with open(config_path, 'w') as f:
+            json.dump({'database': {}, 'govinfo_api': {'api_key': 'TEST', 'base_url': 'http://localhost'}}, f)
+        
+        with mock.patch.object(DatabaseManager, 'connect'):
+            self.engine = IngestionEngine(config_path)
+        self.addCleanup(self.engine.close)
+        self.engine.db.conn = sqlite3.connect(':memory:')
+        self.engine.db.db_type = 'sqlite'
+        self.engine.db.conn.executescript(SQLITE_SCHEMA)
+        self.engine.api_client = mock.Mock()
+    
+    def _serve_pages(self, pages):
+        """Answer get_collection_packages from a dict of offset -> package list."""
+        def get_collection_packages(collection_code, offset, limit, **kwargs):
+            return {'count': 2 * len(pages), 'packages': pages.get(offset, [])}
+        
+        async def get_collection_packages_async(*args, **kwargs):
+            return get_collection_packages(*args, **kwargs)
+        
+        self.engine.api_client.get_collection_packages.side_effect = get_collection_packages
+        self.engine.api_client.get_collection_packages_async.side_effect = get_collection_packages_async
+    
+    def test_failed_write_stops_at_resume_point(self):
+        """A page that fails to write is retried on the next run, not skipped."""
+        pages = {
+            0: [{'packageId': 'P0'}, {'packageId': 'P1'}],
+            # package_id is NOT NULL, so this page fails to insert
+            2: [{'packageId': None}, {'packageId': 'P3'}],
+            4: [{'packageId': 'P4'}, {'packageId': 'P5'}]
+        }
+        self._serve_pages(pages)
+        
+        result = self.engine.ingest_collection_packages('TEST', batch_size=2)
+        
+        self.assertEqual(len(result['errors']), 1)
+        log = self.engine.db.execute('SELECT offset_value, status FROM ingestion_log ORDER BY id')
+        self.assertEqual(
+            [(row['offset_value'], row['status']) for row in log],
+            [(0, 'success'), (2, 'error')]
+        )
+        self.assertEqual(self.engine.db.get_last_offset('TEST'), 2)
+        
+        # Once the bad row is fixed, the next run picks up the failed page
+        pages[2] = [{'packageId': 'P2'}, {'packageId': 'P3'}]
+        self.engine.ingest_collection_packages('TEST', batch_size=2)
+        stored = self.engine.db.execute('SELECT package_id FROM packages ORDER BY package_id')
+        self.assertEqual([row['package_id'] for row in stored], ['P0', 'P1', 'P2', 'P3', 'P4', 'P5'])
+    
+    def test_failed_write_stops_async_run(self):
+        """The async writer stops at a failed page just like the sync loop."""
+        self._serve_pages({
+            0: [{'packageId': 'P0'}, {'packageId': 'P1'}],
+            2: [{'packageId': None}, {'packageId': 'P3'}],
+            4: [{'packageId': 'P4'}, {'packageId': 'P5'}]
+        })
+        
+        result = asyncio.run(self.engine.ingest_collection_packages_async('TEST', batch_size=2))
+        
+        self.assertEqual(len(result['errors']), 1)
+        log = self.engine.db.execute('SELECT offset_value, status FROM ingestion_log ORDER BY id')
+        self.assertEqual(
+            [(row['offset_value'], row['status']) for row in log],
+            [(0, 'success'), (2, 'error')]
+        )
+        self.assertEqual(self.engine.db.get_last_offset('TEST'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,9 +4,37 @@ Validates database schema, data integrity, and relationships
 """
 
 import unittest
+import atexit
+import functools
 import json
+import os
 import psycopg2
-from psycopg2.extras import RealDictCursor
+
+_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'config.json')
+
+
+@functools.lru_cache(maxsize=None)
+def _load_config():
+    """Read config.json once per test run."""
+    with open(_CONFIG_PATH, 'r') as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_shared_conn():
+    """Open one autocommit connection shared by every test class in this module."""
+    db_config = _load_config()['database']
+    conn = psycopg2.connect(
+        host=db_config['host'],
+        port=db_config['port'],
+        database=db_config['database'],
+        user=db_config['user'],
+        password=db_config['password']
+    )
+    conn.autocommit = True
+    atexit.register(conn.close)
+    return conn
+
 
 class PostgreSQLSchemaTest(unittest.TestCase):
     """Test PostgreSQL database schema and integrity"""
@@ -15,28 +43,69 @@ class PostgreSQLSchemaTest(unittest.TestCase):
     def setUpClass(cls):
         """Set up database connection for all tests"""
         try:
-            with open('../config/config.json', 'r') as f:
-                config = json.load(f)
-            
-            cls.db_config = config['database']
-            cls.conn = psycopg2.connect(
-                host=cls.db_config['host'],
-                port=cls.db_config['port'],
-                database=cls.db_config['database'],
-                user=cls.db_config['user'],
-                password=cls.db_config['password']
-            )
-            cls.conn.autocommit = True
+            cls.db_config = _load_config()['database']
+            cls.conn = _get_shared_conn()
             
         except Exception as e:
             cls.conn = None
             print(f"Warning: Could not connect to database: {e}")
+            return
+        
+        # Outside the try: a broken catalog query must fail the tests, not skip them
+        cls._introspect()
     
     @classmethod
-    def tearDownClass(cls):
-        """Close database connection"""
-        if cls.conn:
-            cls.conn.close()
+    def _introspect(cls):
+        """Load the whole public schema in one round trip so the structure tests run in memory"""
+        cursor = cls.conn.cursor()
+        cursor.execute("""
+            SELECT 'server', version(), pg_database_size(current_database())::text, NULL, NULL
+            UNION ALL
+            SELECT 'table', tablename::text, NULL, NULL, NULL
+            FROM pg_tables
+            WHERE schemaname = 'public'
+            UNION ALL
+            SELECT 'column', table_name::text, column_name::text, data_type::text, is_nullable::text
+            FROM information_schema.columns
+            WHERE table_schema = 'public'
+            UNION ALL
+            SELECT 'index', tablename::text, indexname::text, NULL, NULL
+            FROM pg_indexes
+            WHERE schemaname = 'public'
+            UNION ALL
+            SELECT 'fk', tc.table_name::text, kcu.column_name::text, ccu.table_name::text, NULL
+            FROM information_schema.table_constraints tc 
+            JOIN information_schema.key_column_usage kcu
+                ON tc.constraint_name = kcu.constraint_name
+            JOIN information_schema.constraint_column_usage ccu
+                ON ccu.constraint_name = tc.constraint_name
+            WHERE tc.constraint_type = 'FOREIGN KEY' 
+                AND tc.table_schema = 'public'
+            UNION ALL
+            SELECT 'trigger', event_object_table::text, trigger_name::text, NULL, NULL
+            FROM information_schema.triggers
+            WHERE trigger_schema = 'public';
+        """)
+        
+        cls._tables = set()
+        cls._columns = {}
+        cls._indexes = {}
+        cls._foreign_keys = []
+        cls._triggers = []
+        for kind, table, name, detail, nullable in cursor:
+            if kind == 'server':
+                cls._version, cls._size = table, int(name)
+            elif kind == 'table':
+                cls._tables.add(table)
+            elif kind == 'column':
+                cls._columns.setdefault(table, {})[name] = (detail, nullable)
+            elif kind == 'index':
+                cls._indexes.setdefault(table, []).append(name)
+            elif kind == 'fk':
+                cls._foreign_keys.append((table, name, detail))
+            else:
+                cls._triggers.append((name, table))
+        cursor.close()
     
     def setUp(self):
         """Skip tests if database not available"""
@@ -45,15 +114,12 @@ class PostgreSQLSchemaTest(unittest.TestCase):
     
     def test_database_connection(self):
         """Test that database connection is established"""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT version();")
-        result = cursor.fetchone()
-        self.assertIsNotNone(result)
-        self.assertIn("PostgreSQL", result[0])
+        self.assertIsNotNone(self._version)
+        self.assertIn("PostgreSQL", self._version)
     
     def test_required_tables_exist(self):
         """Test that all required tables exist"""
-        required_tables = [
+        required_tables = {
             'collections',
             'packages',
             'bills',
@@ -63,39 +129,18 @@ class PostgreSQLSchemaTest(unittest.TestCase):
             'individual_votes',
             'congressional_record',
             'ingestion_log'
-        ]
-        
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT tablename 
-            FROM pg_tables 
-            WHERE schemaname = 'public';
-        """)
+        }
         
-        existing_tables = [row[0] for row in cursor.fetchall()]
-        
-        for table in required_tables:
-            with self.subTest(table=table):
-                self.assertIn(table, existing_tables, f"Table {table} does not exist")
+        missing = required_tables - self._tables
+        self.assertFalse(missing, f"Missing tables: {sorted(missing)}")
     
     def test_collections_table_structure(self):
         """Test collections table has correct structure"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT column_name, data_type, is_nullable
-            FROM information_schema.columns
-            WHERE table_name = 'collections'
-            ORDER BY column_name;
-        """)
-        
-        columns = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        columns = self._columns.get('collections', {})
         
         # Check required columns
-        self.assertIn('id', columns)
-        self.assertIn('collection_code', columns)
-        self.assertIn('collection_name', columns)
-        self.assertIn('created_at', columns)
-        self.assertIn('updated_at', columns)
+        missing = {'id', 'collection_code', 'collection_name', 'created_at', 'updated_at'} - columns.keys()
+        self.assertFalse(missing, f"Missing columns: {sorted(missing)}")
         
         # Check data types
         self.assertEqual(columns['id'][0], 'integer')
@@ -104,74 +149,35 @@ class PostgreSQLSchemaTest(unittest.TestCase):
     
     def test_packages_table_structure(self):
         """Test packages table has correct structure"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT column_name, data_type
-            FROM information_schema.columns
-            WHERE table_name = 'packages'
-            ORDER BY column_name;
-        """)
-        
-        columns = {row[0]: row[1] for row in cursor.fetchall()}
+        columns = self._columns.get('packages', {})
         
         # Check required columns
-        self.assertIn('id', columns)
-        self.assertIn('package_id', columns)
-        self.assertIn('collection_code', columns)
-        self.assertIn('title', columns)
-        self.assertIn('metadata', columns)
-        self.assertIn('created_at', columns)
-        self.assertIn('updated_at', columns)
+        missing = {'id', 'package_id', 'collection_code', 'title', 'metadata', 'created_at', 'updated_at'} - columns.keys()
+        self.assertFalse(missing, f"Missing columns: {sorted(missing)}")
         
         # Check JSONB fields
-        self.assertEqual(columns['metadata'], 'jsonb')
+        self.assertEqual(columns['metadata'][0], 'jsonb')
     
     def test_bills_table_structure(self):
         """Test bills table has correct structure"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT column_name, data_type
-            FROM information_schema.columns
-            WHERE table_name = 'bills'
-            ORDER BY column_name;
-        """)
-        
-        columns = {row[0]: row[1] for row in cursor.fetchall()}
+        columns = self._columns.get('bills', {})
         
         # Check required columns
-        self.assertIn('bill_id', columns)
-        self.assertIn('bill_number', columns)
-        self.assertIn('bill_type', columns)
-        self.assertIn('congress_number', columns)
-        self.assertIn('title', columns)
-        self.assertIn('subjects', columns)
-        self.assertIn('committees', columns)
+        missing = {'bill_id', 'bill_number', 'bill_type', 'congress_number', 'title', 'subjects', 'committees'} - columns.keys()
+        self.assertFalse(missing, f"Missing columns: {sorted(missing)}")
         
         # Check JSONB fields
-        self.assertEqual(columns['subjects'], 'jsonb')
-        self.assertEqual(columns['committees'], 'jsonb')
+        self.assertEqual(columns['subjects'][0], 'jsonb')
+        self.assertEqual(columns['committees'][0], 'jsonb')
     
     def test_indexes_exist(self):
         """Test that important indexes exist"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT indexname, tablename
-            FROM pg_indexes
-            WHERE schemaname = 'public'
-            ORDER BY tablename, indexname;
-        """)
-        
-        indexes = [(row[0], row[1]) for row in cursor.fetchall()]
-        
-        # Check for important indexes
-        index_names = [idx[0] for idx in indexes]
-        
         # Packages table indexes
-        packages_indexes = [idx for idx in indexes if idx[1] == 'packages']
+        packages_indexes = self._indexes.get('packages', [])
         self.assertGreater(len(packages_indexes), 0, "No indexes found for packages table")
         
         # Bills table indexes
-        bills_indexes = [idx for idx in indexes if idx[1] == 'bills']
+        bills_indexes = self._indexes.get('bills', [])
         self.assertGreater(len(bills_indexes), 0, "No indexes found for bills table")
     
     def test_collections_have_data(self):
@@ -185,49 +191,19 @@ class PostgreSQLSchemaTest(unittest.TestCase):
     
     def test_foreign_key_constraints(self):
         """Test that foreign key constraints exist"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT 
-                tc.table_name, 
-                kcu.column_name, 
-                ccu.table_name AS foreign_table_name
-            FROM information_schema.table_constraints tc 
-            JOIN information_schema.key_column_usage kcu
-                ON tc.constraint_name = kcu.constraint_name
-            JOIN information_schema.constraint_column_usage ccu
-                ON ccu.constraint_name = tc.constraint_name
-            WHERE tc.constraint_type = 'FOREIGN KEY' 
-                AND tc.table_schema = 'public';
-        """)
-        
-        foreign_keys = cursor.fetchall()
-        
         # Check for packages -> collections foreign key
-        packages_fk = [fk for fk in foreign_keys if fk[0] == 'packages' and fk[1] == 'collection_code']
+        packages_fk = [fk for fk in self._foreign_keys if fk[0] == 'packages' and fk[1] == 'collection_code']
         self.assertGreater(len(packages_fk), 0, "Missing foreign key from packages to collections")
     
     def test_triggers_exist(self):
         """Test that update triggers exist"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT trigger_name, event_object_table
-            FROM information_schema.triggers
-            WHERE trigger_schema = 'public';
-        """)
-        
-        triggers = cursor.fetchall()
-        
         # Check for update triggers
-        update_triggers = [t for t in triggers if 'update' in t[0].lower()]
+        update_triggers = [t for t in self._triggers if 'update' in t[0].lower()]
         self.assertGreater(len(update_triggers), 0, "No update triggers found")
     
     def test_database_size(self):
         """Test that database has been created and has some size"""
-        cursor = self.conn.cursor()
-        cursor.execute(f"SELECT pg_database_size('{self.db_config[\"database\"]}');")
-        size = cursor.fetchone()[0]
-        
-        self.assertGreater(size, 0, "Database should have some size")
+        self.assertGreater(self._size, 0, "Database should have some size")
     
     def test_ingestion_log_functionality(self):
         """Test that ingestion log can be written to"""
@@ -254,18 +230,8 @@ class DataIntegrityTest(unittest.TestCase):
     def setUpClass(cls):
         """Set up database connection"""
         try:
-            with open('../config/config.json', 'r') as f:
-                config = json.load(f)
-            
-            cls.db_config = config['database']
-            cls.conn = psycopg2.connect(
-                host=cls.db_config['host'],
-                port=cls.db_config['port'],
-                database=cls.db_config['database'],
-                user=cls.db_config['user'],
-                password=cls.db_config['password']
-            )
-            cls.conn.autocommit = True
+            cls.db_config = _load_config()['database']
+            cls.conn = _get_shared_conn()
             
         except Exception as e:
             cls.conn = None
@@ -283,11 +249,12 @@ class DataIntegrityTest(unittest.TestCase):
             SELECT collection_code, COUNT(*)
             FROM collections
             GROUP BY collection_code
-            HAVING COUNT(*) > 1;
+            HAVING COUNT(*) > 1
+            LIMIT 10;
         """)
         
         duplicates = cursor.fetchall()
-        self.assertEqual(len(duplicates), 0, f"Found duplicate collections: {duplicates}")
+        self.assertEqual(len(duplicates), 0, f"Found duplicate collections (up to 10): {duplicates}")
     
     def test_no_duplicate_packages(self):
         """Test that package IDs are unique"""
@@ -296,11 +263,12 @@ class DataIntegrityTest(unittest.TestCase):
             SELECT package_id, COUNT(*)
             FROM packages
             GROUP BY package_id
-            HAVING COUNT(*) > 1;
+            HAVING COUNT(*) > 1
+            LIMIT 10;
         """)
         
         duplicates = cursor.fetchall()
-        self.assertEqual(len(duplicates), 0, f"Found duplicate packages: {duplicates}")
+        self.assertEqual(len(duplicates), 0, f"Found duplicate packages (up to 10): {duplicates}")
     
     def test_collection_codes_not_null(self):
         """Test that collection codes are not null"""